@@ -13,13 +13,65 @@ class MarketConfig:
     """Market data and timing configuration"""
     MARKET_OPEN = "09:30"
     MARKET_CLOSE = "16:00"
+    EARLY_CLOSE = "13:00"  # Half-day sessions (July 3rd, Black Friday, Christmas Eve)
     TIMEZONE = "US/Eastern"
     TRADING_DAYS_LOOKBACK = 30
     
     # API rate limits
     API_CALLS_PER_MINUTE = 60
     NEWS_REFRESH_MINUTES = 15
+    NEWS_CACHE_MINUTES = 90  # Reuse of fetched news; covers a pre-market warm-up before the brief
     PORTFOLIO_CHECK_MINUTES = 5
+    
+    # Per-provider call budgets (calls/minute); unlisted providers use API_CALLS_PER_MINUTE
+    PROVIDER_CALLS_PER_MINUTE = {
+        'yfinance': API_CALLS_PER_MINUTE,
+        'yahoo': 120,    # Yahoo Finance search (news)
+        'reuters': 120,
+        'newsapi': 60
+    }
+    API_BURST = 5      # Calls allowed back-to-back before the rate applies
+    FETCH_WORKERS = 8  # Threads in the shared fetch executor
+    
+    # Shared HTTP session (news and other direct HTTP fetchers)
+    HTTP_POOL_HOSTS = 10              # Hosts with a kept-alive connection pool
+    HTTP_POOL_PER_HOST = FETCH_WORKERS  # Connections kept per host, one per fetch worker
+    HTTP_RETRIES = 2                  # Retries for connection errors and 5xx/429 responses
+    HTTP_CACHE = True                 # Cache GET responses when requests_cache is installed
+    HTTP_CACHE_SECONDS = NEWS_REFRESH_MINUTES * 60
+    
+    # Deadlines: late tickers fall back to cached data (marked stale) instead of blocking
+    REQUEST_TIMEOUT_SECONDS = 10   # Longest wait for any single fetch
+    RUN_DEADLINE_SECONDS = 300     # Budget for all data collection in one daily brief
+    
+    # Local price store
+    PRICE_HISTORY_PERIOD = "6mo"  # Default history window for screening
+    INTRADAY_REFRESH_MINUTES = 15  # Live-session bar refresh interval
+    CLOSE_SETTLE_MINUTES = 20      # Wait after the close before a session's bar is final
+    BATCH_CHUNK_SIZE = 25         # Symbols per multi-ticker download request
+    ADJUSTMENT_CHECK_BARS = 3      # Settled cached bars re-compared on each update
+    ADJUSTMENT_TOLERANCE = 1e-4    # Relative close drift that signals a split/dividend adjustment
+    
+    # Intraday bars: bar length in seconds and how far back Yahoo serves each interval
+    INTRADAY_INTERVALS = {'1m': 60, '5m': 300}
+    INTRADAY_LOOKBACK_DAYS = {'1m': 7, '5m': 60}
+    INTRADAY_INTERVAL = "5m"
+    
+    # Fundamentals cache (Ticker.info changes quarterly)
+    FUNDAMENTALS_TTL_HOURS = 24
+    
+    # Market data provider: "yfinance" (live), "replay" (recorded/synthetic, offline) or
+    # "failover" (DATA_PROVIDERS ranked by observed latency and errors)
+    DATA_PROVIDER = os.getenv('MARKET_DATA_PROVIDER', 'yfinance')
+    DATA_PROVIDERS = os.getenv('MARKET_DATA_PROVIDERS', 'yfinance').split(',')  # Preference order
+    PROVIDER_EWMA_ALPHA = 0.2       # Weight of the newest sample in latency/error averages
+    PROVIDER_ERROR_PENALTY = 10.0   # Ranking cost multiplier per unit of error rate
+    HEDGE_REQUESTS = True           # Race a backup provider when the primary is slow
+    HEDGE_AFTER_MULTIPLE = 2.0      # ... i.e. after this multiple of its typical latency
+    HEDGE_MIN_SECONDS = 0.5
+    HEDGE_WORKERS = 8
+    REPLAY_LATENCY_MS = float(os.getenv('REPLAY_LATENCY_MS', '0'))  # Simulated per-call latency
+    REPLAY_SYNTHETIC = True  # Generate data for symbols that were never recorded
 
 @dataclass  
 class SectorConfig:
@@ -64,6 +116,19 @@ class TechnicalConfig:
     VOLUME_SPIKE_THRESHOLD = 1.5  # 1.5x average volume
     VOLUME_LOOKBACK_DAYS = 20
     
+    # Keep per-ticker running indicator state between runs instead of recomputing
+    INCREMENTAL_INDICATORS = True
+    
+    # Plugin indicators added to the score (see scripts/indicator_registry.py),
+    # e.g. ('MACD', 'Bollinger', 'ATR', 'OBV', 'ADX')
+    EXTRA_INDICATORS = ()
+    
+    # Support/resistance: pivots over the last SR_LOOKBACK_DAYS bars, clustered into levels
+    SR_LOOKBACK_DAYS = 50
+    SR_PIVOT_WINDOW = 2           # Bars on each side a pivot must dominate
+    SR_CLUSTER_TOLERANCE = 0.015  # Pivots within 1.5% of each other form one level
+    SR_MAX_LEVELS = 5             # Levels kept per side
+    
     # Risk management
     MAX_POSITION_SIZE = 0.05  # 5% max per position
     STOP_LOSS_PCT = 0.15      # 15% stop loss
@@ -73,6 +138,18 @@ class TechnicalConfig:
     MIN_MARKET_CAP = 1_000_000_000  # $1B minimum
     MIN_DAILY_VOLUME = 1_000_000    # $1M daily volume
     MAX_PRICE = 1000  # Under $1000/share
+    
+    # Screening universe, selected from the security master (None = no filter)
+    UNIVERSE_INDEX = None     # e.g. 'SP500', 'R1000' or 'R3000'
+    UNIVERSE_SECTORS = None   # e.g. ['tech', 'energy']
+    
+    # Staged screening funnel: fundamentals are only fetched for this many top technical scores
+    FUNNEL_TOP_N = 25
+    
+    # Backtesting (scripts/backtester.py)
+    BACKTEST_HORIZONS = (5, 20, 60)  # Forward-return horizons in bars
+    BACKTEST_ENTRY_DAYS = 5          # Bars a limit entry stays open before the signal is dropped
+    BACKTEST_MAX_HOLD_DAYS = 60      # Bars a position is held before a time exit
 
 @dataclass
 class PortfolioConfig:
@@ -111,6 +188,21 @@ DATA_DIR = "data"
 OUTPUT_DIR = "daily-briefs"
 TEMPLATE_DIR = "templates"
 
+# Local caches (resolved against the pipeline root so every entry point shares them)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_ROOT = os.getenv('PIPELINE_DATA_ROOT', os.path.join(BASE_DIR, DATA_DIR))  # Override to run against scratch data
+CACHE_DIR = os.path.join(DATA_ROOT, "cache")
+PRICE_STORE_DIR = os.path.join(CACHE_DIR, "prices")              # One subdirectory per provider
+FUNDAMENTALS_CACHE_DIR = os.path.join(CACHE_DIR, "fundamentals")  # One JSON file per provider
+PANEL_DIR = os.path.join(CACHE_DIR, "panels")                    # Memory-mapped price panels
+NEWS_CACHE_PATH = os.path.join(CACHE_DIR, "news.json")            # Raw articles per source query
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, "http")                 # requests_cache SQLite file
+INDICATOR_STATE_DIR = os.path.join(CACHE_DIR, "indicator-state")   # One JSON file per provider
+INTRADAY_STORE_DIR = os.path.join(CACHE_DIR, "intraday")          # <provider>/<interval>/<SYMBOL>/<day>.npz
+REPLAY_DIR = os.path.join(DATA_ROOT, "replay")
+SECURITY_MASTER_PATH = os.path.join(BASE_DIR, "config", "security_master.csv")
+FUNDAMENTALS_HISTORY_DIR = os.path.join(DATA_ROOT, "fundamentals-history")  # Not a cache: cannot be refetched
+
 # Logging configuration
 LOG_LEVEL = "INFO"
 LOG_FILE = "logs/pipeline.log"
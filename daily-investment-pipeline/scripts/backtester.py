@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Backtester
+Screener scores and recommendations for every (date, ticker) in one vectorized pass,
+scored against forward returns and simulated stop/target exits
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import MarketConfig, TechnicalConfig
+from scripts.indicator_engine import IndicatorEngine, IndicatorResult
+from scripts.indicator_registry import registry
+from scripts.price_panel import PricePanel
+from scripts.price_store import period_start
+from scripts.support_resistance import SupportResistance
+from scripts.technical_screener import TechnicalScreener
+
+# Recommendation codes, in score order; -1 marks a (date, ticker) the screen would skip
+RECOMMENDATIONS = ('strong_sell', 'sell', 'hold', 'buy', 'strong_buy')
+NOT_SCREENED = -1
+BUY_CODES = (3, 4)
+SELL_CODES = (0, 1)
+
+def right_align(arrays: Dict[str, np.ndarray], missing: np.ndarray) -> Dict[str, np.ndarray]:
+    """Move each ticker's bars to the bottom rows, the layout IndicatorEngine works in"""
+    order = np.argsort(~missing, axis=0, kind='stable')
+    return {name: np.take_along_axis(np.where(missing, np.nan, array), order, axis=0)
+            for name, array in arrays.items()}
+
+def _gather(array: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """array[rows, columns] for (events, k) row indices; out-of-range rows read as NaN"""
+    valid = (rows >= 0) & (rows < array.shape[0])
+    values = array[np.clip(rows, 0, array.shape[0] - 1), columns[:, None]]
+    return np.where(valid, values, np.nan)
+
+def _first(mask: np.ndarray) -> np.ndarray:
+    """Column of the first True per row, or the row width where there is none"""
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), mask.shape[1])
+
+def lookback_bars(indicators: IndicatorResult,
+                  period: str = MarketConfig.PRICE_HISTORY_PERIOD) -> np.ndarray:
+    """Bars per (row, ticker) that a screen run on that row's date would see
+
+    The screener reads `period` of history the way PriceStore slices it: the
+    last N bars for "Nd", otherwise the bars on or after period_start(period, date).
+    Signals that need more bars than that never fire in a live screen, so the
+    backtest gates them on this count rather than on the full cached history.
+    """
+    dates = indicators.dates
+    rows = dates.shape[0]
+    # Bars of history up to and including each row (right-aligned, so it counts up to `bars`)
+    history = np.arange(1, rows + 1)[:, None] - (rows - indicators.bars)[None, :]
+    if period.endswith("d") and period[:-1].isdigit():
+        return np.minimum(history, int(period[:-1]))
+
+    days = np.unique(dates[~np.isnat(dates)])
+    starts = [period_start(period, day) for day in pd.DatetimeIndex(days)]
+    if not starts or starts[0] is None:
+        return history
+    starts = np.asarray(pd.DatetimeIndex(starts).values)
+
+    result = history.copy()
+    for i, count in enumerate(indicators.bars):
+        own = dates[rows - count:, i]
+        first = np.searchsorted(own, starts[np.searchsorted(days, own)], side='left')
+        result[rows - count:, i] = np.arange(count) - first + 1
+    return result
+
+def score_indicators(indicators: IndicatorResult, cfg: TechnicalConfig,
+                     bars: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Overall score and recommendation code per (row, ticker)
+
+    Mirrors TechnicalScreener.screen_stock: each signal only counts once the
+    ticker has the bars it needs within the screener's lookback (`bars`,
+    lookback_bars(indicators) unless given), and a bar with no signal at all
+    scores 0.
+    """
+    series = indicators.series
+    close = series['close']
+    if bars is None:
+        bars = lookback_bars(indicators)
+
+    score = np.zeros(close.shape)
+    has_signal = np.zeros(close.shape, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Moving averages: bullish above the average, bearish otherwise
+        has_mas = bars >= cfg.MA_LONG
+        for field, indicator in (('ma_short', 'MA20'), ('ma_medium', 'MA50'), ('ma_long', 'MA200')):
+            ma = series[field]
+            strength = np.minimum(np.abs(close - ma) / ma * 100, 100)
+            score += np.where(has_mas, np.where(close > ma, strength, -strength), 0) * registry.weight(indicator)
+        has_signal |= has_mas
+
+        # RSI: only the oversold / overbought zones carry a direction
+        rsi = series['rsi']
+        has_rsi = bars >= cfg.RSI_PERIOD + 1
+        rsi_score = np.select(
+            [rsi <= cfg.RSI_OVERSOLD, rsi >= cfg.RSI_OVERBOUGHT],
+            [np.minimum((cfg.RSI_OVERSOLD - rsi) * 2, 100), -np.minimum((rsi - cfg.RSI_OVERBOUGHT) * 2, 100)],
+            0
+        )
+        score += np.where(has_rsi, rsi_score, 0) * registry.weight('RSI')
+        has_signal |= has_rsi
+
+        # Volume: a spike is bullish, anything else neutral
+        ratio = series['volume'] / series['volume_avg']
+        has_volume = bars >= cfg.VOLUME_LOOKBACK_DAYS
+        volume_score = np.where(ratio >= cfg.VOLUME_SPIKE_THRESHOLD, np.minimum(ratio * 30, 100), 0)
+        score += np.where(has_volume, volume_score, 0) * registry.weight('Volume')
+        has_signal |= has_volume
+
+        # Momentum beyond +/-5%
+        momentum = series['momentum']
+        has_momentum = bars > 20
+        momentum_score = np.select([momentum > 0.05, momentum < -0.05],
+                                   [np.minimum(momentum * 500, 100), -np.minimum(-momentum * 500, 100)], 0)
+        score += np.where(has_momentum, momentum_score, 0) * registry.weight('Momentum')
+        has_signal |= has_momentum
+
+    score = np.where(has_signal, np.clip(score + 50, 0, 100), 0.0)
+
+    codes = np.select([score >= 80, score >= 65, score >= 35, score >= 20], [4, 3, 2, 1], 0)
+    # A bearish MA200 turns a weak score into a sell, as in _generate_recommendation
+    ma200_bearish = has_mas & ~(close > series['ma_long'])
+    codes = np.where(ma200_bearish & (score < 40), 1, codes).astype(np.int8)
+
+    # Bars the screen would filter out or that do not exist
+    screened = ~np.isnan(close) & (close <= cfg.MAX_PRICE) & (series['volume'] >= cfg.MIN_DAILY_VOLUME)
+    codes[~screened] = NOT_SCREENED
+    score[~screened] = np.nan
+    return score, codes
+
+@dataclass
+class BacktestResult:
+    symbols: List[str]
+    dates: np.ndarray        # (rows, tickers) datetime64, right-aligned like IndicatorResult
+    scores: np.ndarray       # (rows, tickers) overall score, NaN where not screened
+    recommendations: np.ndarray  # (rows, tickers) index into RECOMMENDATIONS, NOT_SCREENED (-1) otherwise
+    forward_returns: Dict[int, np.ndarray]  # horizon -> (rows, tickers) close-to-close return
+    trades: pd.DataFrame     # One row per fresh buy signal, see Backtester.simulate_trades
+
+    def signal_table(self) -> pd.DataFrame:
+        """Forward returns per recommendation and horizon
+
+        `hit_rate` is the share of moves in the recommended direction (up for buys,
+        down for sells); hold has no direction and gets NaN.
+        """
+        codes = self.recommendations.ravel()
+        screened = codes != NOT_SCREENED
+        rows = []
+        for horizon, returns in self.forward_returns.items():
+            frame = pd.DataFrame({'code': codes[screened], 'ret': returns.ravel()[screened]}).dropna()
+            for code, group in frame.groupby('code')['ret']:
+                if code in BUY_CODES:
+                    hit_rate = (group > 0).mean()
+                elif code in SELL_CODES:
+                    hit_rate = (group < 0).mean()
+                else:
+                    hit_rate = np.nan
+                rows.append({
+                    'recommendation': RECOMMENDATIONS[code],
+                    'horizon': horizon,
+                    'count': len(group),
+                    'mean_return': group.mean(),
+                    'median_return': group.median(),
+                    'hit_rate': hit_rate
+                })
+        return pd.DataFrame(rows, columns=['recommendation', 'horizon', 'count', 'mean_return',
+                                           'median_return', 'hit_rate'])
+
+    def trade_table(self) -> pd.DataFrame:
+        """Fill rate, exit mix and returns of the simulated trades per recommendation"""
+        rows = []
+        for recommendation, trades in self.trades.groupby('recommendation', sort=False):
+            filled = trades[trades['outcome'] != 'unfilled']
+            outcomes = filled['outcome'].value_counts(normalize=True)
+            rows.append({
+                'recommendation': recommendation,
+                'signals': len(trades),
+                'fill_rate': len(filled) / len(trades),
+                'target_rate': outcomes.get('target', 0.0),
+                'stop_rate': outcomes.get('stop', 0.0),
+                'time_exit_rate': outcomes.get('expired', 0.0) + outcomes.get('open', 0.0),
+                'mean_return': filled['return'].mean(),
+                'win_rate': (filled['return'] > 0).mean() if len(filled) else np.nan,
+                'mean_bars_held': filled['bars_held'].mean()
+            })
+        return pd.DataFrame(rows, columns=['recommendation', 'signals', 'fill_rate', 'target_rate',
+                                           'stop_rate', 'time_exit_rate', 'mean_return', 'win_rate',
+                                           'mean_bars_held'])
+
+class Backtester:
+    """Walk-forward test of the screener's scores over cached history
+
+    Scores use the screener's core signals (moving averages, RSI, volume,
+    momentum) with the registry weights, and its recommendation rules, computed
+    for the whole (dates, tickers) panel at once. The price and volume filters
+    are applied per bar; the market-cap filter is not, since there is no
+    point-in-time market cap for most of the history. Plugin indicators in
+    TechnicalConfig.EXTRA_INDICATORS are left out of the backtest score.
+    """
+
+    def __init__(self, screener: Optional[TechnicalScreener] = None):
+        self.screener = screener or TechnicalScreener()
+        self.config: TechnicalConfig = self.screener.tech_config
+        self.engine = IndicatorEngine(self.config)
+        self.support_resistance = SupportResistance(self.config)
+
+    def run(self, symbols: Optional[List[str]] = None, period: str = "10y") -> BacktestResult:
+        """Backtest symbols (default: the screening universe) over cached or fetched history"""
+        panel = PricePanel.from_frame(self.screener.fetch_universe_data(symbols, period))
+        return self.run_panel(panel)
+
+    def run_panel(self, panel: PricePanel) -> BacktestResult:
+        if self.config.EXTRA_INDICATORS:
+            print(f"Backtest scores use the core signals only; ignoring {', '.join(self.config.EXTRA_INDICATORS)}")
+
+        close = panel.field('Close')
+        indicators = self.engine.compute(close, panel.field('Volume'), panel.symbols, panel.dates)
+        # Same row order as the indicators, for the trade simulation
+        fields = right_align({name: panel.field(name) for name in ('High', 'Low', 'Close')}, np.isnan(close))
+        bars = lookback_bars(indicators)
+        scores, codes = self.score(indicators, bars)
+
+        closes = fields['Close']
+        forward_returns = {}
+        for horizon in self.config.BACKTEST_HORIZONS:
+            returns = np.full(closes.shape, np.nan)
+            if horizon < closes.shape[0]:
+                returns[:-horizon] = closes[horizon:] / closes[:-horizon] - 1
+            forward_returns[horizon] = returns
+
+        trades = self.simulate_trades(indicators, fields, scores, codes, bars)
+        return BacktestResult(panel.symbols, indicators.dates, scores, codes, forward_returns, trades)
+
+    def score(self, indicators: IndicatorResult,
+              bars: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Overall score and recommendation code per (row, ticker), see score_indicators"""
+        return score_indicators(indicators, self.config, bars)
+
+    def simulate_trades(self, indicators: IndicatorResult, fields: Dict[str, np.ndarray],
+                        scores: np.ndarray, codes: np.ndarray,
+                        bars: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Simulate a trade for every fresh buy / strong_buy signal
+
+        Entry, stop and target come from TechnicalScreener._calculate_entry_exit_levels
+        with support/resistance levels computed from the SR_LOOKBACK_DAYS bars up to
+        the signal. The limit entry stays open for BACKTEST_ENTRY_DAYS bars; once
+        filled, the first bar whose low reaches the stop or whose high reaches the
+        target closes the trade (the stop wins if both do, and the fill bar only
+        checks the stop), otherwise it exits at the close after BACKTEST_MAX_HOLD_DAYS
+        bars ('expired') or at the last available close ('open'). Signals on the
+        last bar have nothing to simulate and are skipped.
+        """
+        cfg = self.config
+        high, low, close = fields['High'], fields['Low'], fields['Close']
+        rows = close.shape[0]
+
+        is_buy = np.isin(codes, BUY_CODES)
+        fresh = is_buy.copy()
+        fresh[1:] &= ~is_buy[:-1]
+        fresh[-1] = False
+        event_rows, event_columns = np.nonzero(fresh)
+        if len(event_rows) == 0:
+            return pd.DataFrame(columns=['date', 'symbol', 'recommendation', 'score', 'entry', 'stop',
+                                         'target', 'outcome', 'exit_date', 'return', 'bars_held'])
+
+        # Support/resistance for every signal in one batched call: each signal's window is a column
+        lookback = cfg.SR_LOOKBACK_DAYS
+        window = event_rows[:, None] - lookback + 1 + np.arange(lookback)
+        windows = [_gather(array, window, event_columns).T for array in (high, low, close)]
+        levels = self.support_resistance.compute(*windows, symbols=range(len(event_rows)))
+        bars = bars if bars is not None else lookback_bars(indicators)
+        bars_to_date = bars[event_rows, event_columns]
+
+        entries, stops, targets = np.empty((3, len(event_rows)))
+        for i, row in enumerate(event_rows):
+            # Too little history for levels: the screener falls back to percentage stops
+            sr_levels = levels[i] if bars_to_date[i] >= lookback else {}
+            entries[i], stops[i], targets[i] = self.screener._calculate_entry_exit_levels(
+                close[row, event_columns[i]], sr_levels, scores[row, event_columns[i]]
+            )
+
+        # Limit entry: filled on the first following bar that trades down to the entry price
+        entry_window = event_rows[:, None] + 1 + np.arange(cfg.BACKTEST_ENTRY_DAYS)
+        fill_offset = _first(_gather(low, entry_window, event_columns) <= entries[:, None])
+        filled = fill_offset < cfg.BACKTEST_ENTRY_DAYS
+        fill_rows = event_rows + 1 + fill_offset
+
+        hold = cfg.BACKTEST_MAX_HOLD_DAYS
+        hold_window = fill_rows[:, None] + np.arange(hold)
+        stop_hit = _gather(low, hold_window, event_columns) <= stops[:, None]
+        target_hit = _gather(high, hold_window, event_columns) >= targets[:, None]
+        target_hit[:, 0] = False
+        first_stop, first_target = _first(stop_hit), _first(target_hit)
+
+        held_closes = _gather(close, hold_window, event_columns)
+        available = (~np.isnan(held_closes)).sum(axis=1)
+        last_close = held_closes[np.arange(len(event_rows)), np.maximum(available - 1, 0)]
+
+        stopped = (first_stop < hold) & (first_stop <= first_target)
+        reached = (first_target < hold) & ~stopped
+        outcome = np.select([~filled, stopped, reached, available >= hold],
+                            ['unfilled', 'stop', 'target', 'expired'], 'open')
+        exit_offset = np.select([stopped, reached], [first_stop, first_target], np.maximum(available - 1, 0))
+        exit_price = np.select([stopped, reached], [stops, targets], last_close)
+
+        dates = indicators.dates
+        exit_rows = np.minimum(fill_rows + exit_offset, rows - 1)
+        trades = pd.DataFrame({
+            'date': dates[event_rows, event_columns],
+            'symbol': np.asarray(indicators.symbols)[event_columns],
+            'recommendation': np.asarray(RECOMMENDATIONS)[codes[event_rows, event_columns]],
+            'score': scores[event_rows, event_columns],
+            'entry': entries,
+            'stop': stops,
+            'target': targets,
+            'outcome': outcome,
+            'exit_date': np.where(filled, dates[exit_rows, event_columns], np.datetime64('NaT')),
+            'return': np.where(filled, exit_price / entries - 1, np.nan),
+            'bars_held': np.where(filled, exit_offset + 1, 0)
+        })
+        return trades.sort_values(['date', 'symbol'], kind='stable').reset_index(drop=True)
+
+def save_backtest_results(result: BacktestResult, output_dir: str = "backtests") -> str:
+    """Save the signal and trade tables to a JSON file"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
+    filename = f"{output_dir}/backtest_{timestamp}.json"
+
+    output = {
+        'timestamp': datetime.now().isoformat(),
+        'symbols': result.symbols,
+        'signals': result.signal_table().to_dict(orient='records'),
+        'trades': result.trade_table().to_dict(orient='records'),
+        'trade_log': result.trades.to_dict(orient='records')
+    }
+
+    with open(filename, 'w') as f:
+        json.dump(output, f, indent=2, default=str)
+
+    print(f"Backtest results saved to: {filename}")
+    return filename
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Backtest the screener recommendations over cached history')
+    parser.add_argument('--period', default='10y', help='History to test over (e.g. 2y, 10y)')
+    parser.add_argument('--symbols', nargs='*', help='Symbols to test (default: the screening universe)')
+    args = parser.parse_args()
+
+    print("🧪 Starting Backtest...")
+
+    backtester = Backtester()
+    started = datetime.now()
+    result = backtester.run(args.symbols, args.period)
+    seconds = (datetime.now() - started).total_seconds()
+
+    print(f"\n✅ Backtested {len(result.symbols)} symbols in {seconds:.1f}s")
+
+    with pd.option_context('display.width', 160, 'display.float_format', '{:.4f}'.format):
+        print(f"\n📈 Forward returns by recommendation:")
+        print(result.signal_table().to_string(index=False))
+        print(f"\n🎯 Simulated trades:")
+        print(result.trade_table().to_string(index=False))
+
+    save_backtest_results(result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cache Warmer
+Pre-market job that fills the local price, fundamentals and news caches before the daily brief
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import BASE_DIR, MarketConfig
+from scripts.market_data import MarketDataProvider, get_provider
+from scripts.fetch_executor import PRIORITY_HOLDINGS, PRIORITY_SCREENING, get_fetch_executor
+from scripts.request_coalescer import get_request_coalescer
+from technical_screener import TechnicalScreener
+from news_analyzer import NewsAnalyzer
+
+class CacheWarmer:
+    """Prefetch everything the brief reads so that it runs from cache
+
+    All calls go through the shared executor and per-provider token buckets, so
+    the warm-up is paced to each provider's budget rather than bursting; holdings
+    are queued ahead of the screening universe.
+    """
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None,
+                 portfolio_file: str = os.path.join(BASE_DIR, "config", "portfolio.json")):
+        self.provider = provider or get_provider()
+        self.portfolio_file = portfolio_file
+        self.screener = TechnicalScreener(self.provider)
+        self.price_store = self.screener.price_store
+        self.fundamentals = self.screener.fundamentals
+
+    def holdings(self) -> List[str]:
+        """Symbols held in the portfolio file"""
+        try:
+            with open(self.portfolio_file, 'r') as f:
+                portfolio = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Could not read portfolio {self.portfolio_file}: {e}")
+            return []
+        return [position['symbol'] for position in portfolio.get('positions', [])]
+
+    def warm_symbols(self, symbols: List[str], priority: int) -> int:
+        """Bring price history and fundamentals up to date; returns symbols with bars"""
+        if not symbols:
+            return 0
+
+        panel = self.price_store.get_panel(symbols, MarketConfig.PRICE_HISTORY_PERIOD, priority=priority)
+        get_fetch_executor().map(self.fundamentals.get, symbols, priority=priority)
+        self.fundamentals.flush()
+
+        return 0 if panel.empty else len(panel.columns.get_level_values(0).unique())
+
+    def warm_news(self) -> int:
+        """Fetch every news source into the news cache; returns articles fetched"""
+        return len(NewsAnalyzer().fetch_news_articles(days_back=1))
+
+    def run(self, news: bool = True) -> Dict[str, float]:
+        """Warm holdings, then the universe, then news; returns seconds spent per stage"""
+        timings = {}
+        holdings = self.holdings()
+        universe = [symbol for symbol in self.screener.stock_universe if symbol not in holdings]
+
+        coalescer = get_request_coalescer()
+        with coalescer.run():
+            stages = [
+                ('holdings', lambda: self.warm_symbols(holdings, PRIORITY_HOLDINGS)),
+                ('universe', lambda: self.warm_symbols(universe, PRIORITY_SCREENING))
+            ]
+            if news:
+                stages.append(('news', self.warm_news))
+
+            for name, stage in stages:
+                started = time.monotonic()
+                count = stage()
+                timings[name] = time.monotonic() - started
+                print(f"🔥 Warmed {name}: {count} in {timings[name]:.1f}s")
+
+        stats = coalescer.stats()
+        print(f"🔗 Data requests: {stats['requests']} ({stats['shared']} served from shared fetches)")
+
+        return timings
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Prefetch market data and news ahead of the daily brief')
+    parser.add_argument('--portfolio', default=os.path.join(BASE_DIR, "config", "portfolio.json"),
+                        help='Portfolio file whose holdings are warmed first')
+    parser.add_argument('--skip-news', action='store_true', help='Only warm prices and fundamentals')
+    args = parser.parse_args()
+
+    print("🌅 Warming caches for the daily brief...")
+    warmer = CacheWarmer(portfolio_file=args.portfolio)
+    timings = warmer.run(news=not args.skip_news)
+    print(f"✅ Cache warm-up complete in {sum(timings.values()):.1f}s")
+
+if __name__ == "__main__":
+    main()
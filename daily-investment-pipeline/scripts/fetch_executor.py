@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Fetch Executor
+Shared thread pool with priority scheduling and token-bucket rate limiting per provider
+"""
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FetchTimeout
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import MarketConfig
+
+# Lower runs first
+PRIORITY_HOLDINGS = 0
+PRIORITY_NEWS = 5
+PRIORITY_SCREENING = 10
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate_per_minute` sustained, `capacity` burst"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else MarketConfig.API_BURST
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until `tokens` are available; False if `timeout` expires first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+# One bucket per provider, shared by every caller in the process
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """Return the shared token bucket for a provider's configured call budget"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            rate = MarketConfig.PROVIDER_CALLS_PER_MINUTE.get(
+                provider, MarketConfig.API_CALLS_PER_MINUTE
+            )
+            _limiters[provider] = TokenBucket(rate)
+        return _limiters[provider]
+
+class Deadline:
+    """Wall-clock budget for a run; every wait for a fetch is capped by what is left of it"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def timeout(self, per_request: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait for the next result: the per-request limit, cut short by the deadline"""
+        per_request = per_request if per_request is not None else MarketConfig.REQUEST_TIMEOUT_SECONDS
+        remaining = self.remaining()
+        return per_request if remaining is None else min(per_request, remaining)
+
+def result_within(future: Future, deadline: Optional[Deadline] = None) -> Any:
+    """future.result() bounded by the request timeout and the run deadline
+
+    Raises FetchTimeout when the fetch is late; a task still waiting in the
+    queue is cancelled so it does not spend rate budget for nobody.
+    """
+    try:
+        return future.result(timeout=(deadline or Deadline()).timeout())
+    except FetchTimeout:
+        future.cancel()
+        raise
+
+class FetchExecutor:
+    """Thread pool that runs queued fetches in priority order
+
+    Tasks should be leaf fetches: a task that submits to the same executor and
+    waits on the result can starve the pool.
+    """
+
+    def __init__(self, max_workers: int = MarketConfig.FETCH_WORKERS):
+        self.max_workers = max_workers
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()  # FIFO within a priority level
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def _start_workers(self):
+        with self._lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._worker, name=f"fetch-{len(self._workers)}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _worker(self):
+        while True:
+            _, _, future, fn, args, kwargs = self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, fn: Callable, *args, priority: int = PRIORITY_SCREENING, **kwargs) -> Future:
+        """Queue a call; lower priority values are started first"""
+        self._start_workers()
+        future: Future = Future()
+        self._queue.put((priority, next(self._sequence), future, fn, args, kwargs))
+        return future
+
+    def map(self, fn: Callable, items: Iterable, priority: int = PRIORITY_SCREENING,
+            deadline: Optional[Deadline] = None, default: Any = None) -> List[Any]:
+        """Run `fn` over items concurrently and return results in input order
+
+        Items that miss the request timeout or the deadline yield `default`.
+        """
+        futures = [self.submit(fn, item, priority=priority) for item in items]
+        results = []
+        for future in futures:
+            try:
+                results.append(result_within(future, deadline))
+            except FetchTimeout:
+                results.append(default)
+        return results
+
+_executor: Optional[FetchExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_fetch_executor() -> FetchExecutor:
+    """Return the process-wide fetch executor"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FetchExecutor()
+        return _executor
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Fundamentals Cache
+Process-wide and on-disk cache of the Ticker.info fields the pipeline reads
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import FUNDAMENTALS_CACHE_DIR, MarketConfig
+from scripts.market_data import MarketDataProvider, get_provider
+from scripts.request_coalescer import get_request_coalescer
+from scripts.fundamentals_history import AsOf, FundamentalsHistory
+from scripts.json_store import get_json_store
+
+# Only these keys are kept from the ~150-key info blob
+FUNDAMENTAL_FIELDS = (
+    'marketCap', 'longName', 'trailingPE', 'forwardPE',
+    'revenueGrowth', 'earningsGrowth', 'beta', 'priceToSalesTrailing12Months'
+)
+
+def project_fundamentals(info: Optional[Dict]) -> Dict[str, Any]:
+    """Reduce an info blob to the fields the pipeline uses"""
+    info = info or {}
+    return {field: info.get(field) for field in FUNDAMENTAL_FIELDS if info.get(field) is not None}
+
+class FundamentalsCache:
+    """TTL cache for projected fundamentals, backed by a JSON file
+
+    Fetches only update the shared in-memory table; call `flush` once a batch
+    of fetches is done to write it out. Tickers the provider has no
+    fundamentals for (delisted, bad symbols) are cached as empty entries for
+    the same TTL, so they are not asked for again on every call.
+    """
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None,
+                 path: Optional[str] = None,
+                 ttl_hours: float = MarketConfig.FUNDAMENTALS_TTL_HOURS,
+                 history: Optional[FundamentalsHistory] = None):
+        self.provider = provider or get_provider()
+        self.path = path or os.path.join(FUNDAMENTALS_CACHE_DIR, f"{self.provider.name}.json")
+        self.ttl_seconds = ttl_hours * 3600
+        self.history = history or FundamentalsHistory(self.provider.name)
+        self._store = get_json_store(self.path, indent=2)
+
+    def flush(self):
+        """Write fundamentals fetched since the last flush to disk"""
+        self._store.flush()
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """Return cached fundamentals, refetching once the TTL has expired"""
+        symbol = symbol.upper()
+
+        entry = self._store.get(symbol)
+        if entry and time.time() - entry['fetched_at'] < self.ttl_seconds:
+            return dict(entry['fields'])
+
+        try:
+            # Concurrent misses for the same ticker share one provider call
+            fields = get_request_coalescer().do(
+                (self.provider.name, symbol, 'info'), self._fetch, symbol
+            )
+        except Exception as e:
+            print(f"Error fetching info for {symbol}: {e}")
+            # Stale fundamentals beat none at all
+            return dict(entry['fields']) if entry else {}
+
+        return dict(fields)
+
+    def as_of(self, symbol: str, when: AsOf) -> Dict[str, Any]:
+        """Fundamentals as recorded at a past point in time, from local history only"""
+        return self.history.as_of(symbol, when)
+
+    def peek(self, symbol: str) -> Dict[str, Any]:
+        """Return whatever is cached for a ticker, however old, without fetching"""
+        entry = self._store.get(symbol.upper())
+        return dict(entry['fields']) if entry else {}
+
+    def _fetch(self, symbol: str) -> Dict[str, Any]:
+        """Fetch, project and store fundamentals for one ticker"""
+        fields = project_fundamentals(self.provider.info(symbol))
+
+        # Empty results are stored too, as a negative entry that expires with the TTL
+        fetched_at = time.time()
+        self._store.set(symbol, {'fetched_at': fetched_at, 'fields': fields})
+        if fields:
+            self.history.record(symbol, fields, fetched_at)
+
+        return fields
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop one ticker (or everything) so the next read refetches"""
+        if symbol is None:
+            self._store.clear()
+        else:
+            self._store.pop(symbol.upper())
+        self._store.flush()
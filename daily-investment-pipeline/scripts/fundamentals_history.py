@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Fundamentals History
+Append-only, point-in-time record of every fundamentals snapshot fetched
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime, time as dt_time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import FUNDAMENTALS_HISTORY_DIR
+
+AsOf = Union[str, date, datetime]
+
+# Loaded ticker histories shared by every instance in the process, keyed by file
+_index: Dict[str, Tuple[List[float], List[Dict[str, Any]]]] = {}
+_index_lock = threading.Lock()
+
+def as_of_epoch(when: AsOf) -> float:
+    """Epoch seconds for an as-of point; a bare date means the end of that day"""
+    if isinstance(when, str):
+        when = date.fromisoformat(when) if len(when) == 10 else datetime.fromisoformat(when)
+    if not isinstance(when, datetime):
+        when = datetime.combine(when, dt_time.max)
+    return when.timestamp()
+
+class FundamentalsHistory:
+    """One JSONL file per ticker, each line {"fetched_at": epoch, "fields": {...}}
+
+    Lines are only ever appended, in fetch order, so "as of D" lookups are a
+    bisect over the ticker's fetch times. A snapshot identical to the previous
+    one is not written again: the earlier line already covers it.
+    """
+
+    def __init__(self, provider_name: str = "yfinance", root: Optional[str] = None):
+        self.root = root or os.path.join(FUNDAMENTALS_HISTORY_DIR, provider_name)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.jsonl")
+
+    def _load(self, symbol: str) -> Tuple[List[float], List[Dict[str, Any]]]:
+        """Fetch times and snapshots for a ticker, read from disk once per process"""
+        path = self._path(symbol)
+        if path not in _index:
+            times, snapshots = [], []
+            try:
+                with open(path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Torn final line from an interrupted write
+                        times.append(entry['fetched_at'])
+                        snapshots.append(entry['fields'])
+            except FileNotFoundError:
+                pass
+            _index[path] = (times, snapshots)
+        return _index[path]
+
+    def record(self, symbol: str, fields: Dict[str, Any], fetched_at: Optional[float] = None):
+        """Append a snapshot unless it matches the latest one on record"""
+        if not fields:
+            return
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        with _index_lock:
+            times, snapshots = self._load(symbol)
+            if snapshots and snapshots[-1] == fields:
+                return
+            if times and fetched_at < times[-1]:
+                return  # Out-of-order write would break the sorted index
+
+            with open(self._path(symbol), 'a') as f:
+                f.write(json.dumps({'fetched_at': fetched_at, 'fields': fields}, default=str) + "\n")
+            times.append(fetched_at)
+            snapshots.append(dict(fields))
+
+    def as_of(self, symbol: str, when: AsOf) -> Dict[str, Any]:
+        """Fundamentals as they were known at `when` ({} if nothing was recorded by then)"""
+        with _index_lock:
+            times, snapshots = self._load(symbol)
+            i = bisect_right(times, as_of_epoch(when)) - 1
+            return dict(snapshots[i]) if i >= 0 else {}
+
+    def snapshots(self, symbol: str) -> List[Dict[str, Any]]:
+        """Every recorded snapshot for a ticker, oldest first"""
+        with _index_lock:
+            times, snapshots = self._load(symbol)
+            return [
+                {'fetched_at': datetime.fromtimestamp(t).isoformat(), 'fields': dict(fields)}
+                for t, fields in zip(times, snapshots)
+            ]
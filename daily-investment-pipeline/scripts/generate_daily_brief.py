@@ -15,24 +15,29 @@ from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from config.settings import get_config
+from config.settings import get_config, MarketConfig
 
 # Import other pipeline components
 from news_analyzer import NewsAnalyzer
 from technical_screener import TechnicalScreener
 from portfolio_monitor import PortfolioMonitor
+from scripts.market_data import MarketDataProvider, get_provider
+from scripts.request_coalescer import get_request_coalescer
+from scripts.market_calendar import MarketCalendar
+from scripts.fetch_executor import Deadline
 
 class DailyBriefGenerator:
-    def __init__(self):
+    def __init__(self, provider: Optional[MarketDataProvider] = None):
         self.config = get_config()
+        self.provider = provider or get_provider()
         self.template_dir = "templates"
         self.output_dir = "daily-briefs"
         self.data_dir = "data"
         
         # Initialize components
         self.news_analyzer = NewsAnalyzer()
-        self.technical_screener = TechnicalScreener()
-        self.portfolio_monitor = PortfolioMonitor()
+        self.technical_screener = TechnicalScreener(provider=self.provider)
+        self.portfolio_monitor = PortfolioMonitor(provider=self.provider)
         
         # Setup Jinja2 environment
         self.jinja_env = Environment(
@@ -97,22 +102,36 @@ class DailyBriefGenerator:
             'market_open': self._is_market_open(),
         }
         
+        # Components share one fetch per (ticker, dataset) for the whole run, and late
+        # fetches fall back to cached data so the brief ships on time
+        coalescer = get_request_coalescer()
+        deadline = Deadline(MarketConfig.RUN_DEADLINE_SECONDS)
+        with coalescer.run():
+            self._collect_component_data(data, deadline)
+        
+        stats = coalescer.stats()
+        print(f"🔗 Data requests: {stats['requests']} ({stats['shared']} served from shared fetches)")
+        
+        return data
+    
+    def _collect_component_data(self, data: Dict[str, Any], deadline: Optional[Deadline] = None):
+        """Run each pipeline component and add its output to data"""
         try:
             # Portfolio data
             print("📊 Analyzing portfolio...")
-            portfolio_summary = self.portfolio_monitor.monitor_portfolio()
+            portfolio_summary = self.portfolio_monitor.monitor_portfolio(deadline)
             data['portfolio'] = portfolio_summary
             
             # News analysis
             print("📰 Analyzing news...")
-            news_articles = self.news_analyzer.fetch_news_articles(days_back=1)
+            news_articles = self.news_analyzer.fetch_news_articles(days_back=1, deadline=deadline)
             analyzed_news = self.news_analyzer.analyze_articles(news_articles)
             data['news_articles'] = analyzed_news
             data['news_sentiment'] = self._calculate_news_sentiment(analyzed_news)
             
             # Technical screening
             print("🎯 Running technical screening...")
-            screening_results = self.technical_screener.screen_all_stocks()
+            screening_results = self.technical_screener.screen_all_stocks(deadline=deadline)
             data['technical_picks'] = screening_results
             data['top_stock_pick'] = screening_results[0] if screening_results else None
             
@@ -127,21 +146,10 @@ class DailyBriefGenerator:
             print(f"Error collecting data: {e}")
             # Continue with partial data
             pass
-        
-        return data
     
     def _is_market_open(self) -> bool:
-        """Check if market is currently open"""
-        now = datetime.now()
-        
-        # Simple check - market hours 9:30 AM to 4:00 PM ET on weekdays
-        if now.weekday() >= 5:  # Weekend
-            return False
-        
-        market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
-        market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
-        
-        return market_open <= now <= market_close
+        """Check if market is currently open (exchange calendar, holidays and half-days included)"""
+        return MarketCalendar().is_open()
     
     def _calculate_news_sentiment(self, articles: List) -> Dict[str, str]:
         """Calculate overall news sentiment by sector"""
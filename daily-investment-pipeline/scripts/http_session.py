@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+HTTP Session
+Shared keep-alive connection pool for every direct HTTP fetcher in the pipeline
+"""
+
+import os
+import sys
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import HTTP_CACHE_PATH, MarketConfig
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None  # HTTP caching is optional
+
+# Credentials are left out of cache keys and redacted from cached requests, so they never reach disk
+# (requests_cache matches these names in query parameters and headers alike)
+CACHE_IGNORED_PARAMETERS = ('apiKey', 'api_key', 'token', 'access_token', 'Authorization', 'X-Api-Key')
+
+def build_session(cache: bool = MarketConfig.HTTP_CACHE) -> requests.Session:
+    """Session with per-host connection pools, retries and (if available) a response cache"""
+    if cache and requests_cache is not None:
+        os.makedirs(os.path.dirname(HTTP_CACHE_PATH), exist_ok=True)
+        session = requests_cache.CachedSession(
+            HTTP_CACHE_PATH, backend='sqlite',
+            expire_after=MarketConfig.HTTP_CACHE_SECONDS,
+            allowable_methods=('GET',),
+            ignored_parameters=CACHE_IGNORED_PARAMETERS
+        )
+    else:
+        session = requests.Session()
+
+    retry = Retry(
+        total=MarketConfig.HTTP_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(
+        pool_connections=MarketConfig.HTTP_POOL_HOSTS,
+        pool_maxsize=MarketConfig.HTTP_POOL_PER_HOST,
+        pool_block=True,  # Never open more than pool_maxsize connections to one host
+        max_retries=retry
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide session; connections are reused across threads and components"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
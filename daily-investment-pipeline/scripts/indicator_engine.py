@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Indicator Engine
+Vectorized moving averages, RSI, volume ratio and momentum over a dates x tickers panel
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import TechnicalConfig
+
+SNAPSHOT_FIELDS = ['close', 'ma_short', 'ma_medium', 'ma_long', 'rsi',
+                   'volume', 'volume_avg', 'momentum']
+
+def running_sum(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum down the rows with a leading zero row; NaN counts as zero"""
+    sums = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(np.nan_to_num(values), axis=0, out=sums[1:])
+    return sums
+
+def window_mean(sums: np.ndarray, window: int, bars: np.ndarray) -> np.ndarray:
+    """Trailing mean over `window` rows as a difference of two running_sum rows
+
+    NaN until a ticker has `window` bars.
+    """
+    rows = sums.shape[0] - 1
+    result = np.full((rows,) + sums.shape[1:], np.nan)
+    if window > rows:
+        return result
+
+    result[window - 1:] = (sums[window:] - sums[:-window]) / window
+
+    # Windows reaching into a ticker's padding are not real averages
+    first_valid = rows - bars + window - 1
+    result[np.arange(rows)[:, None] < first_valid[None, :]] = np.nan
+    return result
+
+def rolling_mean(values: np.ndarray, window: int, bars: np.ndarray) -> np.ndarray:
+    """Trailing mean over `window` rows via one cumulative sum; NaN until a ticker has `window` bars"""
+    return window_mean(running_sum(values), window, bars)
+
+def gains_losses(close: np.ndarray) -> tuple:
+    """Up and down moves of the close, each as a positive amount"""
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = np.diff(close, axis=0)
+    # A ticker's first bar has no change and counts as zero, as in pandas' where(delta > 0, 0)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    return gain, loss
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+def rolling_rsi(close: np.ndarray, period: int, bars: np.ndarray) -> np.ndarray:
+    """RSI with simple-average gains/losses over `period` bars (matches the screener's pandas RSI)"""
+    gain, loss = gains_losses(close)
+    return rsi_from_averages(rolling_mean(gain, period, bars), rolling_mean(loss, period, bars))
+
+def _pct_change(close: np.ndarray, periods: int) -> np.ndarray:
+    result = np.full(close.shape, np.nan)
+    if periods < close.shape[0]:
+        result[periods:] = (close[periods:] - close[:-periods]) / close[:-periods]
+    return result
+
+class IndicatorResult:
+    """Full indicator series and per-ticker bar counts
+
+    Series are right-aligned: each ticker's bars are moved to the bottom rows,
+    so row -1 holds every ticker's latest value and a ticker with `bars` of
+    history occupies the last `bars` rows, NaN above.
+    """
+
+    def __init__(self, series: Dict[str, np.ndarray], bars: np.ndarray,
+                 symbols: Sequence[str], dates: np.ndarray):
+        self.series = series
+        self.bars = bars
+        self.symbols = list(symbols)
+        self.dates = dates  # Right-aligned datetime64 per (row, ticker)
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbol_index
+
+    def snapshot(self, symbol: str) -> Dict[str, float]:
+        """Latest value of every indicator for one ticker, plus its bar count"""
+        i = self._symbol_index[symbol]
+        values = {field: float(self.series[field][-1, i]) for field in SNAPSHOT_FIELDS}
+        values['bars'] = int(self.bars[i])
+        return values
+
+    def snapshots(self) -> Dict[str, Dict[str, float]]:
+        return {symbol: self.snapshot(symbol) for symbol in self.symbols}
+
+    def series_for(self, field: str, symbol: str) -> pd.Series:
+        """One indicator's full history for a ticker, on that ticker's own dates"""
+        i = self._symbol_index[symbol]
+        bars = int(self.bars[i])
+        rows = slice(len(self.dates) - bars, None)
+        return pd.Series(self.series[field][rows, i], index=pd.DatetimeIndex(self.dates[rows, i]),
+                         name=field)
+
+class IndicatorEngine:
+    """Every screener indicator for every ticker in a few array passes"""
+
+    def __init__(self, config: Optional[TechnicalConfig] = None):
+        self.config = config or TechnicalConfig()
+
+    def compute(self, close: np.ndarray, volume: np.ndarray,
+                symbols: Sequence[str], dates: Sequence) -> IndicatorResult:
+        """Indicators for (dates, tickers) close and volume arrays; NaN marks missing bars"""
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        missing = np.isnan(close)
+        bars = (~missing).sum(axis=0)
+
+        # Align every ticker's history to the last row: tickers start on different dates,
+        # and this way no rolling window straddles a gap before a ticker's first bar
+        order = np.argsort(~missing, axis=0, kind='stable')
+        close = np.take_along_axis(close, order, axis=0)
+        volume = np.take_along_axis(np.where(missing, np.nan, volume), order, axis=0)
+        dates = np.asarray(pd.DatetimeIndex(dates).values)[order]
+
+        cfg = self.config
+        series = {
+            'close': close,
+            'volume': volume,
+            'ma_short': rolling_mean(close, cfg.MA_SHORT, bars),
+            'ma_medium': rolling_mean(close, cfg.MA_MEDIUM, bars),
+            'ma_long': rolling_mean(close, cfg.MA_LONG, bars),
+            'rsi': rolling_rsi(close, cfg.RSI_PERIOD, bars),
+            'volume_avg': rolling_mean(volume, cfg.VOLUME_LOOKBACK_DAYS, bars),
+            'momentum': 0.6 * _pct_change(close, 5) + 0.4 * _pct_change(close, 20)
+        }
+        return IndicatorResult(series, bars, symbols, dates)
+
+    def compute_panel(self, panel) -> IndicatorResult:
+        """Indicators for a wide (symbol, field) DataFrame panel or a PricePanel"""
+        if isinstance(panel, pd.DataFrame):
+            close = panel.xs('Close', axis=1, level=1)
+            volume = panel.xs('Volume', axis=1, level=1).reindex(columns=close.columns)
+            return self.compute(close.to_numpy(), volume.to_numpy(), list(close.columns), panel.index)
+        return self.compute(panel.field('Close'), panel.field('Volume'), panel.symbols, panel.dates)
+
+    def compute_frame(self, data: pd.DataFrame, symbol: str = "_") -> Dict[str, float]:
+        """Latest indicator values for a single ticker's bars"""
+        result = self.compute(data[['Close']].to_numpy(), data[['Volume']].to_numpy(),
+                              [symbol], data.index)
+        return result.snapshot(symbol)
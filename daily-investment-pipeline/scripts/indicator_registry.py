@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Indicator Registry
+Pluggable technical indicators that share memoized intermediate series
+"""
+
+import os
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import TechnicalConfig
+
+@dataclass
+class TechnicalSignal:
+    indicator: str
+    value: float
+    signal: str  # bullish, bearish, neutral
+    strength: float  # 0-100
+    description: str
+
+# Builders for intermediate series, keyed by name. Parameterized intermediates
+# are requested as "name:arg:arg", e.g. "sma:close:20" or "wilder:true_range:14".
+INTERMEDIATES: Dict[str, Callable[..., np.ndarray]] = {}
+
+def intermediate(name: str):
+    """Register a builder for an intermediate series"""
+    def decorator(fn: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+        INTERMEDIATES[name] = fn
+        return fn
+    return decorator
+
+class SeriesContext:
+    """Intermediate series for one ticker's bars, each computed at most once
+
+    `context["sma:close:20"]` builds the series on first use (building whatever
+    it depends on through the same cache) and returns the stored array after
+    that, so indicators that need the same intermediates share one computation.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._series: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        series = self._series.get(key)
+        if series is None:
+            name, *args = key.split(':')
+            series = self._series[key] = INTERMEDIATES[name](self, *args)
+        return series
+
+    def prepare(self, keys: Iterable[str]):
+        """Compute every listed intermediate up front"""
+        for key in keys:
+            self[key]
+
+    def last(self, key: str) -> float:
+        return float(self[key][-1])
+
+class TickerContext(SeriesContext):
+    """Everything one screen_stock call derives from a ticker's bars, computed once
+
+    Adds memoized latest values, O(1) trailing window means from the running
+    sums, and the indicator snapshot (the same fields as IndicatorEngine's) and
+    support/resistance levels. Snapshot values or levels already computed for
+    the whole universe can be passed in and are used as given.
+    """
+
+    def __init__(self, data: pd.DataFrame, config: Optional[TechnicalConfig] = None,
+                 values: Optional[Dict[str, float]] = None, levels: Optional[Dict] = None):
+        super().__init__(data)
+        self.config = config or TechnicalConfig()
+        self._values = values
+        self.levels = levels
+        self._last: Dict[str, float] = {}
+
+    @property
+    def bars(self) -> int:
+        return len(self.data)
+
+    def last(self, key: str) -> float:
+        value = self._last.get(key)
+        if value is None:
+            value = self._last[key] = super().last(key)
+        return value
+
+    def window_mean(self, field: str, window: int) -> float:
+        """Mean of the last `window` values of a series; NaN with fewer bars"""
+        if window > self.bars:
+            return np.nan
+        sums = self[f"cumsum:{field}"]
+        return float((sums[-1] - sums[-1 - window]) / window)
+
+    def pct_change(self, periods: int, field: str = 'close') -> float:
+        """Change over the last `periods` bars as a fraction; NaN with too few bars"""
+        if periods >= self.bars:
+            return np.nan
+        values = self[field]
+        return float((values[-1] - values[-1 - periods]) / values[-1 - periods])
+
+    @property
+    def values(self) -> Dict[str, float]:
+        """Latest indicator values, as IndicatorEngine.compute_frame returns them"""
+        if self._values is None:
+            cfg = self.config
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = self.window_mean('gain', cfg.RSI_PERIOD) / self.window_mean('loss', cfg.RSI_PERIOD)
+                rsi = float(100 - (100 / (1 + rs)))
+            self._values = {
+                'close': self.last('close'),
+                'ma_short': self.window_mean('close', cfg.MA_SHORT),
+                'ma_medium': self.window_mean('close', cfg.MA_MEDIUM),
+                'ma_long': self.window_mean('close', cfg.MA_LONG),
+                'rsi': rsi,
+                'volume': self.last('volume'),
+                'volume_avg': self.window_mean('volume', cfg.VOLUME_LOOKBACK_DAYS),
+                'momentum': 0.6 * self.pct_change(5) + 0.4 * self.pct_change(20),
+                'bars': self.bars
+            }
+        return self._values
+
+def _field(column: str) -> Callable[[SeriesContext], np.ndarray]:
+    """Raw OHLCV column as a contiguous float array"""
+    return lambda ctx: np.ascontiguousarray(ctx.data[column].to_numpy(dtype=np.float64))
+
+for _column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+    INTERMEDIATES[_column.lower()] = _field(_column)
+
+def wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing, seeded with the simple average of the first `period` valid values"""
+    result = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < period:
+        return result
+
+    first = valid[0]
+    seeded = values[first + period - 1:].copy()
+    seeded[0] = values[first:first + period].mean()
+    result[first + period - 1:] = pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return result
+
+@intermediate('change')
+def _change(ctx: SeriesContext, field: str) -> np.ndarray:
+    """Bar-to-bar difference; NaN on the first bar"""
+    values = ctx[field]
+    return np.concatenate([[np.nan], np.diff(values)])
+
+@intermediate('gain')
+def _gain(ctx: SeriesContext) -> np.ndarray:
+    """Up moves of the close; the first bar counts as no change"""
+    change = ctx['change:close']
+    return np.where(change > 0, change, 0.0)
+
+@intermediate('loss')
+def _loss(ctx: SeriesContext) -> np.ndarray:
+    change = ctx['change:close']
+    return np.where(change < 0, -change, 0.0)
+
+@intermediate('returns')
+def _returns(ctx: SeriesContext) -> np.ndarray:
+    close = ctx['close']
+    return ctx['change:close'] / np.concatenate([[np.nan], close[:-1]])
+
+@intermediate('true_range')
+def _true_range(ctx: SeriesContext) -> np.ndarray:
+    high, low, close = ctx['high'], ctx['low'], ctx['close']
+    previous = np.concatenate([[np.nan], close[:-1]])
+    return np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+
+@intermediate('plus_dm')
+def _plus_dm(ctx: SeriesContext) -> np.ndarray:
+    up, down = ctx['change:high'], -ctx['change:low']
+    return np.where((up > down) & (up > 0), up, 0.0)
+
+@intermediate('minus_dm')
+def _minus_dm(ctx: SeriesContext) -> np.ndarray:
+    up, down = ctx['change:high'], -ctx['change:low']
+    return np.where((down > up) & (down > 0), down, 0.0)
+
+@intermediate('cumsum')
+def _cumsum(ctx: SeriesContext, field: str) -> np.ndarray:
+    """Running sum with a leading zero, so any window sum is two lookups"""
+    return np.concatenate([[0.0], np.cumsum(np.nan_to_num(ctx[field]))])
+
+@intermediate('cumsum_sq')
+def _cumsum_sq(ctx: SeriesContext, field: str) -> np.ndarray:
+    return np.concatenate([[0.0], np.cumsum(np.nan_to_num(ctx[field]) ** 2)])
+
+@intermediate('sma')
+def _sma(ctx: SeriesContext, field: str, window: str) -> np.ndarray:
+    window = int(window)
+    sums = ctx[f"cumsum:{field}"]
+    result = np.full(len(ctx), np.nan)
+    if window <= len(ctx):
+        result[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return result
+
+@intermediate('std')
+def _std(ctx: SeriesContext, field: str, window: str) -> np.ndarray:
+    """Rolling population standard deviation from running sums of x and x**2"""
+    mean = ctx[f"sma:{field}:{window}"]
+    squares = ctx[f"cumsum_sq:{field}"]
+    width = int(window)
+    mean_square = np.full(len(ctx), np.nan)
+    if width <= len(ctx):
+        mean_square[width - 1:] = (squares[width:] - squares[:-width]) / width
+    return np.sqrt(np.maximum(mean_square - mean ** 2, 0.0))
+
+@intermediate('ema')
+def _ema(ctx: SeriesContext, field: str, span: str) -> np.ndarray:
+    return pd.Series(ctx[field]).ewm(span=int(span), adjust=False).mean().to_numpy()
+
+@intermediate('wilder')
+def _wilder(ctx: SeriesContext, field: str, period: str) -> np.ndarray:
+    return wilder_smooth(ctx[field], int(period))
+
+class IndicatorPlugin(ABC):
+    """One indicator: the intermediates it reads and how it turns them into a signal"""
+
+    name = "base"
+    weight = 0.1                       # Contribution to the overall score
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        """Intermediates computed once and shared with other plugins, keyed by this plugin's windows"""
+        return ()
+
+    @property
+    def min_bars(self) -> int:
+        return 1
+
+    @abstractmethod
+    def signal(self, ctx: SeriesContext) -> Optional[TechnicalSignal]:
+        """This indicator's signal for the context's latest bar, or None if it has none"""
+
+class IndicatorRegistry:
+    """Named indicator plugins plus the score weight of every indicator, built-in or plugin"""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 0.1):
+        self._plugins: Dict[str, IndicatorPlugin] = {}
+        self._weights = dict(weights or {})
+        self.default_weight = default_weight
+
+    def register(self, plugin: IndicatorPlugin) -> IndicatorPlugin:
+        self._plugins[plugin.name] = plugin
+        self._weights[plugin.name] = plugin.weight
+        return plugin
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._plugins
+
+    def names(self) -> List[str]:
+        return list(self._plugins)
+
+    def weight(self, name: str) -> float:
+        return self._weights.get(name, self.default_weight)
+
+    def evaluate(self, ctx: SeriesContext, names: Iterable[str]) -> List[TechnicalSignal]:
+        """Signals of the named plugins for one ticker, sharing intermediates between them"""
+        plugins = [self._plugins[name] for name in names]
+        usable = [plugin for plugin in plugins if len(ctx) >= plugin.min_bars]
+
+        # Build the union of what the plugins need once, then let each read from the context
+        ctx.prepare(dict.fromkeys(key for plugin in usable for key in plugin.requires))
+
+        signals = []
+        for plugin in usable:
+            signal = plugin.signal(ctx)
+            if signal is not None:
+                signals.append(signal)
+        return signals
+
+# Weights of the screener's built-in signals
+CORE_WEIGHTS = {
+    'MA200': 0.25,  # Most important
+    'MA50': 0.20,
+    'MA20': 0.15,
+    'RSI': 0.15,
+    'Volume': 0.15,
+    'Momentum': 0.10
+}
+
+registry = IndicatorRegistry(CORE_WEIGHTS)
+
+def register(plugin_class):
+    """Class decorator adding a plugin to the shared registry"""
+    registry.register(plugin_class())
+    return plugin_class
+
+@register
+class MACD(IndicatorPlugin):
+    name = "MACD"
+    fast, slow, smoothing = 12, 26, 9
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        return ('close', f"ema:close:{self.fast}", f"ema:close:{self.slow}")
+
+    @property
+    def min_bars(self) -> int:
+        return self.slow + self.smoothing
+
+    def signal(self, ctx: SeriesContext) -> Optional[TechnicalSignal]:
+        macd = ctx[f"ema:close:{self.fast}"] - ctx[f"ema:close:{self.slow}"]
+        signal_line = pd.Series(macd).ewm(span=self.smoothing, adjust=False).mean().to_numpy()
+        histogram = float(macd[-1] - signal_line[-1])
+        price = ctx.last('close')
+
+        direction = "bullish" if histogram > 0 else "bearish"
+        return TechnicalSignal(
+            indicator=self.name,
+            value=float(macd[-1]),
+            signal=direction,
+            strength=min(abs(histogram) / price * 2000, 100),
+            description=f"MACD {'above' if histogram > 0 else 'below'} signal line"
+        )
+
+@register
+class BollingerPercentB(IndicatorPlugin):
+    name = "Bollinger"
+    window, width = 20, 2.0
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        return ('close', f"sma:close:{self.window}", f"std:close:{self.window}")
+
+    @property
+    def min_bars(self) -> int:
+        return self.window
+
+    def signal(self, ctx: SeriesContext) -> Optional[TechnicalSignal]:
+        mean = ctx.last(f"sma:close:{self.window}")
+        std = ctx.last(f"std:close:{self.window}")
+        if std == 0:
+            return None
+        percent_b = (ctx.last('close') - (mean - self.width * std)) / (2 * self.width * std)
+
+        if percent_b <= 0:
+            signal, strength = "bullish", min(-percent_b * 200 + 50, 100)
+            description = f"Below lower Bollinger band (%B {percent_b:.2f})"
+        elif percent_b >= 1:
+            signal, strength = "bearish", min((percent_b - 1) * 200 + 50, 100)
+            description = f"Above upper Bollinger band (%B {percent_b:.2f})"
+        else:
+            signal, strength = "neutral", 50 - abs(50 - percent_b * 100)
+            description = f"Inside Bollinger bands (%B {percent_b:.2f})"
+
+        return TechnicalSignal(indicator=self.name, value=percent_b, signal=signal,
+                               strength=strength, description=description)
+
+@register
+class ATR(IndicatorPlugin):
+    name = "ATR"
+    period = 14
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        return ('close', 'true_range', f"wilder:true_range:{self.period}")
+
+    @property
+    def min_bars(self) -> int:
+        return self.period + 1
+
+    def signal(self, ctx: SeriesContext) -> Optional[TechnicalSignal]:
+        atr = ctx.last(f"wilder:true_range:{self.period}")
+        atr_pct = atr / ctx.last('close') * 100
+        # Volatility has no direction; reported for context, neutral in the score
+        return TechnicalSignal(
+            indicator=self.name,
+            value=atr,
+            signal="neutral",
+            strength=min(atr_pct * 10, 100),
+            description=f"Average true range {atr_pct:.1f}% of price"
+        )
+
+@register
+class OBV(IndicatorPlugin):
+    name = "OBV"
+    lookback = 20
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        return ('change:close', 'volume', f"sma:volume:{self.lookback}")
+
+    @property
+    def min_bars(self) -> int:
+        return self.lookback + 1
+
+    def signal(self, ctx: SeriesContext) -> Optional[TechnicalSignal]:
+        flow = np.sign(np.nan_to_num(ctx['change:close'])) * ctx['volume']
+        # OBV change over the lookback is the flow summed over its last `lookback` bars
+        obv_change = float(flow[-self.lookback:].sum())
+        relative = obv_change / (ctx.last(f"sma:volume:{self.lookback}") * self.lookback)
+
+        if relative > 0.1:
+            signal, description = "bullish", "On-balance volume rising"
+        elif relative < -0.1:
+            signal, description = "bearish", "On-balance volume falling"
+        else:
+            signal, description = "neutral", "On-balance volume flat"
+
+        return TechnicalSignal(indicator=self.name, value=obv_change, signal=signal,
+                               strength=min(abs(relative) * 100, 100), description=description)
+
+@register
+class ADX(IndicatorPlugin):
+    name = "ADX"
+    period = 14
+    trend_threshold = 25
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        return ('true_range',) + tuple(f"wilder:{field}:{self.period}"
+                                       for field in ('true_range', 'plus_dm', 'minus_dm'))
+
+    @property
+    def min_bars(self) -> int:
+        return 2 * self.period + 1
+
+    def signal(self, ctx: SeriesContext) -> Optional[TechnicalSignal]:
+        atr = ctx[f"wilder:true_range:{self.period}"]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            plus_di = 100 * ctx[f"wilder:plus_dm:{self.period}"] / atr
+            minus_di = 100 * ctx[f"wilder:minus_dm:{self.period}"] / atr
+            dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        adx = float(wilder_smooth(dx, self.period)[-1])
+        if np.isnan(adx):
+            return None
+
+        if adx >= self.trend_threshold:
+            bullish = bool(plus_di[-1] > minus_di[-1])
+            signal = "bullish" if bullish else "bearish"
+            description = f"{'Up' if bullish else 'Down'}trend strength ADX {adx:.1f}"
+        else:
+            signal, description = "neutral", f"No clear trend (ADX {adx:.1f})"
+
+        return TechnicalSignal(indicator=self.name, value=adx, signal=signal,
+                               strength=min(adx * 2, 100), description=description)
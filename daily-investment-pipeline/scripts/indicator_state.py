@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Indicator State
+Per-ticker running indicator state, updated in constant time per new bar and kept between runs
+"""
+
+import math
+import os
+import sys
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import INDICATOR_STATE_DIR, MarketConfig, TechnicalConfig
+from scripts.market_calendar import MarketCalendar
+from scripts.indicator_engine import SNAPSHOT_FIELDS
+from scripts.json_store import get_json_store
+
+MOMENTUM_LOOKBACK = 20  # Longest price change used by the momentum signal
+
+class Ring:
+    """Fixed-capacity buffer with O(1) append and O(1) access to the k-th latest value"""
+
+    def __init__(self, capacity: int, values: List[float] = ()):
+        self.capacity = capacity
+        self.size = 0
+        self._values = [0.0] * capacity
+        self._next = 0
+        for value in values:
+            self.append(value)
+
+    def append(self, value: float):
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def ago(self, k: int) -> float:
+        """Value appended k appends ago (0 = latest); NaN if no longer held"""
+        if k >= self.size:
+            return math.nan
+        return self._values[(self._next - 1 - k) % self.capacity]
+
+    def total(self, n: int) -> float:
+        """Sum of the latest n values (all held values if fewer)"""
+        return sum(self.ago(k) for k in range(min(n, self.size)))
+
+    def tolist(self) -> List[float]:
+        """Held values, oldest first"""
+        return [self.ago(k) for k in range(self.size - 1, -1, -1)]
+
+class IndicatorState:
+    """Running sums and averages behind the screener's indicators for one ticker
+
+    `update` folds in one completed bar in constant time; `preview` returns the
+    values a further (e.g. in-progress intraday) bar would give without storing
+    it. Values match IndicatorEngine over the same bars. RSI is kept both as the
+    screener's simple-average RSI and as Wilder's smoothed RSI (`rsi_wilder`).
+    """
+
+    def __init__(self, config: Optional[TechnicalConfig] = None):
+        config = config or TechnicalConfig()
+        self.ma_windows = {
+            'ma_short': config.MA_SHORT,
+            'ma_medium': config.MA_MEDIUM,
+            'ma_long': config.MA_LONG
+        }
+        self.rsi_period = config.RSI_PERIOD
+        self.volume_window = config.VOLUME_LOOKBACK_DAYS
+
+        self.closes = Ring(max(max(self.ma_windows.values()), MOMENTUM_LOOKBACK) + 1)
+        self.volumes = Ring(self.volume_window)
+        self.gains = Ring(self.rsi_period)
+        self.losses = Ring(self.rsi_period)
+
+        self.bars = 0
+        self.last_date: Optional[date] = None
+        self.sums = {name: 0.0 for name in self.ma_windows}
+        self.volume_sum = 0.0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.wilder_gain = math.nan
+        self.wilder_loss = math.nan
+        self._appends_since_resync = 0
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, config: Optional[TechnicalConfig] = None) -> 'IndicatorState':
+        """Build state by replaying a ticker's daily bars"""
+        state = cls(config)
+        for day, close, volume in zip(data.index, data['Close'], data['Volume']):
+            state.update(day, close, volume)
+        return state
+
+    def _step(self, close: float, volume: float) -> Dict[str, float]:
+        """Running totals after appending one bar, without modifying the state"""
+        sums = {
+            name: self.sums[name] + close - (self.closes.ago(window - 1) if self.bars >= window else 0.0)
+            for name, window in self.ma_windows.items()
+        }
+
+        # A ticker's first bar has no change and counts as zero (as the pandas RSI does)
+        delta = close - self.closes.ago(0) if self.bars else 0.0
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        period = self.rsi_period
+        full = self.gains.size >= period
+        gain_sum = self.gain_sum + gain - (self.gains.ago(period - 1) if full else 0.0)
+        loss_sum = self.loss_sum + loss - (self.losses.ago(period - 1) if full else 0.0)
+
+        # Wilder's averages are seeded with the simple average of the first `period` changes
+        changes = self.bars
+        if changes == period:
+            wilder_gain, wilder_loss = gain_sum / period, loss_sum / period
+        elif changes > period:
+            wilder_gain = (self.wilder_gain * (period - 1) + gain) / period
+            wilder_loss = (self.wilder_loss * (period - 1) + loss) / period
+        else:
+            wilder_gain = wilder_loss = math.nan
+
+        volume_sum = self.volume_sum + volume - (
+            self.volumes.ago(self.volume_window - 1) if self.bars >= self.volume_window else 0.0
+        )
+
+        return {
+            'sums': sums, 'gain': gain, 'loss': loss,
+            'gain_sum': gain_sum, 'loss_sum': loss_sum,
+            'wilder_gain': wilder_gain, 'wilder_loss': wilder_loss,
+            'volume_sum': volume_sum
+        }
+
+    def update(self, day, close: float, volume: float):
+        """Fold in the next completed bar"""
+        close, volume = float(close), float(volume)
+        step = self._step(close, volume)
+
+        self.sums = step['sums']
+        self.gain_sum, self.loss_sum = step['gain_sum'], step['loss_sum']
+        self.wilder_gain, self.wilder_loss = step['wilder_gain'], step['wilder_loss']
+        self.volume_sum = step['volume_sum']
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.gains.append(step['gain'])
+        self.losses.append(step['loss'])
+        self.bars += 1
+        self.last_date = pd.Timestamp(day).date()
+
+        # Re-add the windows from scratch now and then so rounding in the running sums cannot drift
+        self._appends_since_resync += 1
+        if self._appends_since_resync >= self.closes.capacity:
+            self._resync()
+
+    def _resync(self):
+        self.sums = {name: self.closes.total(window) for name, window in self.ma_windows.items()}
+        self.volume_sum = self.volumes.total(self.volume_window)
+        self.gain_sum = self.gains.total(self.rsi_period)
+        self.loss_sum = self.losses.total(self.rsi_period)
+        self._appends_since_resync = 0
+
+    def values(self) -> Dict[str, float]:
+        """Latest indicator values (the IndicatorEngine snapshot fields plus rsi_wilder)"""
+        step = {
+            'sums': self.sums, 'gain_sum': self.gain_sum, 'loss_sum': self.loss_sum,
+            'wilder_gain': self.wilder_gain, 'wilder_loss': self.wilder_loss,
+            'volume_sum': self.volume_sum
+        }
+        return self._values(step, self.bars, self.closes.ago, self.volumes.ago(0))
+
+    def preview(self, close: float, volume: float) -> Dict[str, float]:
+        """Indicator values if one more bar were appended; the state is left unchanged"""
+        close, volume = float(close), float(volume)
+        ago = lambda k: close if k == 0 else self.closes.ago(k - 1)
+        return self._values(self._step(close, volume), self.bars + 1, ago, volume)
+
+    def _values(self, step: Dict, bars: int, close_ago: Callable[[int], float],
+                volume: float) -> Dict[str, float]:
+        values = {
+            name: step['sums'][name] / window if bars >= window else math.nan
+            for name, window in self.ma_windows.items()
+        }
+
+        period = self.rsi_period
+        values['rsi'] = _rsi(step['gain_sum'], step['loss_sum']) if bars >= period else math.nan
+        values['rsi_wilder'] = _rsi(step['wilder_gain'], step['wilder_loss'])
+
+        values['close'] = close_ago(0)
+        values['volume'] = volume
+        values['volume_avg'] = step['volume_sum'] / self.volume_window if bars >= self.volume_window else math.nan
+        values['momentum'] = 0.6 * _change(close_ago, 5) + 0.4 * _change(close_ago, MOMENTUM_LOOKBACK)
+        values['bars'] = bars
+
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'last_date': self.last_date.isoformat() if self.last_date else None,
+            'bars': self.bars,
+            'windows': self._windows(),
+            'closes': self.closes.tolist(),
+            'volumes': self.volumes.tolist(),
+            'gains': self.gains.tolist(),
+            'losses': self.losses.tolist(),
+            'wilder_gain': self.wilder_gain,
+            'wilder_loss': self.wilder_loss
+        }
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any], config: Optional[TechnicalConfig] = None) -> Optional['IndicatorState']:
+        """Restore a saved state; None if it was saved with different indicator windows"""
+        state = cls(config)
+        if entry.get('windows') != state._windows():
+            return None
+
+        state.bars = entry['bars']
+        state.last_date = date.fromisoformat(entry['last_date']) if entry['last_date'] else None
+        state.closes = Ring(state.closes.capacity, entry['closes'])
+        state.volumes = Ring(state.volumes.capacity, entry['volumes'])
+        state.gains = Ring(state.gains.capacity, entry['gains'])
+        state.losses = Ring(state.losses.capacity, entry['losses'])
+        state.wilder_gain = entry['wilder_gain']
+        state.wilder_loss = entry['wilder_loss']
+        state._resync()
+        return state
+
+    def _windows(self) -> Dict[str, int]:
+        return dict(self.ma_windows, rsi=self.rsi_period, volume=self.volume_window)
+
+def _rsi(average_gain: float, average_loss: float) -> float:
+    if average_loss == 0:
+        return 100.0 if average_gain > 0 else math.nan
+    return 100 - (100 / (1 + average_gain / average_loss))
+
+def _change(close_ago: Callable[[int], float], periods: int) -> float:
+    return (close_ago(0) - close_ago(periods)) / close_ago(periods)
+
+class IndicatorStateStore:
+    """Indicator state for every ticker, persisted to one JSON file per provider
+
+    `sync` brings a ticker's state up to date with its cached bars: bars after
+    the state's last date are folded in one at a time, and the state is rebuilt
+    from the bars only when it is missing or no longer matches them (e.g. after
+    a split re-adjusted the history). Bars of a session that has not closed yet
+    are previewed rather than stored, so intraday runs never commit partial bars.
+    """
+
+    def __init__(self, provider_name: str, path: Optional[str] = None,
+                 config: Optional[TechnicalConfig] = None):
+        self.path = path or os.path.join(INDICATOR_STATE_DIR, f"{provider_name}.json")
+        self.config = config or TechnicalConfig()
+        self.calendar = MarketCalendar()
+        self.rebuilds = 0
+        self._store = get_json_store(self.path)
+        self._states: Dict[str, IndicatorState] = {}
+
+    def save(self):
+        """Write every state touched since loading back to disk"""
+        self._store.update({symbol: state.to_dict() for symbol, state in self._states.items()})
+        self._store.flush()
+
+    def export(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Serialized states of symbols synced in this process, for another process to `adopt`"""
+        symbols = [symbol.upper() for symbol in symbols]
+        return {symbol: self._states[symbol].to_dict() for symbol in symbols if symbol in self._states}
+
+    def adopt(self, entries: Dict[str, Dict[str, Any]]):
+        """Take over states synced elsewhere, e.g. in a screening pool worker; `save` writes them"""
+        for symbol in entries:
+            self._states.pop(symbol, None)
+        self._store.update(entries)
+
+    def get(self, symbol: str) -> Optional[IndicatorState]:
+        symbol = symbol.upper()
+        if symbol not in self._states:
+            entry = self._store.get(symbol)
+            state = IndicatorState.from_dict(entry, self.config) if entry else None
+            if state is None:
+                return None
+            self._states[symbol] = state
+        return self._states[symbol]
+
+    def sync(self, symbol: str, data: pd.DataFrame,
+             through: Optional[date] = None) -> Optional[Dict[str, float]]:
+        """Latest indicator values for a ticker's daily bars, updating its stored state
+
+        `through` is the last completed session (taken from the market calendar
+        by default). The returned `bars` is len(data), so the values read exactly
+        like IndicatorEngine.compute_frame(data).
+        """
+        if data is None or data.empty:
+            return None
+
+        through = through or self.calendar.last_completed_session()
+        completed = data.index.normalize() <= pd.Timestamp(through)
+        settled, partial = data[completed], data[~completed]
+        if settled.empty:
+            return None
+
+        symbol = symbol.upper()
+        state = self.get(symbol)
+        start = self._resume_position(state, settled)
+        if start is None:
+            state = IndicatorState.from_frame(settled, self.config)
+            self.rebuilds += 1
+        else:
+            for day, close, volume in zip(settled.index[start:], settled['Close'].iloc[start:],
+                                          settled['Volume'].iloc[start:]):
+                state.update(day, close, volume)
+        self._states[symbol] = state
+
+        if partial.empty:
+            values = state.values()
+        else:
+            # Only the current session can still be in progress
+            values = state.preview(partial['Close'].iloc[-1], partial['Volume'].iloc[-1])
+
+        values['bars'] = len(data)
+        return values
+
+    def _resume_position(self, state: Optional[IndicatorState], settled: pd.DataFrame) -> Optional[int]:
+        """Row of `settled` after the state's last bar, or None if the state must be rebuilt"""
+        if state is None or state.last_date is None:
+            return None
+
+        dates = settled.index.normalize()
+        position = dates.searchsorted(pd.Timestamp(state.last_date), side='right')
+        if position == 0 or dates[position - 1] != pd.Timestamp(state.last_date):
+            return None
+
+        # The state must cover at least the bars it stands in for
+        if state.bars < position:
+            return None
+
+        # Closes that no longer match mean the history was re-adjusted
+        closes = settled['Close'].to_numpy()
+        for k in range(min(MarketConfig.ADJUSTMENT_CHECK_BARS, position, state.closes.size)):
+            stored, current = state.closes.ago(k), closes[position - 1 - k]
+            if abs(stored - current) > MarketConfig.ADJUSTMENT_TOLERANCE * abs(current):
+                return None
+
+        return position
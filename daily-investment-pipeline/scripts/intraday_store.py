@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Intraday Bar Store
+Compact on-disk 1m/5m bars: one chunk file per ticker and session, read back as NumPy arrays
+"""
+
+import os
+import sys
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import INTRADAY_STORE_DIR, MarketConfig
+from scripts.market_data import MarketDataProvider, get_provider
+
+INTRADAY_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# One lock per ticker directory, shared by every store instance in the process
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+def _symbol_lock(path: str) -> threading.Lock:
+    with _symbol_locks_guard:
+        if path not in _symbol_locks:
+            _symbol_locks[path] = threading.Lock()
+        return _symbol_locks[path]
+
+def _epoch_seconds(moment) -> int:
+    """UTC epoch seconds; naive values are taken to be exchange time"""
+    moment = pd.Timestamp(moment)
+    if moment.tzinfo is None:
+        moment = moment.tz_localize(MarketConfig.TIMEZONE)
+    return int(moment.timestamp())
+
+def encode_chunk(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Pack bars into the chunk layout
+
+        base    int64      epoch seconds of the first bar
+        deltas  int32 (n)  seconds since the previous bar (0 for the first)
+        ohlc    float32 (n, 4)
+        volume  int64 (n)
+    """
+    index = data.index if data.index.tz is not None else data.index.tz_localize(MarketConfig.TIMEZONE)
+    times = np.asarray(index.tz_convert('UTC').tz_localize(None), dtype='datetime64[s]').astype(np.int64)
+    deltas = np.diff(times, prepend=times[0]).astype(np.int32)
+
+    return {
+        'base': np.int64(times[0]),
+        'deltas': deltas,
+        'ohlc': data[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float32),
+        'volume': data['Volume'].fillna(0).to_numpy(dtype=np.int64)
+    }
+
+def decode_chunk(chunk) -> Dict[str, np.ndarray]:
+    """Unpack a chunk into flat arrays: time (int64 epoch seconds), OHLC (float32), Volume (int64)"""
+    ohlc = chunk['ohlc']
+    return {
+        'time': int(chunk['base']) + np.cumsum(chunk['deltas'], dtype=np.int64),
+        'Open': ohlc[:, 0],
+        'High': ohlc[:, 1],
+        'Low': ohlc[:, 2],
+        'Close': ohlc[:, 3],
+        'Volume': chunk['volume']
+    }
+
+def _empty_arrays() -> Dict[str, np.ndarray]:
+    arrays = {'time': np.empty(0, dtype=np.int64), 'Volume': np.empty(0, dtype=np.int64)}
+    for field in ['Open', 'High', 'Low', 'Close']:
+        arrays[field] = np.empty(0, dtype=np.float32)
+    return arrays
+
+def arrays_to_frame(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """OHLCV DataFrame on an exchange-time index, for code written against DataFrames"""
+    index = pd.to_datetime(arrays['time'], unit='s', utc=True).tz_convert(MarketConfig.TIMEZONE)
+    return pd.DataFrame({field: arrays[field] for field in INTRADAY_FIELDS}, index=index)
+
+class IntradayStore:
+    """Per-ticker directory of per-session .npz chunks for one bar interval
+
+    A 5m session is 78 bars of 28 bytes (16 float32 prices, an int64 volume and
+    an int32 time delta) versus ~48 bytes of float64 plus an int64 index in a
+    DataFrame, and a range read only opens the sessions it covers.
+    """
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None,
+                 interval: str = MarketConfig.INTRADAY_INTERVAL,
+                 root: Optional[str] = None):
+        if interval not in MarketConfig.INTRADAY_INTERVALS:
+            raise ValueError(f"Unsupported intraday interval: {interval}")
+
+        self.provider = provider or get_provider()
+        self.interval = interval
+        self.root = root or os.path.join(INTRADAY_STORE_DIR, self.provider.name, interval)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol.upper())
+
+    def _chunk_path(self, symbol: str, day: date) -> str:
+        return os.path.join(self._symbol_dir(symbol), f"{day.isoformat()}.npz")
+
+    def sessions(self, symbol: str) -> List[date]:
+        """Sessions stored for a ticker, oldest first"""
+        try:
+            names = os.listdir(self._symbol_dir(symbol))
+        except FileNotFoundError:
+            return []
+        return sorted(date.fromisoformat(name[:-4]) for name in names
+                      if name.endswith('.npz') and not name.endswith('.tmp.npz'))
+
+    def load_session(self, symbol: str, day: date) -> Optional[Dict[str, np.ndarray]]:
+        path = self._chunk_path(symbol, day)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as chunk:
+            return decode_chunk(chunk)
+
+    def save(self, symbol: str, data: pd.DataFrame):
+        """Write bars into their session chunks, merging with bars already stored"""
+        if data is None or data.empty:
+            return
+
+        data = data[INTRADAY_FIELDS].dropna(subset=['Close'])
+        if data.index.tz is None:
+            data.index = data.index.tz_localize(MarketConfig.TIMEZONE)
+        data = data.tz_convert(MarketConfig.TIMEZONE)
+
+        symbol_dir = self._symbol_dir(symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+
+        with _symbol_lock(symbol_dir):
+            for day, bars in data.groupby(data.index.date):
+                existing = self.load_session(symbol, day)
+                if existing is not None:
+                    # Later bars win: the live session's last bar is rewritten as it fills in
+                    bars = pd.concat([arrays_to_frame(existing), bars])
+                    bars = bars[~bars.index.duplicated(keep='last')]
+                bars = bars.sort_index()
+
+                path = self._chunk_path(symbol, day)
+                tmp_path = f"{path[:-4]}.tmp.npz"
+                np.savez(tmp_path, **encode_chunk(bars))
+                os.replace(tmp_path, path)
+
+    def read_range(self, symbol: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """Bars with start <= time < end as flat arrays (see decode_chunk), no network access"""
+        start_s = _epoch_seconds(start) if start is not None else None
+        end_s = _epoch_seconds(end) if end is not None else None
+        first_day = pd.Timestamp(start_s, unit='s', tz='UTC').tz_convert(MarketConfig.TIMEZONE).date() \
+            if start_s is not None else None
+        last_day = pd.Timestamp(end_s, unit='s', tz='UTC').tz_convert(MarketConfig.TIMEZONE).date() \
+            if end_s is not None else None
+
+        chunks = [
+            self.load_session(symbol, day) for day in self.sessions(symbol)
+            if (first_day is None or day >= first_day) and (last_day is None or day <= last_day)
+        ]
+        chunks = [chunk for chunk in chunks if chunk is not None]
+        if not chunks:
+            return _empty_arrays()
+
+        arrays = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+        # Chunks are time-ordered, so the range is a pair of binary searches
+        lo = np.searchsorted(arrays['time'], start_s, side='left') if start_s is not None else 0
+        hi = np.searchsorted(arrays['time'], end_s, side='left') if end_s is not None else len(arrays['time'])
+        return {key: values[lo:hi] for key, values in arrays.items()}
+
+    def read_frame(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """read_range as a DataFrame"""
+        return arrays_to_frame(self.read_range(symbol, start, end))
+
+    def update(self, symbol: str) -> int:
+        """Fetch bars since the last stored one (or the provider's full lookback); returns bars written"""
+        stored = self.sessions(symbol)
+        start = None
+        if stored:
+            last = self.load_session(symbol, stored[-1])
+            # Re-pull the last stored bar, it may have been captured while still forming
+            start = pd.Timestamp(int(last['time'][-1]), unit='s', tz='UTC')
+            oldest = pd.Timestamp.now(tz='UTC') - timedelta(days=MarketConfig.INTRADAY_LOOKBACK_DAYS[self.interval])
+            start = max(start, oldest)
+
+        try:
+            data = self.provider.intraday(symbol, self.interval, start)
+        except Exception as e:
+            print(f"Error fetching {self.interval} bars for {symbol}: {e}")
+            return 0
+
+        self.save(symbol, data)
+        return 0 if data is None else len(data)
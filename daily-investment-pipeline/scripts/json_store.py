@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+JSON Store
+Process-wide table of entries backed by one JSON file, written in batches
+"""
+
+import atexit
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+class JsonStore:
+    """Entries for one JSON file, shared by every cache built on that file
+
+    Writes only change the in-memory table and mark it dirty; `flush` writes
+    the file once for a whole batch of changes. The table lock is only held
+    while copying the entries, so lookups never wait on disk I/O, and the file
+    is replaced atomically so readers never see a half-written one. Anything
+    still dirty is flushed when the process exits.
+    """
+
+    def __init__(self, path: str, indent: Optional[int] = None):
+        self.path = path
+        self.indent = indent
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Any] = self._read_disk()
+
+    def _read_disk(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._dirty = True
+
+    def update(self, entries: Dict[str, Any]):
+        with self._lock:
+            self._entries.update(entries)
+            self._dirty = True
+
+    def pop(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def prune(self, expired: Callable[[Any], bool]) -> List[str]:
+        """Drop every entry for which `expired(entry)` is true; returns the dropped keys"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if expired(entry)]
+            for key in keys:
+                del self._entries[key]
+            self._dirty = self._dirty or bool(keys)
+        return keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def flush(self):
+        """Write the table to disk if anything changed since the last flush"""
+        # One writer at a time, so an older snapshot never replaces a newer one
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self._entries)
+                self._dirty = False
+
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(snapshot, f, indent=self.indent, default=str)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error writing {self.path}: {e}")
+                with self._lock:
+                    self._dirty = True
+
+_stores: Dict[str, JsonStore] = {}
+_stores_lock = threading.Lock()
+
+def get_json_store(path: str, indent: Optional[int] = None) -> JsonStore:
+    """Return the process-wide store for a file, loading it from disk once"""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = JsonStore(path, indent)
+        return _stores[path]
+
+@atexit.register
+def flush_all():
+    """Flush every store with unwritten changes"""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
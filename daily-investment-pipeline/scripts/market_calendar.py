@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Market Calendar
+NYSE trading sessions (holidays and half-days) and the cache freshness policy built on them
+"""
+
+import os
+import sys
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Set
+
+import pytz
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import MarketConfig
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday of a month (n=-1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(day: date) -> date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+class MarketCalendar:
+    """Rule-based NYSE calendar in exchange local time"""
+
+    def __init__(self, timezone: str = MarketConfig.TIMEZONE):
+        self.tz = pytz.timezone(timezone)
+        self.open_time = time.fromisoformat(MarketConfig.MARKET_OPEN)
+        self.close_time = time.fromisoformat(MarketConfig.MARKET_CLOSE)
+        self.early_close_time = time.fromisoformat(MarketConfig.EARLY_CLOSE)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def holidays(year: int) -> Dict[date, str]:
+        """Full-day closures for a year"""
+        days = {
+            _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+            _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+            _easter(year) - timedelta(days=2): "Good Friday",
+            _nth_weekday(year, 5, 0, -1): "Memorial Day",
+            _observed(date(year, 7, 4)): "Independence Day",
+            _nth_weekday(year, 9, 0, 1): "Labor Day",
+            _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+            _observed(date(year, 12, 25)): "Christmas Day"
+        }
+
+        # New Year's Day on a Saturday is not observed on the prior Friday
+        new_year = date(year, 1, 1)
+        if new_year.weekday() == 6:
+            days[new_year + timedelta(days=1)] = "New Year's Day"
+        elif new_year.weekday() < 5:
+            days[new_year] = "New Year's Day"
+
+        if year >= 2022:
+            days[_observed(date(year, 6, 19))] = "Juneteenth"
+
+        return days
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def early_closes(year: int) -> Set[date]:
+        """Half-day sessions closing at MarketConfig.EARLY_CLOSE"""
+        candidates = [
+            _nth_weekday(year, 11, 3, 4) + timedelta(days=1),  # Day after Thanksgiving
+            date(year, 12, 24)                                 # Christmas Eve
+        ]
+        # July 3rd is a half-day only when Independence Day itself falls on a weekday
+        if date(year, 7, 4).weekday() < 5:
+            candidates.append(date(year, 7, 3))
+
+        return {day for day in candidates if MarketCalendar.is_trading_day(day)}
+
+    @staticmethod
+    def is_trading_day(day: date) -> bool:
+        return day.weekday() < 5 and day not in MarketCalendar.holidays(day.year)
+
+    def previous_trading_day(self, day: date) -> date:
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def now(self) -> datetime:
+        return datetime.now(self.tz)
+
+    def session_open(self, day: date) -> datetime:
+        return self.tz.localize(datetime.combine(day, self.open_time))
+
+    def session_close(self, day: date) -> datetime:
+        close = self.early_close_time if day in self.early_closes(day.year) else self.close_time
+        return self.tz.localize(datetime.combine(day, close))
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """Whether the regular session is in progress"""
+        now = self._localize(now)
+        today = now.date()
+        if not self.is_trading_day(today):
+            return False
+        return self.session_open(today) <= now < self.session_close(today)
+
+    def last_completed_session(self, now: Optional[datetime] = None) -> date:
+        """Most recent trading day whose session has closed"""
+        now = self._localize(now)
+        today = now.date()
+        if self.is_trading_day(today) and now >= self.session_close(today):
+            return today
+        return self.previous_trading_day(today)
+
+    def _localize(self, moment: Optional[datetime]) -> datetime:
+        if moment is None:
+            return self.now()
+        if moment.tzinfo is None:
+            # Naive timestamps are system local time
+            moment = moment.astimezone()
+        return moment.astimezone(self.tz)
+
+class FreshnessPolicy:
+    """Decide whether cached daily bars must be refetched
+
+    Bars for closed sessions are immutable once captured after that session's
+    close, so after-hours, weekend and holiday runs are served from cache.
+    During market hours only the live session's bar is refreshed, at most every
+    MarketConfig.INTRADAY_REFRESH_MINUTES.
+    """
+
+    def __init__(self, calendar: Optional[MarketCalendar] = None):
+        self.calendar = calendar or MarketCalendar()
+        self.intraday_refresh = timedelta(minutes=MarketConfig.INTRADAY_REFRESH_MINUTES)
+        self.settle = timedelta(minutes=MarketConfig.CLOSE_SETTLE_MINUTES)
+
+    def needs_refresh(self, fetched_at: Optional[datetime],
+                      now: Optional[datetime] = None) -> bool:
+        """Whether bars last fetched at `fetched_at` may have changed since"""
+        if fetched_at is None:
+            return True
+
+        now = self.calendar._localize(now)
+        fetched_at = self.calendar._localize(fetched_at)
+
+        if self.calendar.is_open(now):
+            session_open = self.calendar.session_open(now.date())
+            return fetched_at < session_open or now - fetched_at >= self.intraday_refresh
+
+        # Anything fetched after the last session closed and settled is final, even if the
+        # provider had no bar for it (halted or delisted symbols)
+        last_session = self.calendar.last_completed_session(now)
+        return fetched_at < self.calendar.session_close(last_session) + self.settle
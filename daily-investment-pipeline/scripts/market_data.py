@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Market Data Providers
+Pluggable sources for OHLCV history and fundamentals, including an offline replay provider
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import REPLAY_DIR, MarketConfig
+from scripts.fetch_executor import get_rate_limiter
+from scripts.market_calendar import MarketCalendar
+
+class MarketDataProvider(ABC):
+    """Interface every market data source implements"""
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Daily OHLCV bars in [start, end); full history when start is None"""
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict:
+        """Fundamentals / company information"""
+
+    def intraday(self, symbol: str, interval: str = MarketConfig.INTRADAY_INTERVAL,
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Regular-session intraday OHLCV bars on a timezone-aware index"""
+        raise NotImplementedError(f"{self.name} provider has no intraday data")
+
+    def history_batch(self, symbols: List[str], start: Optional[pd.Timestamp] = None,
+                      end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        """Daily bars for several symbols; providers with a bulk endpoint override this"""
+        results = {}
+        for symbol in symbols:
+            data = self.history(symbol, start, end)
+            if data is not None and not data.empty:
+                results[symbol] = data
+        return results
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Latest close and volume per symbol ({'price', 'volume', 'date'}) from one bulk request"""
+        # A week of bars always spans the last session, even across holiday weekends
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=7)
+        quotes = {}
+        for symbol, data in self.history_batch(symbols, start).items():
+            data = data.dropna(subset=['Close'])
+            if data.empty:
+                continue
+            quotes[symbol] = {
+                'price': float(data['Close'].iloc[-1]),
+                'volume': float(data['Volume'].iloc[-1]),
+                'date': data.index[-1]
+            }
+        return quotes
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data from Yahoo Finance via yfinance
+
+    yfinance keeps one pooled session per process on its own (curl_cffi, which
+    Yahoo requires); pass `session` only to substitute a compatible one.
+    Caching sessions are rejected by yfinance.
+    """
+
+    name = "yfinance"
+
+    def __init__(self, session=None):
+        self.session = session
+
+    def _ticker(self, symbol: str) -> 'yf.Ticker':
+        return yf.Ticker(symbol, session=self.session)
+
+    def _throttle(self, calls: int = 1):
+        """Spend `calls` calls from the shared Yahoo budget, one token at a time
+
+        Taking tokens singly lets a charge larger than the burst capacity go
+        through at the sustained rate instead of waiting for a bucket that big.
+        """
+        limiter = get_rate_limiter(self.name)
+        for _ in range(calls):
+            limiter.acquire()
+
+    def history(self, symbol: str, start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        self._throttle()
+        stock = self._ticker(symbol)
+        timeout = MarketConfig.REQUEST_TIMEOUT_SECONDS
+        if start is None:
+            return stock.history(period="max", timeout=timeout)
+        return stock.history(start=start, end=end, timeout=timeout)
+
+    def history_batch(self, symbols: List[str], start: Optional[pd.Timestamp] = None,
+                      end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        # yf.download requests every symbol separately upstream, so each one costs a call
+        self._throttle(len(symbols))
+        timeout = MarketConfig.REQUEST_TIMEOUT_SECONDS
+        if start is None:
+            raw = yf.download(symbols, period="max", group_by='ticker', auto_adjust=True,
+                              progress=False, timeout=timeout, session=self.session)
+        else:
+            raw = yf.download(symbols, start=start, end=end, group_by='ticker', auto_adjust=True,
+                              progress=False, timeout=timeout, session=self.session)
+
+        if raw is None or raw.empty:
+            return {}
+
+        # Older yfinance returns flat field columns when only one symbol was asked for
+        if not isinstance(raw.columns, pd.MultiIndex):
+            return {symbols[0]: raw} if len(symbols) == 1 else {}
+
+        returned = set(raw.columns.get_level_values(0))
+        return {symbol: raw[symbol] for symbol in symbols if symbol in returned}
+
+    def intraday(self, symbol: str, interval: str = MarketConfig.INTRADAY_INTERVAL,
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        self._throttle()
+        stock = self._ticker(symbol)
+        timeout = MarketConfig.REQUEST_TIMEOUT_SECONDS
+        if start is None:
+            period = f"{MarketConfig.INTRADAY_LOOKBACK_DAYS[interval]}d"
+            return stock.history(period=period, interval=interval, prepost=False, timeout=timeout)
+        return stock.history(start=start, end=end, interval=interval, prepost=False, timeout=timeout)
+
+    def info(self, symbol: str) -> Dict:
+        self._throttle()
+        return self._ticker(symbol).info
+
+class ReplayProvider(MarketDataProvider):
+    """File-backed provider serving recorded or synthetic data with configurable latency
+
+    Layout of the replay directory:
+        {SYMBOL}.csv        Date-indexed Open/High/Low/Close/Volume bars
+        fundamentals.json   {SYMBOL: {field: value}}
+    """
+
+    name = "replay"
+
+    def __init__(self, root: str = REPLAY_DIR,
+                 latency_ms: float = MarketConfig.REPLAY_LATENCY_MS,
+                 synthetic: bool = MarketConfig.REPLAY_SYNTHETIC):
+        self.root = root
+        self.latency_ms = latency_ms
+        self.synthetic = synthetic
+        self._bars: Dict[str, pd.DataFrame] = {}
+        self._fundamentals: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _simulate_latency(self):
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    def _load_bars(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            if symbol not in self._bars:
+                path = os.path.join(self.root, f"{symbol.upper()}.csv")
+                if os.path.exists(path):
+                    self._bars[symbol] = pd.read_csv(path, index_col=0, parse_dates=True)
+                elif self.synthetic:
+                    self._bars[symbol] = synthetic_history(symbol)
+                else:
+                    self._bars[symbol] = pd.DataFrame()
+            return self._bars[symbol]
+
+    def _slice(self, data: pd.DataFrame, start: Optional[pd.Timestamp],
+               end: Optional[pd.Timestamp]) -> pd.DataFrame:
+        if data.empty:
+            return data.copy()
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        return data.copy()
+
+    def history(self, symbol: str, start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        self._simulate_latency()
+        return self._slice(self._load_bars(symbol), start, end)
+
+    def history_batch(self, symbols: List[str], start: Optional[pd.Timestamp] = None,
+                      end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        # One simulated round trip for the whole batch, like a bulk download
+        self._simulate_latency()
+        results = {}
+        for symbol in symbols:
+            data = self._slice(self._load_bars(symbol), start, end)
+            if not data.empty:
+                results[symbol] = data
+        return results
+
+    def intraday(self, symbol: str, interval: str = MarketConfig.INTRADAY_INTERVAL,
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        self._simulate_latency()
+        path = os.path.join(self.root, f"{symbol.upper()}_{interval}.csv")
+        if os.path.exists(path):
+            data = pd.read_csv(path, index_col=0)
+            data.index = pd.to_datetime(data.index, utc=True).tz_convert(MarketConfig.TIMEZONE)
+        elif self.synthetic:
+            data = synthetic_intraday(symbol, interval, start, end)
+        else:
+            return pd.DataFrame()
+
+        if start is not None:
+            data = data[data.index >= _as_market_time(start)]
+        if end is not None:
+            data = data[data.index < _as_market_time(end)]
+        return data.copy()
+
+    def info(self, symbol: str) -> Dict:
+        self._simulate_latency()
+        with self._lock:
+            if self._fundamentals is None:
+                try:
+                    with open(os.path.join(self.root, "fundamentals.json"), 'r') as f:
+                        self._fundamentals = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    self._fundamentals = {}
+
+        info = self._fundamentals.get(symbol.upper())
+        if info is None and self.synthetic:
+            info = synthetic_info(symbol)
+        return dict(info or {})
+
+class ProviderHealth:
+    """EWMA of call latency and error rate for one provider"""
+
+    def __init__(self, alpha: float = MarketConfig.PROVIDER_EWMA_ALPHA):
+        self.alpha = alpha
+        self.latency: Optional[float] = None  # Seconds, successful calls only
+        self.error_rate = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+            if ok:
+                self.latency = seconds if self.latency is None else \
+                    self.latency + self.alpha * (seconds - self.latency)
+
+    def cost(self) -> Optional[float]:
+        """Ranking cost: expected latency inflated by recent errors; None until first used"""
+        with self._lock:
+            if self.calls == 0:
+                return None
+            # A provider that has only ever failed is assumed to take the full timeout
+            latency = self.latency if self.latency is not None else MarketConfig.REQUEST_TIMEOUT_SECONDS
+            return latency * (1 + MarketConfig.PROVIDER_ERROR_PENALTY * self.error_rate)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {'latency': self.latency, 'error_rate': self.error_rate, 'calls': self.calls}
+
+class FailoverProvider(MarketDataProvider):
+    """Route each call to the healthiest of several providers
+
+    Providers are ranked by an EWMA of observed latency, penalised by their
+    recent error rate. A failed call moves on to the next provider, and when
+    MarketConfig.HEDGE_REQUESTS is set a call still running after
+    HEDGE_AFTER_MULTIPLE times the primary's typical latency is raced against
+    the next provider; the first success wins. Configured providers should
+    serve equivalent data, since their bars share one price store.
+    """
+
+    name = "failover"
+
+    def __init__(self, providers: Optional[List[MarketDataProvider]] = None):
+        self.providers = providers or [get_provider(name) for name in MarketConfig.DATA_PROVIDERS]
+        self.health = {provider.name: ProviderHealth() for provider in self.providers}
+        # Separate from the shared fetch executor: callers are usually running on it already
+        self._pool = ThreadPoolExecutor(max_workers=MarketConfig.HEDGE_WORKERS,
+                                        thread_name_prefix="hedge")
+
+    def ranked(self) -> List[MarketDataProvider]:
+        """Providers cheapest first; untried ones follow in configured order
+
+        Backups get measured whenever a hedge or failover sends them traffic.
+        """
+        def rank(provider: MarketDataProvider):
+            cost = self.health[provider.name].cost()
+            return (1, 0.0) if cost is None else (0, cost)
+        return sorted(self.providers, key=rank)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: health.snapshot() for name, health in self.health.items()}
+
+    def _timed(self, provider: MarketDataProvider, method: str, args: tuple) -> Any:
+        started = time.monotonic()
+        try:
+            result = getattr(provider, method)(*args)
+        except Exception:
+            self.health[provider.name].record(time.monotonic() - started, ok=False)
+            raise
+        self.health[provider.name].record(time.monotonic() - started, ok=True)
+        return result
+
+    def _hedge_delay(self, provider: MarketDataProvider) -> Optional[float]:
+        if not MarketConfig.HEDGE_REQUESTS:
+            return None
+        latency = self.health[provider.name].latency
+        if latency is None:
+            return MarketConfig.REQUEST_TIMEOUT_SECONDS / 2
+        return max(MarketConfig.HEDGE_MIN_SECONDS, MarketConfig.HEDGE_AFTER_MULTIPLE * latency)
+
+    def _call(self, method: str, *args) -> Any:
+        """Run a provider method with failover and hedging"""
+        backups = self.ranked()
+        primary = backups.pop(0)
+        running = {self._pool.submit(self._timed, primary, method, args): primary}
+        last_error: Optional[Exception] = None
+
+        while running:
+            # Only the newest attempt sets the hedge timer; with no backups left, just wait
+            newest = list(running.values())[-1]
+            timeout = self._hedge_delay(newest) if backups else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                backup = backups.pop(0)
+                running[self._pool.submit(self._timed, backup, method, args)] = backup
+                continue
+
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    print(f"{provider.name} {method} failed: {e}")
+                    last_error = e
+
+            if not running and backups:
+                backup = backups.pop(0)
+                running[self._pool.submit(self._timed, backup, method, args)] = backup
+
+        raise last_error
+
+    def history(self, symbol: str, start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        return self._call('history', symbol, start, end)
+
+    def history_batch(self, symbols: List[str], start: Optional[pd.Timestamp] = None,
+                      end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        return self._call('history_batch', symbols, start, end)
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        return self._call('quotes', symbols)
+
+    def intraday(self, symbol: str, interval: str = MarketConfig.INTRADAY_INTERVAL,
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        return self._call('intraday', symbol, interval, start, end)
+
+    def info(self, symbol: str) -> Dict:
+        return self._call('info', symbol)
+
+def _symbol_rng(symbol: str) -> np.random.Generator:
+    """Deterministic random generator per symbol, so synthetic runs are repeatable"""
+    return np.random.default_rng(zlib.crc32(symbol.upper().encode()))
+
+def synthetic_history(symbol: str, days: int = 1500,
+                      end: Optional[datetime] = None) -> pd.DataFrame:
+    """Geometric random walk of daily bars ending at the last business day"""
+    rng = _symbol_rng(symbol)
+    end = pd.Timestamp(end or datetime.now()).normalize()
+    dates = pd.bdate_range(end=end, periods=days, name='Date')
+
+    start_price = rng.uniform(20, 400)
+    returns = rng.normal(0.0004, 0.02, days)
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = close * (1 + rng.normal(0, 0.005, days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, days)))
+    volume = rng.lognormal(15, 0.5, days).astype(np.int64)
+
+    return pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume
+    }, index=dates)
+
+def _as_market_time(moment) -> pd.Timestamp:
+    """Timestamp in exchange time; naive values are taken to be exchange time already"""
+    moment = pd.Timestamp(moment)
+    if moment.tzinfo is None:
+        return moment.tz_localize(MarketConfig.TIMEZONE)
+    return moment.tz_convert(MarketConfig.TIMEZONE)
+
+def synthetic_intraday(symbol: str, interval: str = MarketConfig.INTRADAY_INTERVAL,
+                       start: Optional[pd.Timestamp] = None,
+                       end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Random-walk session bars that open and close at the synthetic daily bar's prices"""
+    calendar = MarketCalendar()
+    step = MarketConfig.INTRADAY_INTERVALS[interval]
+    now = pd.Timestamp(calendar.now())
+    end = min(_as_market_time(end), now) if end is not None else now
+    if start is None:
+        start = end - pd.Timedelta(days=MarketConfig.INTRADAY_LOOKBACK_DAYS[interval])
+    start = _as_market_time(start)
+
+    daily = synthetic_history(symbol)
+    frames = []
+    for day in pd.date_range(start.normalize().tz_localize(None), end.normalize().tz_localize(None)):
+        day = day.date()
+        if not calendar.is_trading_day(day) or pd.Timestamp(day) not in daily.index:
+            continue
+        # Whole sessions are generated so a bar never depends on the requested window
+        index = pd.date_range(calendar.session_open(day), calendar.session_close(day),
+                              freq=f"{step}s", inclusive='left')
+        if not ((index >= start) & (index < end)).any():
+            continue
+
+        bar = daily.loc[pd.Timestamp(day)]
+        rng = np.random.default_rng(zlib.crc32(f"{symbol.upper()}:{day}".encode()))
+        n = len(index)
+        # Brownian bridge from the daily open to the daily close
+        walk = np.cumsum(rng.normal(0, 0.001, n))
+        walk -= np.linspace(0, walk[-1], n)
+        close = bar['Open'] * (bar['Close'] / bar['Open']) ** (np.arange(1, n + 1) / n) * np.exp(walk)
+        open_ = np.concatenate([[bar['Open']], close[:-1]])
+        spread = np.abs(rng.normal(0, 0.0008, n))
+        frames.append(pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) * (1 + spread),
+            'Low': np.minimum(open_, close) * (1 - spread),
+            'Close': close,
+            'Volume': (bar['Volume'] / n * rng.lognormal(0, 0.3, n)).astype(np.int64)
+        }, index=index).loc[lambda bars: (bars.index >= start) & (bars.index < end)])
+
+    if not frames:
+        return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+    return pd.concat(frames)
+
+def synthetic_info(symbol: str) -> Dict:
+    """Plausible fundamentals for a synthetic symbol"""
+    rng = _symbol_rng(symbol)
+    return {
+        'longName': f"{symbol.upper()} Synthetic Corp",
+        'marketCap': int(rng.uniform(2e9, 2e12)),
+        'trailingPE': round(rng.uniform(8, 80), 2),
+        'forwardPE': round(rng.uniform(8, 60), 2),
+        'revenueGrowth': round(rng.uniform(-0.05, 0.45), 3),
+        'earningsGrowth': round(rng.uniform(-0.2, 0.6), 3),
+        'beta': round(rng.uniform(0.5, 2.5), 2),
+        'priceToSalesTrailing12Months': round(rng.uniform(1, 30), 2)
+    }
+
+def record_replay(source: MarketDataProvider, symbols: List[str],
+                  root: str = REPLAY_DIR, start: Optional[pd.Timestamp] = None) -> str:
+    """Capture bars and fundamentals from a live provider into a replay directory"""
+    os.makedirs(root, exist_ok=True)
+
+    fundamentals_path = os.path.join(root, "fundamentals.json")
+    try:
+        with open(fundamentals_path, 'r') as f:
+            fundamentals = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        fundamentals = {}
+
+    for symbol in symbols:
+        try:
+            data = source.history(symbol, start)
+            if data is None or data.empty:
+                print(f"No history recorded for {symbol}")
+                continue
+            if data.index.tz is not None:
+                data.index = data.index.tz_localize(None)
+            columns = [col for col in ['Open', 'High', 'Low', 'Close', 'Volume'] if col in data]
+            data[columns].to_csv(os.path.join(root, f"{symbol.upper()}.csv"), index_label='Date')
+            fundamentals[symbol.upper()] = source.info(symbol)
+            print(f"Recorded {symbol}: {len(data)} bars")
+        except Exception as e:
+            print(f"Error recording {symbol}: {e}")
+
+    with open(fundamentals_path, 'w') as f:
+        json.dump(fundamentals, f, indent=2, default=str)
+
+    return root
+
+# Provider instances shared by every component in the process
+_providers: Dict[str, MarketDataProvider] = {}
+_providers_lock = threading.RLock()  # Re-entered when the failover provider builds its members
+
+PROVIDER_CLASSES = {
+    'yfinance': YFinanceProvider,
+    'replay': ReplayProvider,
+    'failover': FailoverProvider
+}
+
+def get_provider(name: Optional[str] = None) -> MarketDataProvider:
+    """Return the shared provider instance for a name (default: MarketConfig.DATA_PROVIDER)"""
+    name = name or MarketConfig.DATA_PROVIDER
+    if name not in PROVIDER_CLASSES:
+        raise ValueError(f"Unknown market data provider: {name}")
+
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = PROVIDER_CLASSES[name]()
+        return _providers[name]
+
+def main():
+    """Record live data for offline replay"""
+    parser = argparse.ArgumentParser(description='Record market data for the replay provider')
+    parser.add_argument('symbols', nargs='+', help='Ticker symbols to record')
+    parser.add_argument('--since', default=None, help='First date to record (YYYY-MM-DD, default: all)')
+    parser.add_argument('--output', default=REPLAY_DIR, help='Replay directory')
+    args = parser.parse_args()
+
+    start = pd.Timestamp(args.since) if args.since else None
+    root = record_replay(get_provider('yfinance'), args.symbols, args.output, start)
+    print(f"💾 Replay data saved to: {root}")
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,21 @@ import json
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from urllib.parse import quote
-import time
 import re
 
 # Add parent directory to path for config imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config.settings import get_config
+from scripts.fetch_executor import (
+    PRIORITY_NEWS, Deadline, FetchTimeout, get_fetch_executor, get_rate_limiter, result_within
+)
+from scripts.request_coalescer import get_request_coalescer
+from scripts.news_cache import NewsCache
+from scripts.http_session import get_http_session
+from scripts.security_master import get_security_master
 
 @dataclass
 class NewsArticle:
@@ -33,11 +39,15 @@ class NewsArticle:
     impact_level: str  # high, medium, low
 
 class NewsAnalyzer:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.config = get_config()
         self.sector_config = self.config['sectors'].FOCUS_SECTORS
         self.news_config = self.config['news']
         self.api_key = os.getenv('NEWS_API_KEY', '')
+        self.news_cache = NewsCache()
+        self.security_master = get_security_master()
+        # Pooled keep-alive session shared with other fetchers, unless one is injected
+        self.session = session or get_http_session()
         
     def analyze_sentiment(self, text: str) -> str:
         """Analyze sentiment of news text"""
@@ -61,12 +71,8 @@ class NewsAnalyzer:
         ticker_pattern = r'\b[A-Z]{2,5}\b'
         potential_tickers = re.findall(ticker_pattern, text)
         
-        # Filter against known tickers from all sectors
-        known_tickers = []
-        for sector_data in self.sector_config.values():
-            known_tickers.extend(sector_data['tickers'])
-        
-        return [ticker for ticker in potential_tickers if ticker in known_tickers]
+        # Filter against tickers in the security master
+        return [ticker for ticker in potential_tickers if ticker in self.security_master]
     
     def calculate_relevance(self, article: Dict, sector: str) -> float:
         """Calculate relevance score for article to specific sector"""
@@ -122,39 +128,65 @@ class NewsAnalyzer:
         
         return max(sector_scores, key=sector_scores.get)
     
-    def fetch_news_articles(self, days_back: int = 1) -> List[Dict]:
-        """Fetch news articles from various sources"""
+    def fetch_news_articles(self, days_back: int = 1,
+                            deadline: Optional[Deadline] = None) -> List[Dict]:
+        """Fetch news articles from various sources; requests that miss `deadline` are skipped"""
         articles = []
         
         # Free sources (no API key required)
-        articles.extend(self._fetch_yahoo_finance_news())
+        articles.extend(self._fetch_yahoo_finance_news(deadline))
         articles.extend(self._fetch_reuters_rss())
         
         # Paid API sources (if API key available)
         if self.api_key:
-            articles.extend(self._fetch_newsapi_articles(days_back))
+            articles.extend(self._fetch_newsapi_articles(days_back, deadline))
         
+        self.news_cache.flush()
         return articles
     
-    def _fetch_yahoo_finance_news(self) -> List[Dict]:
+    def _fetch_yahoo_finance_news(self, deadline: Optional[Deadline] = None) -> List[Dict]:
         """Fetch news from Yahoo Finance (free)"""
         articles = []
         
         # Get news for each sector's top tickers
+        tickers = []
         for sector, sector_data in self.sector_config.items():
-            for ticker in sector_data['tickers'][:3]:  # Limit to top 3 per sector
-                try:
-                    url = f"https://query1.finance.yahoo.com/v1/finance/search?q={ticker}"
-                    response = requests.get(url, timeout=10)
-                    
-                    if response.status_code == 200:
-                        # This is a simplified version - Yahoo's actual news API is more complex
-                        # In production, you'd use the yfinance library or scrape news sections
-                        print(f"Fetched Yahoo Finance data for {ticker}")
-                        time.sleep(0.5)  # Rate limiting
-                        
-                except Exception as e:
-                    print(f"Error fetching Yahoo Finance news for {ticker}: {e}")
+            tickers.extend(sector_data['tickers'][:3])  # Limit to top 3 per sector
+        
+        # Fetch concurrently; the shared rate limiter keeps us within Yahoo's budget
+        for ticker_articles in get_fetch_executor().map(
+                self._fetch_yahoo_ticker_news_once, tickers, priority=PRIORITY_NEWS,
+                deadline=deadline, default=[]):
+            articles.extend(ticker_articles)
+        
+        return articles
+    
+    def _fetch_yahoo_ticker_news_once(self, ticker: str) -> List[Dict]:
+        """Share one search per ticker with any other component in the same run
+        
+        Results are also kept in the news cache, so a pre-market warm-up serves the brief.
+        """
+        try:
+            return get_request_coalescer().do(
+                ('yahoo', ticker, 'news'),
+                self.news_cache.fetch, f"yahoo:{ticker}", self._fetch_yahoo_ticker_news, ticker
+            )
+        except Exception as e:
+            print(f"Error fetching Yahoo Finance news for {ticker}: {e}")
+            return []
+    
+    def _fetch_yahoo_ticker_news(self, ticker: str) -> List[Dict]:
+        """Fetch Yahoo Finance search results for one ticker (raises on failure)"""
+        articles = []
+        
+        get_rate_limiter('yahoo').acquire()
+        url = f"https://query1.finance.yahoo.com/v1/finance/search?q={ticker}"
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        
+        # This is a simplified version - Yahoo's actual news API is more complex
+        # In production, you'd use the yfinance library or scrape news sections
+        print(f"Fetched Yahoo Finance data for {ticker}")
         
         return articles
     
@@ -168,17 +200,24 @@ class NewsAnalyzer:
         
         for feed_url in rss_feeds:
             try:
-                # In production, you'd parse RSS XML
-                # For demo, we'll simulate
-                print(f"Fetching RSS from {feed_url}")
-                time.sleep(0.5)
-                
+                articles.extend(
+                    self.news_cache.fetch(f"reuters:{feed_url}", self._fetch_rss_feed, feed_url)
+                )
             except Exception as e:
                 print(f"Error fetching RSS from {feed_url}: {e}")
         
         return articles
     
-    def _fetch_newsapi_articles(self, days_back: int) -> List[Dict]:
+    def _fetch_rss_feed(self, feed_url: str) -> List[Dict]:
+        """Fetch one RSS feed (raises on failure)"""
+        # In production, you'd parse RSS XML
+        # For demo, we'll simulate
+        get_rate_limiter('reuters').acquire()
+        print(f"Fetching RSS from {feed_url}")
+        return []
+    
+    def _fetch_newsapi_articles(self, days_back: int,
+                                deadline: Optional[Deadline] = None) -> List[Dict]:
         """Fetch articles from NewsAPI (requires API key)"""
         articles = []
         
@@ -187,34 +226,53 @@ class NewsAnalyzer:
         
         from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
         
-        # Create search queries for each sector
-        for sector, sector_data in self.sector_config.items():
-            keywords = ' OR '.join(sector_data['keywords'][:5])  # Limit keywords
-            
-            url = "https://newsapi.org/v2/everything"
-            params = {
-                'apiKey': self.api_key,
-                'q': keywords,
-                'from': from_date,
-                'sortBy': 'relevancy',
-                'language': 'en',
-                'pageSize': 20
-            }
-            
+        # Create search queries for each sector, fetched concurrently
+        executor = get_fetch_executor()
+        futures = [
+            executor.submit(self._fetch_newsapi_sector_cached, sector, sector_data, from_date,
+                            priority=PRIORITY_NEWS)
+            for sector, sector_data in self.sector_config.items()
+        ]
+        for future in futures:
             try:
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    articles.extend(data.get('articles', []))
-                    time.sleep(1)  # Rate limiting
-                else:
-                    print(f"NewsAPI error: {response.status_code}")
-                    
-            except Exception as e:
-                print(f"Error fetching NewsAPI articles for {sector}: {e}")
+                articles.extend(result_within(future, deadline))
+            except FetchTimeout:
+                print("NewsAPI request timed out, skipping sector")
         
         return articles
     
+    def _fetch_newsapi_sector_cached(self, sector: str, sector_data: Dict, from_date: str) -> List[Dict]:
+        """NewsAPI articles for one sector, served from the news cache when fresh"""
+        try:
+            return self.news_cache.fetch(
+                f"newsapi:{sector}:{from_date}", self._fetch_newsapi_sector, sector, sector_data, from_date
+            )
+        except Exception as e:
+            print(f"Error fetching NewsAPI articles for {sector}: {e}")
+            return []
+    
+    def _fetch_newsapi_sector(self, sector: str, sector_data: Dict, from_date: str) -> List[Dict]:
+        """Fetch NewsAPI articles for one sector's keywords (raises on failure)"""
+        keywords = ' OR '.join(sector_data['keywords'][:5])  # Limit keywords
+        
+        url = "https://newsapi.org/v2/everything"
+        params = {
+            'q': keywords,
+            'from': from_date,
+            'sortBy': 'relevancy',
+            'language': 'en',
+            'pageSize': 20
+        }
+        
+        get_rate_limiter('newsapi').acquire()
+        # The key goes in a header, not the URL, so it stays out of cache keys and logs
+        response = self.session.get(url, params=params, headers={'X-Api-Key': self.api_key}, timeout=10)
+        if response.status_code != 200:
+            raise RuntimeError(f"NewsAPI error: {response.status_code}")
+        
+        data = response.json()
+        return data.get('articles', [])
+    
     def analyze_articles(self, articles: List[Dict]) -> List[NewsArticle]:
         """Analyze fetched articles and return structured data"""
         analyzed_articles = []
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+News Cache
+On-disk TTL cache of raw articles per news source query
+"""
+
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import NEWS_CACHE_PATH, MarketConfig
+from scripts.json_store import get_json_store
+
+class NewsCache:
+    """Articles keyed by source query (e.g. "yahoo:NVDA"), reused for `ttl_minutes`"""
+
+    def __init__(self, path: str = NEWS_CACHE_PATH,
+                 ttl_minutes: float = MarketConfig.NEWS_CACHE_MINUTES):
+        self.path = path
+        self.ttl_seconds = ttl_minutes * 60
+        self._store = get_json_store(path)
+
+    def flush(self):
+        """Write queries stored since the last flush to disk"""
+        self._store.flush()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cached articles for a query, or None when missing or expired"""
+        entry = self._store.get(key)
+        if entry and time.time() - entry['fetched_at'] < self.ttl_seconds:
+            return list(entry['articles'])
+        return None
+
+    def put(self, key: str, articles: List[Dict]):
+        """Store articles for a query; written to disk on the next flush"""
+        now = time.time()
+        self._store.set(key, {'fetched_at': now, 'articles': articles})
+        # Drop expired queries so the file stays at one TTL's worth of news
+        self._store.prune(lambda entry: now - entry['fetched_at'] >= self.ttl_seconds)
+
+    def fetch(self, key: str, fn: Callable, *args) -> List[Dict]:
+        """Cached articles for key, or fn(*args) stored under it; failures are not cached"""
+        articles = self.get(key)
+        if articles is None:
+            articles = fn(*args)
+            self.put(key, articles)
+        return articles
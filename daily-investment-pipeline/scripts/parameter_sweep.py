@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep
+Grid or random search over TechnicalConfig parameters, backtested on cached history
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import PANEL_DIR, TechnicalConfig
+from scripts.backtester import BUY_CODES, SELL_CODES, lookback_bars, score_indicators
+from scripts.indicator_engine import (
+    IndicatorEngine, IndicatorResult, gains_losses, rsi_from_averages, running_sum, window_mean
+)
+from scripts.price_panel import PricePanel
+from scripts.technical_screener import TechnicalScreener
+
+# Values tried per parameter; the current TechnicalConfig values are always evaluated too.
+# Moving-average windows are not swept: screens read MarketConfig.PRICE_HISTORY_PERIOD
+# of history, shorter than MA_LONG, so MA signals never fire and their windows change
+# no result (see backtester.lookback_bars)
+SWEEP_GRID = {
+    'RSI_PERIOD': [9, 14, 21],
+    'RSI_OVERSOLD': [25, 30, 35],
+    'RSI_OVERBOUGHT': [65, 70, 75],
+    'VOLUME_SPIKE_THRESHOLD': [1.5, 2.0, 2.5]
+}
+
+METRICS = ['buy_signals', 'buy_mean_return', 'buy_hit_rate', 'sell_signals',
+           'sell_mean_return', 'spread', 'score_ic']
+
+def make_config(params: Dict[str, Any]) -> TechnicalConfig:
+    """TechnicalConfig with some parameters overridden"""
+    config = TechnicalConfig()
+    for name, value in params.items():
+        setattr(config, name, value)
+    return config
+
+def is_valid(params: Dict[str, Any]) -> bool:
+    """Moving averages must be ordered short < medium < long, and oversold below overbought"""
+    config = make_config(params)
+    return (config.MA_SHORT < config.MA_MEDIUM < config.MA_LONG
+            and config.RSI_OVERSOLD < config.RSI_OVERBOUGHT)
+
+def default_params(names: Sequence[str]) -> Dict[str, Any]:
+    config = TechnicalConfig()
+    return {name: getattr(config, name) for name in names}
+
+def grid_search(grid: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Every valid combination of the grid values"""
+    names = list(grid)
+    combinations = (dict(zip(names, values)) for values in itertools.product(*grid.values()))
+    return [params for params in combinations if is_valid(params)]
+
+def random_search(grid: Dict[str, Sequence], samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Up to `samples` distinct valid combinations drawn at random from the grid values"""
+    rng = random.Random(seed)
+    total = math.prod(len(values) for values in grid.values())
+    seen = set()
+    configs = []
+    # Invalid draws are discarded, so bound the attempts rather than loop forever on a tight grid
+    for _ in range(samples * 20):
+        if len(configs) >= samples or len(seen) >= total:
+            break
+        values = tuple(rng.choice(list(options)) for options in grid.values())
+        if values in seen:
+            continue
+        seen.add(values)
+        params = dict(zip(grid, values))
+        if is_valid(params):
+            configs.append(params)
+    return configs
+
+class SweepData:
+    """The panel's IndicatorEngine result plus running sums, built once per sweep
+
+    With a leading zero row, the sum of any trailing window is a difference of two
+    rows of the running sum, so each candidate's moving averages and RSI cost one
+    subtraction per point whatever the window. Momentum, the screener-lookback
+    bar counts (see backtester.lookback_bars) and the forward returns do not
+    depend on the swept parameters and are computed here once.
+    """
+
+    def __init__(self, panel: PricePanel, horizon: int = 20):
+        self.base = IndicatorEngine().compute(panel.field('Close'), panel.field('Volume'),
+                                              panel.symbols, panel.dates)
+        self.close = self.base.series['close']
+        self.lookback = lookback_bars(self.base)
+        self.horizon = horizon
+
+        gain, loss = gains_losses(self.close)
+        self._sums = {name: running_sum(values) for name, values in (
+            ('close', self.close), ('volume', self.base.series['volume']), ('gain', gain), ('loss', loss)
+        )}
+
+        rows = self.close.shape[0]
+        self.forward_returns = np.full(self.close.shape, np.nan)
+        if horizon < rows:
+            self.forward_returns[:-horizon] = self.close[horizon:] / self.close[:-horizon] - 1
+
+    def mean(self, name: str, window: int) -> np.ndarray:
+        """Trailing `window` mean of the close, volume, gains or losses at every point"""
+        return window_mean(self._sums[name], window, self.base.bars)
+
+    def indicators(self, config: TechnicalConfig) -> IndicatorResult:
+        """The IndicatorEngine series for one parameter set"""
+        series = dict(self.base.series,
+                      ma_short=self.mean('close', config.MA_SHORT),
+                      ma_medium=self.mean('close', config.MA_MEDIUM),
+                      ma_long=self.mean('close', config.MA_LONG),
+                      rsi=rsi_from_averages(self.mean('gain', config.RSI_PERIOD),
+                                            self.mean('loss', config.RSI_PERIOD)),
+                      volume_avg=self.mean('volume', config.VOLUME_LOOKBACK_DAYS))
+        return IndicatorResult(series, self.base.bars, self.base.symbols, self.base.dates)
+
+def evaluate(data: SweepData, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Backtested metrics of one parameter set over the sweep's forward-return horizon"""
+    config = make_config(params)
+    scores, codes = score_indicators(data.indicators(config), config, data.lookback)
+
+    returns = data.forward_returns
+    known = ~np.isnan(returns)
+    buys = returns[np.isin(codes, BUY_CODES) & known]
+    sells = returns[np.isin(codes, SELL_CODES) & known]
+    scored = known & ~np.isnan(scores)
+
+    buy_mean = float(buys.mean()) if len(buys) else np.nan
+    sell_mean = float(sells.mean()) if len(sells) else np.nan
+    return dict(params, **{
+        'buy_signals': len(buys),
+        'buy_mean_return': buy_mean,
+        'buy_hit_rate': float((buys > 0).mean()) if len(buys) else np.nan,
+        'sell_signals': len(sells),
+        'sell_mean_return': sell_mean,
+        'spread': buy_mean - sell_mean,
+        # Correlation of the score with the forward return over every screened bar
+        'score_ic': float(np.corrcoef(scores[scored], returns[scored])[0, 1]) if scored.sum() > 1 else np.nan
+    })
+
+# Sweep data held by each pool worker process
+_worker_data: Optional[SweepData] = None
+
+def _init_sweep_worker(panel_path: str, horizon: int):
+    global _worker_data
+    _worker_data = SweepData(PricePanel.attach(panel_path), horizon)
+
+def _evaluate_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pool entry point: evaluate parameter sets with this worker's sweep data"""
+    return [evaluate(_worker_data, params) for params in chunk]
+
+class ParameterSweep:
+    """Evaluate many TechnicalConfig parameter sets against the same cached history"""
+
+    def __init__(self, panel: PricePanel, horizon: int = 20):
+        self.panel = panel
+        self.horizon = horizon
+        self.data = SweepData(panel, horizon)
+
+    @classmethod
+    def from_universe(cls, symbols: Optional[List[str]] = None, period: str = "10y",
+                      horizon: int = 20) -> 'ParameterSweep':
+        """Sweep over the screening universe's (cached) history"""
+        screener = TechnicalScreener()
+        return cls(PricePanel.from_frame(screener.fetch_universe_data(symbols, period)), horizon)
+
+    def run(self, configs: List[Dict[str, Any]], workers: int = 1) -> List[Dict[str, Any]]:
+        """Metrics per parameter set, in the order given
+
+        With `workers` > 1 the panel is written to a memory-mapped file that each
+        pool worker attaches to, and the parameter sets are spread over the pool.
+        """
+        if workers <= 1 or len(configs) <= 1:
+            return [evaluate(self.data, params) for params in configs]
+
+        chunk_size = max(1, math.ceil(len(configs) / (workers * 4)))
+        chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+        path = self.panel.to_memmap(os.path.join(PANEL_DIR, f"sweep-{os.getpid()}"))
+
+        results = []
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_sweep_worker,
+                                     initargs=(path, self.horizon)) as pool:
+                futures = [(chunk, pool.submit(_evaluate_chunk, chunk)) for chunk in chunks]
+                for chunk, future in futures:
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        # A crashed worker takes its chunk with it; evaluate those sets here instead
+                        print(f"Sweep worker failed ({e}), evaluating {len(chunk)} parameter sets in-process")
+                        results.extend(evaluate(self.data, params) for params in chunk)
+        finally:
+            for suffix in ('.npy', '.json'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        return results
+
+    def ranked(self, configs: List[Dict[str, Any]], workers: int = 1, rank_by: str = 'buy_mean_return',
+               min_signals: int = 30) -> pd.DataFrame:
+        """Table of parameter sets and their metrics, best `rank_by` first
+
+        The current TechnicalConfig values are always included (flagged `baseline`).
+        Sets with fewer than `min_signals` buy signals are ranked last.
+        """
+        names = list(dict.fromkeys(name for params in configs for name in params))
+        baseline = default_params(names)
+        if baseline not in configs:
+            configs = [baseline] + configs
+
+        table = pd.DataFrame(self.run(configs, workers))
+        table['baseline'] = [params == baseline for params in configs]
+        table['too_few_signals'] = table['buy_signals'] < min_signals
+        table = table.sort_values(['too_few_signals', rank_by], ascending=[True, False],
+                                  na_position='last', kind='stable')
+        table.insert(0, 'rank', range(1, len(table) + 1))
+        return table.reset_index(drop=True)
+
+def save_sweep_results(table: pd.DataFrame, output_dir: str = "parameter-sweeps") -> str:
+    """Save the ranked table to a JSON file"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
+    filename = f"{output_dir}/sweep_{timestamp}.json"
+
+    output = {
+        'timestamp': datetime.now().isoformat(),
+        'total_configs': len(table),
+        'results': table.to_dict(orient='records')
+    }
+
+    with open(filename, 'w') as f:
+        json.dump(output, f, indent=2, default=str)
+
+    print(f"Sweep results saved to: {filename}")
+    return filename
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Search TechnicalConfig parameters against cached history')
+    parser.add_argument('--period', default='10y', help='History to test over (e.g. 2y, 10y)')
+    parser.add_argument('--horizon', type=int, default=20, help='Forward-return horizon in bars')
+    parser.add_argument('--random', type=int, default=0, metavar='N',
+                        help='Evaluate N random grid combinations instead of the full grid')
+    parser.add_argument('--seed', type=int, default=0, help='Random search seed')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Processes to evaluate parameter sets in')
+    parser.add_argument('--rank-by', default='buy_mean_return', choices=METRICS, help='Metric to rank by')
+    parser.add_argument('--min-signals', type=int, default=30,
+                        help='Buy signals a parameter set needs to be ranked on its metrics')
+    parser.add_argument('--top', type=int, default=20, help='Rows to print')
+    args = parser.parse_args()
+
+    print("🔧 Starting Parameter Sweep...")
+
+    configs = random_search(SWEEP_GRID, args.random, args.seed) if args.random else grid_search(SWEEP_GRID)
+    sweep = ParameterSweep.from_universe(period=args.period, horizon=args.horizon)
+
+    started = datetime.now()
+    table = sweep.ranked(configs, args.workers, args.rank_by, args.min_signals)
+    seconds = (datetime.now() - started).total_seconds()
+
+    print(f"\n✅ Evaluated {len(table)} parameter sets on {len(sweep.panel.symbols)} symbols in {seconds:.1f}s")
+    with pd.option_context('display.width', 200, 'display.float_format', '{:.4f}'.format):
+        print(table.head(args.top).to_string(index=False))
+
+    save_sweep_results(table)
+
+if __name__ == "__main__":
+    main()
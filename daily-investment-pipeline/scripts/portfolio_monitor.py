@@ -4,7 +4,6 @@ Portfolio Monitor Setup
 Framework to track portfolio positions and generate alerts
 """
 
-import yfinance as yf
 import json
 import os
 import sys
@@ -12,10 +11,18 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import numpy as np
+import pandas as pd
 
 # Add parent directory to path for config imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config.settings import get_config
+from scripts.market_data import MarketDataProvider, get_provider
+from scripts.price_store import PriceStore
+from scripts.fundamentals_cache import FundamentalsCache
+from scripts.security_master import get_security_master
+from scripts.fetch_executor import (
+    PRIORITY_HOLDINGS, Deadline, FetchTimeout, get_fetch_executor, result_within
+)
 
 @dataclass
 class PositionAlert:
@@ -44,6 +51,7 @@ class PositionPerformance:
     stop_loss_price: float
     target_price: float
     risk_reward_ratio: float
+    stale: bool = False  # Priced from cached data after the live fetch missed its deadline
 
 @dataclass
 class PortfolioSummary:
@@ -62,11 +70,16 @@ class PortfolioSummary:
     rebalancing_needed: bool
 
 class PortfolioMonitor:
-    def __init__(self, portfolio_file: str = "config/portfolio.json"):
+    def __init__(self, portfolio_file: str = "config/portfolio.json",
+                 provider: Optional[MarketDataProvider] = None):
         self.config = get_config()
         self.portfolio_config = self.config['portfolio']
         self.portfolio_file = portfolio_file
         self.portfolio_data = self._load_portfolio()
+        self.provider = provider or get_provider()
+        self.price_store = PriceStore(self.provider)
+        self.fundamentals = FundamentalsCache(self.provider)
+        self.security_master = get_security_master()
         
     def _load_portfolio(self) -> Dict:
         """Load portfolio configuration from JSON file"""
@@ -98,46 +111,76 @@ class PortfolioMonitor:
             }
         }
     
-    def get_current_prices(self, symbols: List[str]) -> Dict[str, Dict]:
-        """Fetch current prices and daily changes for symbols"""
+    def get_current_prices(self, symbols: List[str],
+                           deadline: Optional[Deadline] = None) -> Dict[str, Dict]:
+        """Fetch current prices and daily changes for symbols
+        
+        Quotes that miss the request timeout or the run `deadline` are built from
+        cached bars and flagged with 'stale': True.
+        """
         if not symbols:
             return {}
         
         try:
-            # Create space-separated string for yfinance
-            tickers_str = ' '.join(symbols)
-            tickers = yf.Tickers(tickers_str)
+            # Holdings jump the queue ahead of screening candidates
+            executor = get_fetch_executor()
+            futures = {symbol: executor.submit(self._fetch_quote, symbol, priority=PRIORITY_HOLDINGS)
+                       for symbol in symbols}
             
             prices = {}
-            for symbol in symbols:
+            for symbol, future in futures.items():
                 try:
-                    ticker = yf.Ticker(symbol)
-                    hist = ticker.history(period="5d")
-                    info = ticker.info
-                    
-                    if not hist.empty:
-                        current_price = hist['Close'].iloc[-1]
-                        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                        
-                        prices[symbol] = {
-                            'current_price': current_price,
-                            'previous_close': prev_close,
-                            'day_change': current_price - prev_close,
-                            'day_change_pct': (current_price - prev_close) / prev_close * 100,
-                            'volume': hist['Volume'].iloc[-1],
-                            'market_cap': info.get('marketCap', 0),
-                            'company_name': info.get('longName', symbol)
-                        }
+                    try:
+                        quote = result_within(future, deadline)
+                    except FetchTimeout:
+                        print(f"Quote for {symbol} timed out, using last cached price")
+                        quote = self._cached_quote(symbol)
+                    if quote:
+                        prices[symbol] = quote
                 except Exception as e:
                     print(f"Error fetching data for {symbol}: {e}")
                     continue
             
+            self.fundamentals.flush()
             return prices
             
         except Exception as e:
             print(f"Error fetching price data: {e}")
             return {}
     
+    def _fetch_quote(self, symbol: str) -> Optional[Dict]:
+        """Fetch latest price, daily change and fundamentals for one symbol"""
+        hist = self.price_store.get_history(symbol, "5d")
+        info = self.fundamentals.get(symbol)
+        return self._quote_from_history(symbol, hist, info)
+    
+    def _cached_quote(self, symbol: str) -> Optional[Dict]:
+        """Quote from the last cached bars and fundamentals, without touching the network"""
+        hist = self.price_store.load(symbol, "5d")
+        quote = self._quote_from_history(symbol, hist, self.fundamentals.peek(symbol))
+        if quote:
+            quote['stale'] = True
+        return quote
+    
+    def _quote_from_history(self, symbol: str, hist: Optional[pd.DataFrame],
+                            info: Dict) -> Optional[Dict]:
+        if hist is None or hist.empty:
+            return None
+        
+        current_price = hist['Close'].iloc[-1]
+        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+        
+        return {
+            'current_price': current_price,
+            'previous_close': prev_close,
+            'day_change': current_price - prev_close,
+            'day_change_pct': (current_price - prev_close) / prev_close * 100,
+            'volume': hist['Volume'].iloc[-1],
+            'market_cap': info.get('marketCap', 0),
+            'company_name': info.get('longName', symbol),
+            'stale': False
+        }
+    
     def calculate_position_performance(self, position: Dict, current_prices: Dict) -> PositionPerformance:
         """Calculate performance metrics for a single position"""
         symbol = position['symbol']
@@ -149,11 +192,13 @@ class PortfolioMonitor:
             current_price = avg_cost
             day_change = 0
             day_change_pct = 0
+            stale = True
         else:
             price_data = current_prices[symbol]
             current_price = price_data['current_price']
             day_change = price_data['day_change'] * shares
             day_change_pct = price_data['day_change_pct']
+            stale = price_data.get('stale', False)
         
         # Calculate metrics
         current_value = shares * current_price
@@ -192,7 +237,8 @@ class PortfolioMonitor:
             days_held=days_held,
             stop_loss_price=stop_loss_price,
             target_price=target_price,
-            risk_reward_ratio=risk_reward_ratio
+            risk_reward_ratio=risk_reward_ratio,
+            stale=stale
         )
     
     def generate_position_alerts(self, position: PositionPerformance) -> List[PositionAlert]:
@@ -272,14 +318,8 @@ class PortfolioMonitor:
         sector_values = {}
         total_invested = sum(pos.current_value for pos in positions)
         
-        # Map symbols to sectors (from config)
-        symbol_to_sector = {}
-        for sector, sector_data in self.config['sectors'].FOCUS_SECTORS.items():
-            for ticker in sector_data['tickers']:
-                symbol_to_sector[ticker] = sector
-        
         for position in positions:
-            sector = symbol_to_sector.get(position.symbol, 'other')
+            sector = self.security_master.sector(position.symbol)
             if sector not in sector_values:
                 sector_values[sector] = 0
             sector_values[sector] += position.current_value
@@ -323,7 +363,7 @@ class PortfolioMonitor:
             'estimated_beta': 1.0  # Simplified assumption
         }
     
-    def monitor_portfolio(self) -> PortfolioSummary:
+    def monitor_portfolio(self, deadline: Optional[Deadline] = None) -> PortfolioSummary:
         """Main portfolio monitoring function"""
         positions_data = self.portfolio_data.get('positions', [])
         cash_data = self.portfolio_data.get('cash_position', {})
@@ -348,7 +388,7 @@ class PortfolioMonitor:
         
         # Get symbols and fetch prices
         symbols = [pos['symbol'] for pos in positions_data]
-        current_prices = self.get_current_prices(symbols)
+        current_prices = self.get_current_prices(symbols, deadline)
         
         # Calculate performance for each position
         position_performances = []
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Price Panel
+Dense dates x tickers x fields array that worker processes can attach to via numpy.memmap
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import PANEL_DIR
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+class PricePanel:
+    """float64 array of shape (dates, tickers, fields) with label lookups; NaN marks missing bars"""
+
+    def __init__(self, values: np.ndarray, dates: pd.DatetimeIndex,
+                 symbols: Sequence[str], fields: Sequence[str] = PANEL_FIELDS):
+        self.values = values
+        self.dates = pd.DatetimeIndex(dates)
+        self.symbols = list(symbols)
+        self.fields = list(fields)
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._field_index = {field: i for i, field in enumerate(self.fields)}
+        self._present: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_frame(cls, panel: pd.DataFrame, fields: Sequence[str] = PANEL_FIELDS) -> 'PricePanel':
+        """Build from a wide (symbol, field) column frame such as PriceStore.get_panel returns"""
+        symbols = list(panel.columns.get_level_values(0).unique())
+        columns = pd.MultiIndex.from_product([symbols, list(fields)])
+        dense = panel.reindex(columns=columns).to_numpy(dtype=np.float64)
+        values = dense.reshape(len(panel.index), len(symbols), len(fields))
+        return cls(values, panel.index, symbols, fields)
+
+    @classmethod
+    def from_bars(cls, bars: Dict[str, pd.DataFrame], fields: Sequence[str] = PANEL_FIELDS) -> 'PricePanel':
+        """Build from per-symbol bar frames, keeping the order given"""
+        return cls.from_frame(pd.concat(bars, axis=1, sort=True), fields)
+
+    @classmethod
+    def attach(cls, path: str) -> 'PricePanel':
+        """Map a panel written by to_memmap read-only; no data is copied"""
+        with open(f"{path}.json", 'r') as f:
+            labels = json.load(f)
+        values = np.load(f"{path}.npy", mmap_mode='r')
+        return cls(values, pd.to_datetime(labels['dates']), labels['symbols'], labels['fields'])
+
+    def to_memmap(self, path: Optional[str] = None) -> str:
+        """Write the panel as a .npy file plus a JSON label sidecar; returns the base path"""
+        path = path or os.path.join(PANEL_DIR, "universe")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write under temporary names and rename, so a worker never attaches to a half-written panel
+        mapped = np.lib.format.open_memmap(
+            f"{path}.tmp.npy", mode='w+', dtype=np.float64, shape=self.values.shape
+        )
+        mapped[:] = self.values
+        mapped.flush()
+        del mapped
+        os.replace(f"{path}.tmp.npy", f"{path}.npy")
+
+        with open(f"{path}.json.tmp", 'w') as f:
+            json.dump({
+                'dates': [d.strftime('%Y-%m-%d') for d in self.dates],
+                'symbols': self.symbols,
+                'fields': self.fields
+            }, f)
+        os.replace(f"{path}.json.tmp", f"{path}.json")
+
+        return path
+
+    def field(self, name: str) -> np.ndarray:
+        """(dates, tickers) view of one field, e.g. the close panel"""
+        return self.values[:, :, self._field_index[name]]
+
+    def subset(self, start: int, stop: int) -> 'PricePanel':
+        """Panel of the tickers in positions start..stop-1; the values are a view, not a copy"""
+        return PricePanel(self.values[:, start:stop, :], self.dates, self.symbols[start:stop], self.fields)
+
+    @property
+    def empty(self) -> bool:
+        return self.values.size == 0
+
+    @property
+    def present(self) -> np.ndarray:
+        """(dates, tickers) mask of the bars each ticker actually has"""
+        if self._present is None:
+            self._present = ~np.isnan(self.values).all(axis=2)
+        return self._present
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbol_index
+
+    def ticker(self, symbol: str) -> Optional[Tuple[np.ndarray, pd.DatetimeIndex]]:
+        """One ticker's bars as a (dates, fields) array plus their dates
+
+        Tickers missing bars only before their first date (the usual case) get a
+        view into the panel; a gap after the first bar makes the result a copy.
+        """
+        if symbol not in self._symbol_index:
+            return None
+
+        i = self._symbol_index[symbol]
+        present = self.present[:, i]
+        first = int(present.argmax())
+        if not present[first]:
+            return None
+        if present[first:].all():
+            return self.values[first:, i, :], self.dates[first:]
+        return self.values[present, i, :], self.dates[present]
+
+    def frame(self, symbol: str) -> Optional[pd.DataFrame]:
+        """One ticker's bars as a DataFrame over `ticker`'s array, dropping dates it has no data for"""
+        bars = self.ticker(symbol)
+        if bars is None:
+            return None
+        values, dates = bars
+        return pd.DataFrame(values, index=dates, columns=self.fields, copy=False)
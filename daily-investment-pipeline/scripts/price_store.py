@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Local Price Store
+Persistent per-ticker OHLCV history that only asks the provider for new bars
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import PRICE_STORE_DIR, MarketConfig
+from scripts.market_data import MarketDataProvider, get_provider
+from scripts.fetch_executor import (
+    PRIORITY_SCREENING, Deadline, FetchTimeout, get_fetch_executor, result_within
+)
+from scripts.request_coalescer import get_request_coalescer
+from scripts.market_calendar import FreshnessPolicy
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# One lock per ticker file, shared by every store instance in the process
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+def _symbol_lock(path: str) -> threading.Lock:
+    """Return the process-wide lock guarding a ticker file"""
+    with _symbol_locks_guard:
+        if path not in _symbol_locks:
+            _symbol_locks[path] = threading.Lock()
+        return _symbol_locks[path]
+
+def period_start(period: str, today: Optional[datetime] = None) -> Optional[pd.Timestamp]:
+    """Translate a yfinance-style period ("5d", "6mo", "1y", "ytd", "max") to a start date"""
+    today = pd.Timestamp(today or datetime.now()).normalize()
+
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+
+    if period.endswith("mo"):
+        return today - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("wk"):
+        return today - timedelta(weeks=int(period[:-2]))
+    if period.endswith("y"):
+        return today - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("d"):
+        # Day periods count trading days, so leave room for weekends and holidays
+        days = int(period[:-1])
+        return today - timedelta(days=days * 7 // 5 + 5)
+
+    raise ValueError(f"Unsupported period: {period}")
+
+def _normalize_bars(data: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Keep OHLCV columns on a timezone-naive daily index"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    data = data[[col for col in PRICE_COLUMNS if col in data.columns]].copy()
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index.name = 'Date'
+
+    return data.dropna(how='all')
+
+class PriceStore:
+    """Per-ticker parquet files holding the full daily history fetched so far"""
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None,
+                 root: Optional[str] = None):
+        self.provider = provider or get_provider()
+        # Keep each provider's bars apart so replayed data never leaks into live caches
+        self.root = root or os.path.join(PRICE_STORE_DIR, self.provider.name)
+        self.freshness = FreshnessPolicy()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _data_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.parquet")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.json")
+
+    def load(self, symbol: str, period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Read cached bars without touching the network"""
+        path = self._data_path(symbol)
+        if not os.path.exists(path):
+            return None
+
+        data = pd.read_parquet(path)
+        return self._slice(data, period) if period else data
+
+    def load_as_of(self, symbol: str, when, period: str = MarketConfig.PRICE_HISTORY_PERIOD) -> Optional[pd.DataFrame]:
+        """Cached bars for `period` ending on date `when`, for point-in-time runs (no network)"""
+        data = self.load(symbol)
+        if data is None:
+            return None
+
+        end = pd.Timestamp(when).normalize()
+        data = data[data.index <= end]
+        if data.empty:
+            return None
+        return self._slice(data, period, today=end)
+
+    def load_meta(self, symbol: str) -> Dict:
+        """Read bookkeeping for a ticker (covered range, last fetch time)"""
+        try:
+            with open(self._meta_path(symbol), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self, symbol: str, data: pd.DataFrame, meta: Optional[Dict] = None):
+        """Write bars atomically so readers never see a half-written file"""
+        path = self._data_path(symbol)
+        tmp_path = f"{path}.tmp"
+        data.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+        if meta is not None:
+            self.save_meta(symbol, meta)
+
+    def save_meta(self, symbol: str, meta: Dict):
+        with open(self._meta_path(symbol), 'w') as f:
+            json.dump(meta, f, indent=2, default=str)
+
+    def is_fresh(self, symbol: str, meta: Optional[Dict] = None) -> bool:
+        """Whether cached bars are current per the market-calendar freshness policy"""
+        meta = meta if meta is not None else self.load_meta(symbol)
+        fetched_at = meta.get('fetched_at')
+        return fetched_at is not None and not self.freshness.needs_refresh(
+            datetime.fromisoformat(fetched_at)
+        )
+
+    def get_history(self, symbol: str, period: str = MarketConfig.PRICE_HISTORY_PERIOD) -> Optional[pd.DataFrame]:
+        """Return bars for a period, fetching only what the cache is missing"""
+        start = period_start(period)
+
+        with _symbol_lock(self._data_path(symbol)):
+            cached = self.load(symbol)
+            meta = self.load_meta(symbol)
+
+            try:
+                data = self._refresh(symbol, cached, meta, start)
+            except Exception as e:
+                print(f"Error updating price history for {symbol}: {e}")
+                data = cached
+
+        if data is None or data.empty:
+            return None
+
+        return self._slice(data, period)
+
+    def get_panel(self, symbols: List[str], period: str = MarketConfig.PRICE_HISTORY_PERIOD,
+                  chunk_size: Optional[int] = None,
+                  priority: int = PRIORITY_SCREENING,
+                  deadline: Optional[Deadline] = None) -> pd.DataFrame:
+        """Return a wide (date x symbol/field) panel, updating the cache in multi-symbol requests
+
+        Chunks that miss the request timeout or the deadline are served from the
+        cache as-is; their symbols are listed in `panel.attrs['stale']`.
+        """
+        chunk_size = chunk_size or MarketConfig.BATCH_CHUNK_SIZE
+        start = period_start(period)
+
+        # Chunks are independent requests, so let the shared executor overlap them
+        executor = get_fetch_executor()
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        futures = [executor.submit(self._refresh_chunk, chunk, start, priority=priority)
+                   for chunk in chunks]
+
+        frames = {}
+        stale = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                frames.update(result_within(future, deadline))
+            except FetchTimeout:
+                print(f"Price update timed out for {chunk[0]}..{chunk[-1]}, using cached bars")
+                frames.update({symbol: self.load(symbol) for symbol in chunk})
+                stale.extend(chunk)
+
+        frames = {symbol: self._slice(data, period) for symbol, data in frames.items()
+                  if data is not None and not data.empty}
+        if not frames:
+            return pd.DataFrame()
+
+        panel = pd.concat(frames, axis=1)
+        panel.attrs['stale'] = [symbol for symbol in stale if symbol in frames]
+        return panel
+
+    def _overlap_start(self, cached: pd.DataFrame) -> pd.Timestamp:
+        """First bar of an update request: the last cached bar plus a few settled ones to verify"""
+        overlap = MarketConfig.ADJUSTMENT_CHECK_BARS + 1
+        return cached.index[-min(overlap, len(cached))]
+
+    def _is_adjusted(self, cached: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+        """Whether the provider's closes for settled cached dates no longer match the cache
+
+        Splits and dividends rescale every earlier adjusted close, so a drift on
+        the overlapping bars means the whole cached history is stale.
+        """
+        if fresh.empty or 'Close' not in fresh.columns:
+            return False
+
+        # The last cached bar may be a mid-session snapshot, only settled bars are compared
+        settled = cached.index[:-1][-MarketConfig.ADJUSTMENT_CHECK_BARS:]
+        overlap = settled.intersection(fresh.index)
+        if overlap.empty:
+            return False
+
+        old = cached.loc[overlap, 'Close'].astype(float)
+        new = fresh.loc[overlap, 'Close'].astype(float)
+        drift = ((new - old).abs() / old.abs()).max()
+        return bool(drift > MarketConfig.ADJUSTMENT_TOLERANCE)
+
+    def _rebuild(self, symbol: str, covered_from: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """Replace a ticker's cached history after a corporate action"""
+        print(f"Price adjustment detected for {symbol}, refetching its history")
+        data = _normalize_bars(self.provider.history(symbol, covered_from, None))
+        if data.empty:
+            return None
+
+        self.save(symbol, data, self._meta(covered_from))
+        get_request_coalescer().remember(self._tail_key(symbol), data)
+        return data
+
+    def _refresh_chunk(self, symbols: List[str],
+                       start: Optional[pd.Timestamp]) -> Dict[str, pd.DataFrame]:
+        """Update a chunk of symbols with at most two batched provider calls"""
+        cached = {symbol: self.load(symbol) for symbol in symbols}
+
+        # Cold symbols (no cache, or period reaches past what we hold) need the full window,
+        # warm symbols only need bars from their last cached date onward
+        # Warm symbols already brought up to date earlier in this run are skipped entirely
+        coalescer = get_request_coalescer()
+        cold, warm = [], []
+        for symbol in symbols:
+            data = cached[symbol]
+            meta = self.load_meta(symbol)
+            covered_from = meta.get('covered_from')
+            if data is None or data.empty or (
+                    start is not None and covered_from and start < pd.Timestamp(covered_from)):
+                cold.append(symbol)
+            elif not coalescer.has(self._tail_key(symbol)) and not self.is_fresh(symbol, meta):
+                warm.append(symbol)
+
+        fetched: Dict[str, pd.DataFrame] = {}
+        checked = set()  # Symbols the provider answered for, even with no new bars
+        try:
+            if cold:
+                fetched.update(self.provider.history_batch(cold, start, None))
+                checked.update(cold)
+            if warm:
+                since = min(self._overlap_start(cached[symbol]) for symbol in warm)
+                fetched.update(self.provider.history_batch(warm, since, None))
+                checked.update(warm)
+        except Exception as e:
+            print(f"Error downloading price batch {symbols[0]}..{symbols[-1]}: {e}")
+
+        results = {}
+        for symbol in symbols:
+            new_bars = _normalize_bars(fetched.get(symbol))
+            if symbol in fetched:
+                coalescer.remember(self._tail_key(symbol), new_bars)
+            with _symbol_lock(self._data_path(symbol)):
+                # Reload under the lock in case another caller updated this ticker meanwhile
+                data = self.load(symbol)
+                meta = self.load_meta(symbol)
+                if symbol in warm and data is not None and self._is_adjusted(data, new_bars):
+                    covered_from = pd.Timestamp(meta.get('covered_from', data.index[0]))
+                    try:
+                        data = self._rebuild(symbol, covered_from)
+                    except Exception as e:
+                        print(f"Error refetching adjusted history for {symbol}: {e}")
+                elif not new_bars.empty:
+                    covered_from = pd.Timestamp(meta.get('covered_from', new_bars.index[0]))
+                    if symbol in cold and start is not None:
+                        covered_from = min(covered_from, start)
+                    data = self._merge([data if data is not None else new_bars.iloc[:0], new_bars])
+                    self.save(symbol, data, self._meta(covered_from))
+                elif symbol in checked and data is not None:
+                    # Nothing new (e.g. a holiday), but the cache is confirmed current
+                    self.save_meta(symbol, self._meta(meta.get('covered_from', data.index[0])))
+            results[symbol] = data
+
+        return results
+
+    def _refresh(self, symbol: str, cached: Optional[pd.DataFrame], meta: Dict,
+                 start: Optional[pd.Timestamp]) -> Optional[pd.DataFrame]:
+        """Backfill before the cached range and append bars after it"""
+        coalescer = get_request_coalescer()
+
+        if cached is None or cached.empty:
+            data = _normalize_bars(self.provider.history(symbol, start, None))
+            if data.empty:
+                return None
+            coalescer.remember(self._tail_key(symbol), data)
+            covered_from = start if start is not None else data.index[0]
+            self.save(symbol, data, self._meta(covered_from))
+            return data
+
+        parts: List[pd.DataFrame] = []
+        covered_from = pd.Timestamp(meta.get('covered_from', cached.index[0]))
+        backfill = start is not None and start < covered_from
+
+        # Closed sessions never change: skip the provider entirely when the cache is current
+        if not backfill and self.is_fresh(symbol, meta):
+            return cached
+
+        # Backfill: only when this period reaches further back than anything requested before
+        if backfill:
+            parts.append(_normalize_bars(self.provider.history(symbol, start, cached.index[0])))
+            covered_from = start
+
+        parts.append(cached)
+
+        # Re-pull the last cached bar too, it may have been captured mid-session, along with a
+        # few settled bars to detect splits/dividends. Every component asking for this ticker
+        # in the same run shares one tail fetch.
+        tail = coalescer.do(self._tail_key(symbol), self._fetch_tail, symbol, self._overlap_start(cached))
+        if self._is_adjusted(cached, tail):
+            return self._rebuild(symbol, covered_from)
+        parts.append(tail)
+
+        data = self._merge(parts)
+        self.save(symbol, data, self._meta(covered_from))
+        return data
+
+    def _fetch_tail(self, symbol: str, since: pd.Timestamp) -> pd.DataFrame:
+        return _normalize_bars(self.provider.history(symbol, since, None))
+
+    def _tail_key(self, symbol: str) -> tuple:
+        """Coalescing key for "bring this ticker up to date", independent of period"""
+        return (self.provider.name, symbol.upper(), 'history', 'latest')
+
+    def _merge(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """Combine bar frames, later parts winning on overlapping dates"""
+        data = pd.concat([part for part in parts if not part.empty])
+        data = data[~data.index.duplicated(keep='last')]
+        return data.sort_index()
+
+    def _meta(self, covered_from: pd.Timestamp) -> Dict:
+        return {
+            'covered_from': pd.Timestamp(covered_from).strftime('%Y-%m-%d'),
+            'fetched_at': datetime.now().astimezone().isoformat()
+        }
+
+    def _slice(self, data: pd.DataFrame, period: str,
+               today: Optional[datetime] = None) -> pd.DataFrame:
+        """Cut cached history down to the requested period"""
+        if period.endswith("d") and period[:-1].isdigit():
+            return data.tail(int(period[:-1])).copy()
+
+        start = period_start(period, today)
+        if start is None:
+            return data.copy()
+        return data[data.index >= start].copy()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Request Coalescer
+Single-flight sharing of identical fetches across pipeline components within one run
+"""
+
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class RequestCoalescer:
+    """Share one in-flight fetch per key, and memoize results for the duration of a run
+
+    Outside a `run()` block only concurrent duplicates are merged; inside it,
+    repeated requests for a key also reuse the first result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._results: Optional[Dict[Hashable, Any]] = None
+        self._depth = 0
+        self.requests = 0
+        self.fetches = 0
+
+    @contextmanager
+    def run(self):
+        """Scope in which results are memoized (e.g. one daily brief)"""
+        with self._lock:
+            if self._depth == 0:
+                self._results = {}
+                self.requests = 0
+                self.fetches = 0
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._results = None
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Return fn(*args, **kwargs), sharing the call with anyone asking for the same key"""
+        with self._lock:
+            self.requests += 1
+            if self._results is not None and key in self._results:
+                return self._results[key]
+
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.fetches += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            self.remember(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def remember(self, key: Hashable, result: Any):
+        """Record a result fetched some other way (e.g. in a batch) for the current run"""
+        with self._lock:
+            if self._results is not None:
+                self._results[key] = result
+
+    def has(self, key: Hashable) -> bool:
+        """Whether the current run already holds a result for key"""
+        with self._lock:
+            return self._results is not None and key in self._results
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'fetches': self.fetches,
+                'shared': self.requests - self.fetches
+            }
+
+_coalescer = RequestCoalescer()
+
+def get_request_coalescer() -> RequestCoalescer:
+    """Return the process-wide coalescer"""
+    return _coalescer
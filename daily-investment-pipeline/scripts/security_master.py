@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Security Master
+File-backed table of tradable tickers with sector, industry, exchange and index membership
+"""
+
+import csv
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import SECURITY_MASTER_PATH, SectorConfig
+
+@dataclass(frozen=True)
+class Security:
+    symbol: str
+    name: str
+    sector: str      # Pipeline sector key (see SectorConfig.FOCUS_SECTORS), or "other"
+    industry: str
+    exchange: str
+    indexes: FrozenSet[str]
+
+class SecurityMaster:
+    """Tickers keyed by symbol, with per-sector, per-index and per-exchange symbol lists
+
+    Rows come from a CSV with columns symbol, name, sector, industry, exchange and
+    indexes (semicolon-separated, e.g. "SP500;R1000;R3000"). Replace the file with
+    a fuller export to widen the universe; file order is kept in every listing.
+    Without a file the table is seeded from SectorConfig.FOCUS_SECTORS.
+    """
+
+    def __init__(self, path: str = SECURITY_MASTER_PATH):
+        self.path = path
+        self._securities: Dict[str, Security] = {}
+        self._position: Dict[str, int] = {}
+        self._by_sector: Dict[str, List[str]] = {}
+        self._by_index: Dict[str, List[str]] = {}
+        self._by_exchange: Dict[str, List[str]] = {}
+
+        for security in self._read():
+            self.add(security)
+
+    def _read(self) -> Iterable[Security]:
+        try:
+            with open(self.path, 'r', newline='') as f:
+                rows = list(csv.DictReader(f))
+        except FileNotFoundError:
+            print(f"Security master {self.path} not found, using the focus sector tickers")
+            return self._seed()
+
+        return [
+            Security(
+                symbol=row['symbol'].strip().upper(),
+                name=row.get('name') or row['symbol'],
+                sector=row.get('sector') or 'other',
+                industry=row.get('industry') or '',
+                exchange=row.get('exchange') or '',
+                indexes=frozenset(index for index in (row.get('indexes') or '').split(';') if index)
+            )
+            for row in rows if row.get('symbol')
+        ]
+
+    @staticmethod
+    def _seed() -> List[Security]:
+        return [
+            Security(symbol=ticker, name=ticker, sector=sector, industry='', exchange='',
+                     indexes=frozenset())
+            for sector, sector_data in SectorConfig.FOCUS_SECTORS.items()
+            for ticker in sector_data['tickers']
+        ]
+
+    def add(self, security: Security):
+        """Add a security; a symbol seen before keeps its first row"""
+        if security.symbol in self._securities:
+            return
+        self._securities[security.symbol] = security
+        self._position[security.symbol] = len(self._position)
+        self._by_sector.setdefault(security.sector, []).append(security.symbol)
+        self._by_exchange.setdefault(security.exchange, []).append(security.symbol)
+        for index in security.indexes:
+            self._by_index.setdefault(index, []).append(security.symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._securities
+
+    def __len__(self) -> int:
+        return len(self._securities)
+
+    def get(self, symbol: str) -> Optional[Security]:
+        return self._securities.get(symbol.upper())
+
+    def sector(self, symbol: str, default: str = "other") -> str:
+        """Pipeline sector for a symbol"""
+        security = self._securities.get(symbol.upper())
+        return security.sector if security else default
+
+    def symbols(self, sectors: Optional[Iterable[str]] = None, index: Optional[str] = None,
+                exchange: Optional[str] = None) -> List[str]:
+        """Symbols matching every given filter, in file order"""
+        lists = []
+        if sectors is not None:
+            lists.append([symbol for sector in sectors for symbol in self._by_sector.get(sector, [])])
+        if index is not None:
+            lists.append(self._by_index.get(index, []))
+        if exchange is not None:
+            lists.append(self._by_exchange.get(exchange, []))
+
+        if not lists:
+            return list(self._securities)
+
+        # Walk the shortest list and check the others by set membership
+        lists.sort(key=len)
+        others = [set(symbols) for symbols in lists[1:]]
+        matches = [symbol for symbol in lists[0] if all(symbol in other for other in others)]
+        return sorted(matches, key=self._position.get)
+
+_masters: Dict[str, SecurityMaster] = {}
+_masters_lock = threading.Lock()
+
+def get_security_master(path: str = SECURITY_MASTER_PATH) -> SecurityMaster:
+    """Return the process-wide security master for a file, loading it once"""
+    with _masters_lock:
+        if path not in _masters:
+            _masters[path] = SecurityMaster(path)
+        return _masters[path]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Support & Resistance
+Pivot highs/lows clustered into ranked price levels, computed for many tickers in one pass
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Add parent directory to path for config imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.settings import TechnicalConfig
+
+def find_pivots(high: np.ndarray, low: np.ndarray, window: int) -> tuple:
+    """Boolean (dates, tickers) masks of pivot highs and lows
+
+    A bar is a pivot high when its high is the highest of the `window` bars on
+    either side (a pivot low likewise for lows); the first and last `window`
+    bars cannot be pivots. NaN bars never are.
+    """
+    span = 2 * window + 1
+    pivot_high = np.zeros(high.shape, dtype=bool)
+    pivot_low = np.zeros(low.shape, dtype=bool)
+    if high.shape[0] < span:
+        return pivot_high, pivot_low
+
+    # (dates - 2*window, tickers, span) views; no data is copied
+    high_windows = sliding_window_view(high, span, axis=0)
+    low_windows = sliding_window_view(low, span, axis=0)
+    center = slice(window, high.shape[0] - window)
+    with np.errstate(invalid='ignore'):
+        pivot_high[center] = high[center] == high_windows.max(axis=-1)
+        pivot_low[center] = low[center] == low_windows.min(axis=-1)
+    return pivot_high, pivot_low
+
+def cluster_levels(tickers: np.ndarray, prices: np.ndarray, tolerance: float) -> tuple:
+    """Group pivot prices into levels per ticker
+
+    Pivots are sorted by (ticker, price) and a new level starts wherever the
+    ticker changes or the gap to the previous pivot exceeds `tolerance` (as a
+    fraction of price). Returns (ticker, mean price, touches) arrays, one entry
+    per level.
+    """
+    if len(prices) == 0:
+        return np.array([], dtype=int), np.array([]), np.array([], dtype=int)
+
+    order = np.lexsort((prices, tickers))
+    tickers, prices = tickers[order], prices[order]
+
+    breaks = np.ones(len(prices), dtype=bool)
+    breaks[1:] = (tickers[1:] != tickers[:-1]) | (np.diff(prices) > tolerance * prices[:-1])
+    level_ids = np.cumsum(breaks) - 1
+
+    touches = np.bincount(level_ids)
+    level_prices = np.bincount(level_ids, weights=prices) / touches
+    return tickers[breaks], level_prices, touches
+
+class SupportResistance:
+    """Ranked support and resistance levels from recent pivots"""
+
+    def __init__(self, config: Optional[TechnicalConfig] = None):
+        self.config = config or TechnicalConfig()
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                symbols: Sequence[str]) -> Dict[str, Dict]:
+        """Levels for (dates, tickers) arrays whose last row is every ticker's latest bar
+
+        Rows are trimmed to the last SR_LOOKBACK_DAYS. Each ticker gets
+        `support_levels` (below the close) and `resistance_levels` (above it),
+        ranked by touches and then by distance, plus the top level of each side
+        as `support` / `resistance` with its distance from the close.
+        """
+        cfg = self.config
+        high = np.asarray(high, dtype=np.float64)[-cfg.SR_LOOKBACK_DAYS:]
+        low = np.asarray(low, dtype=np.float64)[-cfg.SR_LOOKBACK_DAYS:]
+        current = np.asarray(close, dtype=np.float64)[-1]
+
+        pivot_high, pivot_low = find_pivots(high, low, cfg.SR_PIVOT_WINDOW)
+        high_rows, high_tickers = np.nonzero(pivot_high)
+        low_rows, low_tickers = np.nonzero(pivot_low)
+        tickers = np.concatenate([high_tickers, low_tickers])
+        prices = np.concatenate([high[high_rows, high_tickers], low[low_rows, low_tickers]])
+        level_tickers, level_prices, touches = cluster_levels(tickers, prices, cfg.SR_CLUSTER_TOLERANCE)
+
+        # Levels come out grouped by ticker, so each ticker's share is one contiguous slice
+        bounds = np.searchsorted(level_tickers, np.arange(len(symbols) + 1))
+        levels = {}
+        for i, symbol in enumerate(symbols):
+            mine = slice(bounds[i], bounds[i + 1])
+            levels[symbol] = self._rank(current[i], level_prices[mine], touches[mine])
+        return levels
+
+    def _rank(self, price: float, level_prices: np.ndarray, touches: np.ndarray) -> Dict:
+        if np.isnan(price) or len(level_prices) == 0:
+            return {}
+
+        distance = np.abs(level_prices - price) / price
+        # Most touches first, nearest first among equals
+        order = np.lexsort((distance, -touches))
+        ranked = [{'price': float(level_prices[i]), 'touches': int(touches[i])} for i in order]
+
+        max_levels = self.config.SR_MAX_LEVELS
+        result = {
+            'support_levels': [level for level in ranked if level['price'] < price][:max_levels],
+            'resistance_levels': [level for level in ranked if level['price'] > price][:max_levels]
+        }
+        if result['support_levels']:
+            result['support'] = result['support_levels'][0]['price']
+            result['distance_to_support'] = float((price - result['support']) / price)
+        if result['resistance_levels']:
+            result['resistance'] = result['resistance_levels'][0]['price']
+            result['distance_to_resistance'] = float((result['resistance'] - price) / price)
+        return result
+
+    def compute_bars(self, bars: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """Levels for every symbol's bars in one batched call"""
+        lookback = self.config.SR_LOOKBACK_DAYS
+        bars = {symbol: data for symbol, data in bars.items() if data is not None and not data.empty}
+        if not bars:
+            return {}
+
+        # Right-align each ticker's recent bars; shorter histories are NaN-padded at the top
+        shape = (lookback, len(bars))
+        arrays = {field: np.full(shape, np.nan) for field in ('High', 'Low', 'Close')}
+        for i, data in enumerate(bars.values()):
+            recent = data.tail(lookback)
+            for field, array in arrays.items():
+                array[lookback - len(recent):, i] = recent[field].to_numpy(dtype=np.float64)
+
+        return self.compute(arrays['High'], arrays['Low'], arrays['Close'], list(bars))
+
+    def compute_frame(self, data: pd.DataFrame) -> Dict:
+        """Levels for a single ticker's bars"""
+        return self.compute_bars({'_': data}).get('_', {})
@@ -90,12 +90,14 @@ def test_data_fetching():
     print("\n📊 Testing market data fetching...")
     
     try:
-        import yfinance as yf
-        
-        # Test with a common stock
-        ticker = yf.Ticker("AAPL")
-        hist = ticker.history(period="5d")
-        info = ticker.info
+        from scripts.market_data import get_provider
+        from scripts.price_store import period_start
+        
+        # Test with a common stock through the configured provider
+        provider = get_provider()
+        print(f"   🔌 Provider: {provider.name}")
+        hist = provider.history("AAPL", period_start("5d"))
+        info = provider.info("AAPL")
         
         if not hist.empty:
             print("   ✅ Historical data fetched")
@@ -4,27 +4,34 @@ Technical Screening Framework
 Stock screening system based on technical indicators and fundamentals
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
+import argparse
 import json
+import math
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 
 # Add parent directory to path for config imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from config.settings import get_config
-
-@dataclass
-class TechnicalSignal:
-    indicator: str
-    value: float
-    signal: str  # bullish, bearish, neutral
-    strength: float  # 0-100
-    description: str
+from config.settings import PANEL_DIR, MarketConfig, TechnicalConfig, get_config
+from scripts.market_data import MarketDataProvider, get_provider
+from scripts.price_store import PriceStore
+from scripts.price_panel import PricePanel
+from scripts.fundamentals_cache import FundamentalsCache
+from scripts.indicator_engine import IndicatorEngine
+from scripts.indicator_registry import TechnicalSignal, TickerContext, registry
+from scripts.indicator_state import IndicatorStateStore
+from scripts.security_master import get_security_master
+from scripts.support_resistance import SupportResistance
+from scripts.fetch_executor import (
+    PRIORITY_SCREENING, Deadline, FetchTimeout, get_fetch_executor, result_within
+)
 
 @dataclass
 class ScreenResult:
@@ -42,76 +49,111 @@ class ScreenResult:
     stop_loss: Optional[float]
     target_price: Optional[float]
     notes: List[str]
+    stale: bool = False  # Live fetch missed its deadline; screened on cached data
 
 class TechnicalScreener:
-    def __init__(self):
+    def __init__(self, provider: Optional[MarketDataProvider] = None,
+                 tech_config: Optional[TechnicalConfig] = None):
         self.config = get_config()
-        self.tech_config = self.config['technical']
+        self.tech_config = tech_config or self.config['technical']
         self.sector_config = self.config['sectors']
+        self.provider = provider or get_provider()
+        self.price_store = PriceStore(self.provider)
+        self.fundamentals = FundamentalsCache(self.provider)
+        self.indicator_engine = IndicatorEngine(self.tech_config)
+        self.support_resistance = SupportResistance(self.tech_config)
+        self.indicator_state = IndicatorStateStore(self.provider.name, config=self.tech_config)
+        self.security_master = get_security_master()
         
         # Build universe of stocks to screen
         self.stock_universe = self._build_stock_universe()
         
     def _build_stock_universe(self) -> List[str]:
-        """Build universe of stocks to screen from sector configurations"""
-        universe = []
-        for sector_data in self.sector_config.FOCUS_SECTORS.values():
-            universe.extend(sector_data['tickers'])
-        
-        # Add some additional high-quality stocks
-        additional_stocks = [
-            'AAPL', 'GOOGL', 'AMZN', 'META', 'BRK-B',
-            'JNJ', 'PG', 'KO', 'WMT', 'HD'
-        ]
-        universe.extend(additional_stocks)
-        
-        # Remove duplicates
-        return list(set(universe))
-    
-    def fetch_stock_data(self, symbol: str, period: str = "6mo") -> Optional[pd.DataFrame]:
-        """Fetch historical stock data"""
+        """Build universe of stocks to screen from the security master"""
+        return self.security_master.symbols(
+            sectors=self.tech_config.UNIVERSE_SECTORS,
+            index=self.tech_config.UNIVERSE_INDEX
+        )
+    
+    def fetch_stock_data(self, symbol: str, period: str = MarketConfig.PRICE_HISTORY_PERIOD) -> Optional[pd.DataFrame]:
+        """Fetch historical stock data (served from the local price store)"""
         try:
-            stock = yf.Ticker(symbol)
-            hist = stock.history(period=period)
+            hist = self.price_store.get_history(symbol, period)
             
-            if hist.empty:
+            if hist is None or hist.empty:
                 return None
                 
-            # Add volume dollar amount
-            hist['Volume_Dollar'] = hist['Close'] * hist['Volume']
-            
             return hist
             
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
             return None
     
-    def fetch_stock_info(self, symbol: str) -> Dict:
-        """Fetch stock information and fundamentals"""
-        try:
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            return info
-        except Exception as e:
-            print(f"Error fetching info for {symbol}: {e}")
-            return {}
+    def fetch_cached_stock_data(self, symbol: str, period: str = MarketConfig.PRICE_HISTORY_PERIOD) -> Optional[pd.DataFrame]:
+        """Last known bars for a symbol without touching the network"""
+        hist = self.price_store.load(symbol, period)
+        if hist is None or hist.empty:
+            return None
+        return hist
+    
+    def fetch_universe_data(self, symbols: Optional[List[str]] = None, period: str = MarketConfig.PRICE_HISTORY_PERIOD,
+                            deadline: Optional[Deadline] = None) -> pd.DataFrame:
+        """Fetch history for many symbols as a wide panel in chunked multi-symbol requests"""
+        symbols = symbols or self.stock_universe
+        return self.price_store.get_panel(symbols, period, deadline=deadline)
+    
+    def export_universe_panel(self, symbols: Optional[List[str]] = None, period: str = MarketConfig.PRICE_HISTORY_PERIOD,
+                              path: Optional[str] = None) -> str:
+        """Write universe history to a memory-mapped panel that worker processes can attach to"""
+        panel = PricePanel.from_frame(self.fetch_universe_data(symbols, period))
+        return panel.to_memmap(path)
+    
+    def _panel_slice(self, panel, symbol: str) -> Optional[pd.DataFrame]:
+        """Extract one symbol's bars from a wide DataFrame panel or an attached PricePanel
+
+        PricePanel frames are views into the panel; screens only read them.
+        """
+        if isinstance(panel, PricePanel):
+            return panel.frame(symbol)
+        
+        if panel.empty or symbol not in panel.columns.get_level_values(0):
+            return None
+        
+        hist = panel[symbol].dropna(how='all')
+        return hist if not hist.empty else None
+    
+    def fetch_stock_info(self, symbol: str, as_of=None) -> Dict:
+        """Fetch stock information and fundamentals (served from the fundamentals cache)
+        
+        With `as_of` (a date) the fundamentals recorded at that time are returned
+        from local history instead, so past screens carry no lookahead.
+        """
+        if as_of is not None:
+            return self.fundamentals.as_of(symbol, as_of)
+        return self.fundamentals.get(symbol)
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Latest indicator values for one symbol's bars (see IndicatorEngine)"""
+        return self.indicator_engine.compute_frame(data)
+    
+    def ticker_context(self, data: pd.DataFrame, values: Optional[Dict[str, float]] = None,
+                       levels: Optional[Dict] = None) -> TickerContext:
+        """Memoized derived series and latest values for one symbol's bars"""
+        return TickerContext(data, self.tech_config, values, levels)
     
-    def calculate_moving_averages(self, data: pd.DataFrame) -> Dict[str, TechnicalSignal]:
+    def calculate_moving_averages(self, data: pd.DataFrame,
+                                  ctx: Optional[TickerContext] = None) -> Dict[str, TechnicalSignal]:
         """Calculate moving average signals"""
         signals = {}
+        values = (ctx or self.ticker_context(data)).values
         
-        if len(data) < self.tech_config.MA_LONG:
+        if values['bars'] < self.tech_config.MA_LONG:
             return signals
         
-        # Calculate MAs
-        ma20 = data['Close'].rolling(window=self.tech_config.MA_SHORT).mean()
-        ma50 = data['Close'].rolling(window=self.tech_config.MA_MEDIUM).mean()
-        ma200 = data['Close'].rolling(window=self.tech_config.MA_LONG).mean()
-        
-        current_price = data['Close'].iloc[-1]
-        current_ma20 = ma20.iloc[-1]
-        current_ma50 = ma50.iloc[-1]
-        current_ma200 = ma200.iloc[-1]
+        current_price = values['close']
+        current_ma20 = values['ma_short']
+        current_ma50 = values['ma_medium']
+        current_ma200 = values['ma_long']
         
         # MA20 Signal
         ma20_signal = "bullish" if current_price > current_ma20 else "bearish"
@@ -151,18 +193,14 @@ class TechnicalScreener:
         
         return signals
     
-    def calculate_rsi(self, data: pd.DataFrame) -> Optional[TechnicalSignal]:
+    def calculate_rsi(self, data: pd.DataFrame,
+                      ctx: Optional[TickerContext] = None) -> Optional[TechnicalSignal]:
         """Calculate RSI signal"""
-        if len(data) < self.tech_config.RSI_PERIOD + 1:
+        values = (ctx or self.ticker_context(data)).values
+        if values['bars'] < self.tech_config.RSI_PERIOD + 1:
             return None
         
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.tech_config.RSI_PERIOD).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.tech_config.RSI_PERIOD).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        current_rsi = rsi.iloc[-1]
+        current_rsi = values['rsi']
         
         if current_rsi <= self.tech_config.RSI_OVERSOLD:
             signal = "bullish"
@@ -185,17 +223,15 @@ class TechnicalScreener:
             description=description
         )
     
-    def calculate_volume_signal(self, data: pd.DataFrame) -> Optional[TechnicalSignal]:
+    def calculate_volume_signal(self, data: pd.DataFrame,
+                                ctx: Optional[TickerContext] = None) -> Optional[TechnicalSignal]:
         """Calculate volume-based signal"""
-        if len(data) < self.tech_config.VOLUME_LOOKBACK_DAYS:
+        values = (ctx or self.ticker_context(data)).values
+        if values['bars'] < self.tech_config.VOLUME_LOOKBACK_DAYS:
             return None
         
-        avg_volume = data['Volume'].rolling(
-            window=self.tech_config.VOLUME_LOOKBACK_DAYS
-        ).mean()
-        
-        current_volume = data['Volume'].iloc[-1]
-        avg_volume_current = avg_volume.iloc[-1]
+        current_volume = values['volume']
+        avg_volume_current = values['volume_avg']
         
         volume_ratio = current_volume / avg_volume_current
         
@@ -216,16 +252,16 @@ class TechnicalScreener:
             description=description
         )
     
-    def calculate_price_momentum(self, data: pd.DataFrame) -> Optional[TechnicalSignal]:
+    def calculate_price_momentum(self, data: pd.DataFrame,
+                                 ctx: Optional[TickerContext] = None) -> Optional[TechnicalSignal]:
         """Calculate price momentum signal"""
-        if len(data) < 20:
+        values = (ctx or self.ticker_context(data)).values
+        # The 20-day change needs 21 bars
+        if values['bars'] <= 20:
             return None
         
-        # Price change over different periods
-        price_change_5d = (data['Close'].iloc[-1] - data['Close'].iloc[-6]) / data['Close'].iloc[-6]
-        price_change_20d = (data['Close'].iloc[-1] - data['Close'].iloc[-21]) / data['Close'].iloc[-21]
-        
-        momentum_score = (price_change_5d * 0.6) + (price_change_20d * 0.4)
+        # 60% 5-day change, 40% 20-day change
+        momentum_score = values['momentum']
         
         if momentum_score > 0.05:  # 5% positive momentum
             signal = "bullish"
@@ -248,45 +284,45 @@ class TechnicalScreener:
             description=description
         )
     
-    def calculate_support_resistance(self, data: pd.DataFrame) -> Dict[str, float]:
-        """Calculate support and resistance levels"""
-        if len(data) < 50:
-            return {}
-        
-        # Simple approach: use recent highs/lows
-        recent_data = data.tail(50)
-        
-        # Find local maxima and minima
-        highs = recent_data['High'].rolling(window=5, center=True).max()
-        lows = recent_data['Low'].rolling(window=5, center=True).min()
-        
-        resistance = recent_data[recent_data['High'] == highs]['High'].max()
-        support = recent_data[recent_data['Low'] == lows]['Low'].min()
-        
-        current_price = data['Close'].iloc[-1]
-        
-        return {
-            'support': support,
-            'resistance': resistance,
-            'distance_to_support': (current_price - support) / current_price,
-            'distance_to_resistance': (resistance - current_price) / current_price
-        }
+    def calculate_support_resistance(self, data: pd.DataFrame,
+                                     ctx: Optional[TickerContext] = None) -> Dict[str, Any]:
+        """Calculate ranked support and resistance levels (see SupportResistance)"""
+        ctx = ctx or self.ticker_context(data)
+        if ctx.bars < self.tech_config.SR_LOOKBACK_DAYS:
+            ctx.levels = {}
+        elif ctx.levels is None:
+            ctx.levels = self.support_resistance.compute_frame(data)
+        return ctx.levels
     
-    def screen_stock(self, symbol: str) -> Optional[ScreenResult]:
-        """Screen individual stock and return analysis"""
+    def screen_stock(self, symbol: str, data: Optional[pd.DataFrame] = None,
+                     info: Optional[Dict] = None,
+                     values: Optional[Dict[str, float]] = None,
+                     levels: Optional[Dict] = None) -> Optional[ScreenResult]:
+        """Screen individual stock and return analysis
+        
+        Pass pre-fetched bars (e.g. a slice of a batched panel) as `data` and/or
+        pre-fetched fundamentals as `info` to skip the corresponding fetch, and
+        indicator values / support-resistance levels already computed for the
+        whole universe as `values` / `levels`.
+        """
         try:
             print(f"Screening {symbol}...")
             
             # Fetch data
-            data = self.fetch_stock_data(symbol)
-            info = self.fetch_stock_info(symbol)
+            if data is None:
+                data = self.fetch_stock_data(symbol)
+            if info is None:
+                info = self.fetch_stock_info(symbol)
             
             if data is None or data.empty:
                 return None
             
+            # Derived series are computed once per screen and shared by every step below
+            ctx = self.ticker_context(data, values, levels)
+            
             # Basic filtering
-            current_price = data['Close'].iloc[-1]
-            current_volume = data['Volume'].iloc[-1]
+            current_price = ctx.last('close')
+            current_volume = ctx.last('volume')
             market_cap = info.get('marketCap', 0)
             
             # Apply filters from config
@@ -298,32 +334,13 @@ class TechnicalScreener:
                 return None
             
             # Calculate signals
-            signals = []
-            
-            # Moving average signals
-            ma_signals = self.calculate_moving_averages(data)
-            signals.extend(ma_signals.values())
-            
-            # RSI signal
-            rsi_signal = self.calculate_rsi(data)
-            if rsi_signal:
-                signals.append(rsi_signal)
-            
-            # Volume signal
-            volume_signal = self.calculate_volume_signal(data)
-            if volume_signal:
-                signals.append(volume_signal)
-            
-            # Momentum signal
-            momentum_signal = self.calculate_price_momentum(data)
-            if momentum_signal:
-                signals.append(momentum_signal)
+            signals = self._technical_signals(ctx)
             
             # Calculate overall score
             overall_score = self._calculate_overall_score(signals)
             
             # Calculate support/resistance
-            sr_levels = self.calculate_support_resistance(data)
+            sr_levels = self.calculate_support_resistance(data, ctx)
             
             # Generate recommendation
             recommendation = self._generate_recommendation(overall_score, signals)
@@ -340,7 +357,7 @@ class TechnicalScreener:
             sector = self._determine_sector(symbol)
             
             # Generate notes
-            notes = self._generate_notes(signals, sr_levels, info)
+            notes = self._generate_notes(signals, ctx, info)
             
             return ScreenResult(
                 symbol=symbol,
@@ -363,23 +380,45 @@ class TechnicalScreener:
             print(f"Error screening {symbol}: {e}")
             return None
     
+    def _technical_signals(self, ctx: TickerContext) -> List[TechnicalSignal]:
+        """All indicator signals for one symbol's bars"""
+        signals = []
+        data = ctx.data
+        
+        # Moving average signals
+        ma_signals = self.calculate_moving_averages(data, ctx)
+        signals.extend(ma_signals.values())
+        
+        # RSI signal
+        rsi_signal = self.calculate_rsi(data, ctx)
+        if rsi_signal:
+            signals.append(rsi_signal)
+        
+        # Volume signal
+        volume_signal = self.calculate_volume_signal(data, ctx)
+        if volume_signal:
+            signals.append(volume_signal)
+        
+        # Momentum signal
+        momentum_signal = self.calculate_price_momentum(data, ctx)
+        if momentum_signal:
+            signals.append(momentum_signal)
+        
+        # Plugin indicators share one context, so common intermediates are computed once
+        extra = self.tech_config.EXTRA_INDICATORS
+        if extra:
+            signals.extend(registry.evaluate(ctx, extra))
+        
+        return signals
+    
     def _calculate_overall_score(self, signals: List[TechnicalSignal]) -> float:
         """Calculate overall technical score from signals"""
         if not signals:
             return 0
         
         score = 0
-        weights = {
-            'MA200': 0.25,  # Most important
-            'MA50': 0.20,
-            'MA20': 0.15,
-            'RSI': 0.15,
-            'Volume': 0.15,
-            'Momentum': 0.10
-        }
-        
         for signal in signals:
-            weight = weights.get(signal.indicator, 0.1)
+            weight = registry.weight(signal.indicator)
             
             if signal.signal == "bullish":
                 signal_score = signal.strength
@@ -418,29 +457,26 @@ class TechnicalScreener:
         # Entry price (slightly below current for better entry)
         entry_price = current_price * 0.99  # 1% below current
         
-        # Stop loss
-        if 'support' in sr_levels and sr_levels['support']:
-            # Use support level or 15% below entry, whichever is closer
-            support_stop = sr_levels['support'] * 0.98  # 2% below support
-            percentage_stop = entry_price * (1 - self.tech_config.STOP_LOSS_PCT)
-            stop_loss = max(support_stop, percentage_stop)
-        else:
-            stop_loss = entry_price * (1 - self.tech_config.STOP_LOSS_PCT)
-        
-        # Target price
-        if 'resistance' in sr_levels and sr_levels['resistance']:
-            resistance_target = sr_levels['resistance'] * 0.98  # Slightly below resistance
-        else:
-            resistance_target = None
+        # Stop loss: 2% below the strongest support within 15% of entry, else 15% below entry
+        percentage_stop = entry_price * (1 - self.tech_config.STOP_LOSS_PCT)
+        stop_loss = percentage_stop
+        for level in sr_levels.get('support_levels', []):
+            support_stop = level['price'] * 0.98
+            if percentage_stop <= support_stop < entry_price:
+                stop_loss = support_stop
+                break
         
         # Calculate target based on risk-reward ratio
         risk = entry_price - stop_loss
         min_target = entry_price + (risk * self.tech_config.MIN_RISK_REWARD)
         
-        if resistance_target and resistance_target > min_target:
-            target_price = resistance_target
-        else:
-            target_price = min_target
+        # Target: slightly below the strongest resistance that still clears the minimum R:R
+        target_price = min_target
+        for level in sr_levels.get('resistance_levels', []):
+            resistance_target = level['price'] * 0.98
+            if resistance_target > min_target:
+                target_price = resistance_target
+                break
         
         return entry_price, stop_loss, target_price
     
@@ -460,14 +496,12 @@ class TechnicalScreener:
     
     def _determine_sector(self, symbol: str) -> str:
         """Determine which sector this stock belongs to"""
-        for sector, sector_data in self.sector_config.FOCUS_SECTORS.items():
-            if symbol in sector_data['tickers']:
-                return sector
-        return "other"
+        return self.security_master.sector(symbol)
     
-    def _generate_notes(self, signals: List[TechnicalSignal], sr_levels: Dict, info: Dict) -> List[str]:
+    def _generate_notes(self, signals: List[TechnicalSignal], ctx: TickerContext, info: Dict) -> List[str]:
         """Generate analysis notes"""
         notes = []
+        sr_levels = ctx.levels or {}
         
         # Signal-based notes
         strong_signals = [s for s in signals if s.strength > 70]
@@ -475,9 +509,13 @@ class TechnicalScreener:
             notes.append(f"Strong signals: {', '.join([s.indicator for s in strong_signals])}")
         
         # Support/resistance notes
-        if sr_levels:
-            notes.append(f"Support: ${sr_levels.get('support', 0):.2f}, "
-                        f"Resistance: ${sr_levels.get('resistance', 0):.2f}")
+        levels = []
+        for key, label in (('support', 'Support'), ('resistance', 'Resistance')):
+            if key in sr_levels:
+                touches = sr_levels[f"{key}_levels"][0]['touches']
+                levels.append(f"{label}: ${sr_levels[key]:.2f} ({touches} touch{'es' if touches > 1 else ''})")
+        if levels:
+            notes.append(", ".join(levels))
         
         # Fundamental notes
         pe_ratio = info.get('trailingPE')
@@ -486,15 +524,197 @@ class TechnicalScreener:
         
         return notes
     
-    def screen_all_stocks(self) -> List[ScreenResult]:
-        """Screen all stocks in universe"""
-        results = []
-        
+    def screen_all_stocks(self, batch: bool = True,
+                          deadline: Optional[Deadline] = None,
+                          workers: int = 1) -> List[ScreenResult]:
+        """Screen all stocks in universe
+        
+        In batch mode history for the whole universe is pulled up front in chunked
+        multi-symbol requests and each screen works on its slice of the panel.
+        Indicators come from the per-ticker running state (TechnicalConfig.
+        INCREMENTAL_INDICATORS), which only folds in bars added since the last
+        run, or else are computed for the whole panel at once.
+        Fetches that miss MarketConfig.REQUEST_TIMEOUT_SECONDS or the run `deadline`
+        fall back to cached data and the affected results are marked stale.
+        
+        Fetching always happens here; with `workers` > 1 indicators, levels and
+        scores are sharded by symbol across a process pool. Results are
+        identical to a serial run.
+        """
         print(f"🔍 Screening {len(self.stock_universe)} stocks...")
         
-        for symbol in self.stock_universe:
-            result = self.screen_stock(symbol)
+        executor = get_fetch_executor()
+        stale = set()
+        
+        if batch:
+            panel = self.fetch_universe_data(deadline=deadline)
+            stale.update(panel.attrs.get('stale', []))
+            bars = {symbol: self._panel_slice(panel, symbol) for symbol in self.stock_universe}
+        else:
+            futures = {symbol: executor.submit(self.fetch_stock_data, symbol, priority=PRIORITY_SCREENING)
+                       for symbol in self.stock_universe}
+            bars = {}
+            for symbol, future in futures.items():
+                try:
+                    bars[symbol] = result_within(future, deadline)
+                except FetchTimeout:
+                    bars[symbol] = self.fetch_cached_stock_data(symbol)
+                    stale.add(symbol)
+        
+        # Fundamentals for the whole universe, fetched concurrently within the rate budget
+        infos = self._fetch_infos(self.stock_universe, deadline, stale)
+        
+        if stale:
+            print(f"⏱️  {len(stale)} symbols missed their fetch deadline, screening on cached data")
+        
+        symbols = [symbol for symbol in self.stock_universe if bars.get(symbol) is not None]
+        return self._run_screens(symbols, bars, infos, stale, workers, panel=panel if batch else None)
+    
+    def screen_funnel(self, top_n: Optional[int] = None, deadline: Optional[Deadline] = None,
+                      workers: int = 1) -> List[ScreenResult]:
+        """Screen the universe in stages, fetching fundamentals only for the best technical names
+        
+        1. quotes:      price and volume filters (plus market cap where cached) on the
+                        latest bars, after bringing the price cache up to date
+        2. technicals:  indicators and a technical score on the survivors' cached bars
+                        (only symbols with no cached history are fetched here)
+        3. fundamentals: fundamentals and the full screen for the `top_n` best scores
+                        (TechnicalConfig.FUNNEL_TOP_N)
+        
+        Counts and timings per stage are printed and kept in `self.funnel_stats`.
+        """
+        top_n = top_n or self.tech_config.FUNNEL_TOP_N
+        self.funnel_stats = []
+        stale = set()
+        
+        def report(stage: str, count_in: int, count_out: int, started: float):
+            seconds = time.monotonic() - started
+            self.funnel_stats.append({'stage': stage, 'in': count_in, 'out': count_out, 'seconds': seconds})
+            print(f"🔻 {stage}: {count_in} → {count_out} in {seconds:.2f}s")
+        
+        print(f"🔍 Funnel screening {len(self.stock_universe)} stocks...")
+        
+        # Stage 1: cheap filters on the latest bars; this refresh is the only tail fetch of the run
+        started = time.monotonic()
+        quotes = self.fetch_quotes(self.stock_universe, deadline, stale)
+        candidates = [symbol for symbol in self.stock_universe
+                      if symbol in quotes and self._passes_quote_filters(symbol, quotes[symbol])]
+        report('quotes', len(self.stock_universe), len(candidates), started)
+        
+        # Stage 2: technicals on cached bars; tails refreshed in stage 1 count as fresh
+        started = time.monotonic()
+        panel = self.fetch_universe_data(candidates, deadline=deadline) if candidates else pd.DataFrame()
+        stale.update(panel.attrs.get('stale', []))
+        bars = {symbol: self._panel_slice(panel, symbol) for symbol in candidates}
+        bars = {symbol: data for symbol, data in bars.items() if data is not None}
+        indicators = self._indicator_values(bars, panel)
+        scores = {symbol: self._calculate_overall_score(
+                      self._technical_signals(self.ticker_context(data, indicators.get(symbol))))
+                  for symbol, data in bars.items()}
+        # Stable sort keeps universe order among equal scores
+        finalists = sorted(scores, key=lambda symbol: scores[symbol], reverse=True)[:top_n]
+        report('technicals', len(candidates), len(finalists), started)
+        
+        # Stage 3: fundamentals and the full screen for the finalists only
+        started = time.monotonic()
+        infos = self._fetch_infos(finalists, deadline, stale)
+        results = self._run_screens(finalists, bars, infos, stale, workers, indicators=indicators)
+        report('fundamentals', len(finalists), len(results), started)
+        
+        if stale:
+            print(f"⏱️  {len(stale)} symbols missed their fetch deadline, screened on cached data")
+        
+        return results
+    
+    def fetch_quotes(self, symbols: List[str], deadline: Optional[Deadline] = None,
+                     stale: Optional[set] = None, period: str = "5d") -> Dict[str, Dict]:
+        """Latest close and volume per symbol ({'price', 'volume', 'date'}) from the price store
+        
+        The store fetches only the bars it is missing, in chunked multi-symbol
+        requests, and keeps them: later reads of these symbols in the same run
+        are served from the cache. Symbols whose update missed the deadline are
+        quoted from their cached bars and added to `stale`.
+        """
+        panel = self.price_store.get_panel(symbols, period, deadline=deadline)
+        if panel.empty:
+            return {}
+        if stale is not None:
+            stale.update(panel.attrs.get('stale', []))
+        
+        quotes = {}
+        for symbol in panel.columns.get_level_values(0).unique():
+            bars = panel[symbol].dropna(subset=['Close'])
+            if not bars.empty:
+                quotes[symbol] = {'price': float(bars['Close'].iloc[-1]),
+                                  'volume': float(bars['Volume'].iloc[-1]),
+                                  'date': bars.index[-1]}
+        return quotes
+    
+    def _passes_quote_filters(self, symbol: str, quote: Dict) -> bool:
+        """Price, volume and (if already cached) market cap filters, without fetching anything"""
+        if quote['price'] > self.tech_config.MAX_PRICE:
+            return False
+        if quote['volume'] < self.tech_config.MIN_DAILY_VOLUME:
+            return False
+        # Unknown market caps pass here and are checked once fundamentals are fetched
+        market_cap = self.fundamentals.peek(symbol).get('marketCap')
+        return market_cap is None or market_cap >= self.tech_config.MIN_MARKET_CAP
+    
+    def _fetch_infos(self, symbols: List[str], deadline: Optional[Deadline],
+                     stale: set) -> Dict[str, Dict]:
+        """Fundamentals for symbols, fetched concurrently; misses fall back to the cache and are marked stale"""
+        executor = get_fetch_executor()
+        futures = {symbol: executor.submit(self.fetch_stock_info, symbol, priority=PRIORITY_SCREENING)
+                   for symbol in symbols}
+        infos = {}
+        for symbol, future in futures.items():
+            try:
+                infos[symbol] = result_within(future, deadline)
+            except FetchTimeout:
+                infos[symbol] = self.fundamentals.peek(symbol)
+                stale.add(symbol)
+        # One cache write for the whole batch
+        self.fundamentals.flush()
+        return infos
+    
+    def _indicator_values(self, bars: Dict[str, Optional[pd.DataFrame]], panel=None,
+                          save_state: bool = True) -> Dict[str, Dict[str, float]]:
+        """Latest indicator values per symbol, from the running state or computed over the panel"""
+        indicators = {}
+        if self.tech_config.INCREMENTAL_INDICATORS:
+            for symbol, data in bars.items():
+                values = self.indicator_state.sync(symbol, data)
+                if values is not None:
+                    indicators[symbol] = values
+            if save_state:
+                self.indicator_state.save()
+        else:
+            if panel is None or panel.empty:
+                present = {symbol: data for symbol, data in bars.items() if data is not None}
+                panel = PricePanel.from_bars(present) if present else None
+            if panel is not None:
+                indicators = self.indicator_engine.compute_panel(panel).snapshots()
+        return indicators
+    
+    def _run_screens(self, symbols: List[str], bars: Dict[str, pd.DataFrame], infos: Dict[str, Dict],
+                     stale: set, workers: int = 1, panel=None,
+                     indicators: Optional[Dict[str, Dict[str, float]]] = None) -> List[ScreenResult]:
+        """Screen symbols on their bars and return results by descending score
+        
+        `panel` (the bars as one wide frame) and precomputed `indicators` are
+        only used by a serial run; pool workers compute their own.
+        """
+        if workers > 1 and len(symbols) > 1:
+            screened = self._screen_parallel(symbols, bars, infos, workers)
+        else:
+            screened = dict(self._screen_symbols(symbols, bars, infos, panel, indicators))
+        
+        # Reassemble in symbol order so ties sort the same way as a serial run
+        results = []
+        for symbol in symbols:
+            result = screened.get(symbol)
             if result:
+                result.stale = symbol in stale
                 results.append(result)
         
         # Sort by overall score (highest first)
@@ -502,6 +722,61 @@ class TechnicalScreener:
         
         return results
     
+    def _screen_symbols(self, symbols: List[str], bars: Dict[str, pd.DataFrame], infos: Dict[str, Dict],
+                        panel=None, indicators: Optional[Dict[str, Dict[str, float]]] = None,
+                        save_state: bool = True) -> List[tuple]:
+        """Indicators, support/resistance levels and screens for symbols; returns (symbol, result) pairs"""
+        bars = {symbol: bars[symbol] for symbol in symbols}
+        if indicators is None:
+            indicators = self._indicator_values(bars, panel, save_state)
+        levels = self.support_resistance.compute_bars(bars)
+        
+        tasks = [(symbol, bars[symbol], infos[symbol], indicators.get(symbol), levels.get(symbol))
+                 for symbol in symbols]
+        return _screen_tasks(self, tasks)
+    
+    def _screen_parallel(self, symbols: List[str], bars: Dict[str, pd.DataFrame],
+                         infos: Dict[str, Dict], workers: int) -> Dict[str, Optional[ScreenResult]]:
+        """Screen symbols across a process pool
+        
+        The bars are written once to a memory-mapped panel. Each task is a
+        contiguous range of its tickers: the worker attaches to the panel,
+        computes indicators and levels for its range and sends back only the
+        results (plus its tickers' updated indicator state, saved here).
+        """
+        # A few chunks per worker balances the load while keeping per-task overhead low
+        chunk_size = max(1, math.ceil(len(symbols) / (workers * 4)))
+        ranges = [(start, min(start + chunk_size, len(symbols)))
+                  for start in range(0, len(symbols), chunk_size)]
+        panel = PricePanel.from_bars({symbol: bars[symbol] for symbol in symbols})
+        path = panel.to_memmap(os.path.join(PANEL_DIR, f"screen-{os.getpid()}"))
+        
+        screened = {}
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), initializer=_init_screen_worker,
+                                     initargs=(self.provider.name, self.tech_config, path)) as pool:
+                futures = [(symbols[start:stop],
+                            pool.submit(_screen_range, start, stop,
+                                        {symbol: infos[symbol] for symbol in symbols[start:stop]}))
+                           for start, stop in ranges]
+                for chunk, future in futures:
+                    try:
+                        chunk_results, states = future.result()
+                        screened.update(chunk_results)
+                        self.indicator_state.adopt(states)
+                    except Exception as e:
+                        # A crashed worker takes its chunk with it; screen those tickers here instead
+                        print(f"Screening worker failed ({e}), screening {len(chunk)} symbols in-process")
+                        screened.update(self._screen_symbols(chunk, bars, infos, save_state=False))
+        finally:
+            for suffix in ('.npy', '.json'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        
+        if self.tech_config.INCREMENTAL_INDICATORS:
+            self.indicator_state.save()
+        return screened
+    
     def save_screen_results(self, results: List[ScreenResult], output_dir: str = "technical-screening"):
         """Save screening results to JSON file"""
         os.makedirs(output_dir, exist_ok=True)
@@ -553,14 +828,58 @@ class TechnicalScreener:
             'top_picks': [r.symbol for r in results[:10]]
         }
 
+# Screener and attached price panel owned by each pool worker process
+_worker_screener: Optional[TechnicalScreener] = None
+_worker_panel: Optional[PricePanel] = None
+
+def _init_screen_worker(provider_name: str, tech_config: TechnicalConfig, panel_path: str):
+    global _worker_screener, _worker_panel
+    _worker_screener = TechnicalScreener(get_provider(provider_name), tech_config)
+    _worker_panel = PricePanel.attach(panel_path)
+
+def _screen_tasks(screener: TechnicalScreener, tasks: List[tuple]) -> List[tuple]:
+    """Screen pre-fetched (symbol, data, info, values, levels) tasks; one ticker's error never affects the rest"""
+    screened = []
+    for symbol, data, info, values, levels in tasks:
+        try:
+            result = screener.screen_stock(symbol, data, info, values, levels)
+        except Exception as e:
+            print(f"Error screening {symbol}: {e}")
+            result = None
+        screened.append((symbol, result))
+    return screened
+
+def _screen_range(start: int, stop: int, infos: Dict[str, Dict]) -> tuple:
+    """Pool entry point: screen tickers start..stop-1 of the attached panel
+
+    Returns the (symbol, result) pairs and the tickers' indicator state for the
+    parent to save; the worker itself never writes the state file.
+    """
+    screener = _worker_screener
+    panel = _worker_panel.subset(start, stop)
+    bars = {symbol: screener._panel_slice(panel, symbol) for symbol in panel.symbols}
+    symbols = [symbol for symbol in panel.symbols if bars[symbol] is not None]
+    screened = screener._screen_symbols(symbols, bars, infos, panel, save_state=False)
+    return screened, screener.indicator_state.export(symbols)
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Screen the stock universe on technical signals')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes to compute indicators and scores in (data is still fetched once, up front)')
+    parser.add_argument('--funnel', action='store_true',
+                        help='Filter on quotes and technicals first; fetch fundamentals for the top names only')
+    args = parser.parse_args()
+    
     print("🎯 Starting Technical Screening System...")
     
     screener = TechnicalScreener()
     
     # Run screening
-    results = screener.screen_all_stocks()
+    if args.funnel:
+        results = screener.screen_funnel(workers=args.workers)
+    else:
+        results = screener.screen_all_stocks(workers=args.workers)
     
     # Save results
     output_file = screener.save_screen_results(results)
@@ -0,0 +1,20 @@
+"""
+Shared test setup: scripts import as `scripts.X`, market data comes from the
+offline replay provider (synthetic bars for unrecorded symbols), and every
+cache, state file and fundamentals history goes to a scratch directory that
+is removed after the run.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+os.environ.setdefault('MARKET_DATA_PROVIDER', 'replay')
+os.environ.setdefault('MARKET_DATA_PROVIDERS', 'replay')
+DATA_ROOT = os.environ.setdefault('PIPELINE_DATA_ROOT', tempfile.mkdtemp(prefix='pipeline-tests-'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def pytest_sessionfinish(session, exitstatus):
+    if DATA_ROOT.startswith(tempfile.gettempdir()):
+        shutil.rmtree(DATA_ROOT, ignore_errors=True)
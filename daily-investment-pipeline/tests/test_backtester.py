@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.backtester import RECOMMENDATIONS, NOT_SCREENED, Backtester, lookback_bars
+from scripts.indicator_engine import IndicatorEngine
+
+@pytest.fixture(scope='module')
+def backtester():
+    return Backtester()
+
+@pytest.fixture(scope='module')
+def result(backtester):
+    return backtester.run(period="2y")
+
+def test_scores_match_screen_stock(backtester, result):
+    """Sampled (date, ticker) scores against a live screen of the bars cached on that date"""
+    screener = backtester.screener
+    rows, columns = np.nonzero(result.recommendations != NOT_SCREENED)
+    sample = np.random.default_rng(0).choice(len(rows), 60, replace=False)
+
+    for row, column in zip(rows[sample], columns[sample]):
+        symbol = result.symbols[column]
+        day = pd.Timestamp(result.dates[row, column])
+        # The backtest only holds `period` of history, so the live screen must not see past it either
+        first = pd.Timestamp(result.dates[~np.isnat(result.dates[:, column]), column][0])
+        data = screener.price_store.load_as_of(symbol, day)
+        data = data[data.index >= first]
+
+        screened = screener.screen_stock(symbol, data, {'marketCap': 1e13})
+
+        assert screened is not None
+        assert screened.overall_score == pytest.approx(result.scores[row, column], abs=1e-9)
+        assert screened.recommendation == RECOMMENDATIONS[result.recommendations[row, column]]
+
+def test_lookback_caps_bars_at_the_screen_period():
+    dates = pd.bdate_range('2023-01-02', periods=400)
+    close = np.ones((400, 2))
+    close[:150, 1] = np.nan  # Second ticker lists 150 bars later
+    indicators = IndicatorEngine().compute(close, close, ['AAA', 'BBB'], dates)
+
+    six_months = lookback_bars(indicators, "6mo")
+    assert six_months.max() < 200  # So no MA200 signal, as in a live 6mo screen
+    expected = ((dates >= dates[-1] - pd.DateOffset(months=6)) & (dates <= dates[-1])).sum()
+    assert six_months[-1, 0] == six_months[-1, 1] == expected
+
+    assert lookback_bars(indicators, "20d")[-1].tolist() == [20, 20]
+    assert lookback_bars(indicators, "max")[-1].tolist() == [400, 250]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.indicator_registry import (
+    ATR, MACD, OBV, BollingerPercentB, IndicatorPlugin, TickerContext, register, registry
+)
+from scripts.market_data import synthetic_history
+from scripts.technical_screener import TechnicalScreener
+
+@pytest.fixture(scope='module')
+def data():
+    return synthetic_history('REGTEST', days=300)
+
+@pytest.fixture(scope='module')
+def screener():
+    return TechnicalScreener()
+
+def wilder_reference(values: pd.Series, period: int) -> float:
+    average = values.iloc[:period].mean()
+    for value in values.iloc[period:]:
+        average = (average * (period - 1) + value) / period
+    return average
+
+def true_range_reference(data: pd.DataFrame) -> pd.Series:
+    previous = data['Close'].shift()
+    return pd.concat([data['High'] - data['Low'], (data['High'] - previous).abs(),
+                      (data['Low'] - previous).abs()], axis=1).max(axis=1)
+
+def plugin_values(data, names):
+    return {signal.indicator: signal.value for signal in registry.evaluate(TickerContext(data), names)}
+
+def test_core_signals_match_pandas(screener, data):
+    """The context-based calculate_* methods against the original pandas formulas"""
+    cfg = screener.tech_config
+    close, volume = data['Close'], data['Volume']
+
+    mas = screener.calculate_moving_averages(data)
+    for key, window in (('ma20', cfg.MA_SHORT), ('ma50', cfg.MA_MEDIUM), ('ma200', cfg.MA_LONG)):
+        assert mas[key].value == pytest.approx(close.rolling(window).mean().iloc[-1], rel=1e-12)
+
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(cfg.RSI_PERIOD).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(cfg.RSI_PERIOD).mean()
+    rsi = (100 - 100 / (1 + gain / loss)).iloc[-1]
+    assert screener.calculate_rsi(data).value == pytest.approx(rsi, rel=1e-9)
+
+    ratio = volume.iloc[-1] / volume.rolling(cfg.VOLUME_LOOKBACK_DAYS).mean().iloc[-1]
+    assert f"{ratio:.1f}x" in screener.calculate_volume_signal(data).description
+
+    momentum = 0.6 * (close.iloc[-1] / close.iloc[-6] - 1) + 0.4 * (close.iloc[-1] / close.iloc[-21] - 1)
+    assert screener.calculate_price_momentum(data).value == pytest.approx(momentum * 100, rel=1e-9)
+
+def test_plugins_match_pandas(data):
+    values = plugin_values(data, ['MACD', 'Bollinger', 'ATR', 'OBV'])
+    close, volume = data['Close'], data['Volume']
+
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    assert values['MACD'] == pytest.approx(macd.iloc[-1], rel=1e-9)
+
+    mean, std = close.rolling(20).mean().iloc[-1], close.rolling(20).std(ddof=0).iloc[-1]
+    assert values['Bollinger'] == pytest.approx((close.iloc[-1] - (mean - 2 * std)) / (4 * std), rel=1e-6)
+
+    assert values['ATR'] == pytest.approx(wilder_reference(true_range_reference(data), 14), rel=1e-9)
+
+    flow = np.sign(close.diff().fillna(0)) * volume
+    assert values['OBV'] == pytest.approx(flow.iloc[-20:].sum(), rel=1e-9)
+
+@pytest.mark.parametrize('plugin_class, attribute, value, key', [
+    (MACD, 'fast', 8, 'ema:close:8'),
+    (BollingerPercentB, 'window', 10, 'std:close:10'),
+    (ATR, 'period', 10, 'wilder:true_range:10'),
+    (OBV, 'lookback', 30, 'sma:volume:30'),
+])
+def test_requires_follow_the_plugin_windows(plugin_class, attribute, value, key):
+    plugin = plugin_class()
+    setattr(plugin, attribute, value)
+    assert key in plugin.requires
+
+def test_resized_plugin_reads_its_own_window(data):
+    plugin = ATR()
+    plugin.period = 10
+    ctx = TickerContext(data)
+    ctx.prepare(plugin.requires)
+
+    assert plugin.signal(ctx).value == pytest.approx(wilder_reference(true_range_reference(data), 10), rel=1e-9)
+
+def test_plugin_without_signal_fails_at_registration():
+    class Incomplete(IndicatorPlugin):
+        name = "Incomplete"
+
+    with pytest.raises(TypeError):
+        register(Incomplete)
+    assert "Incomplete" not in registry
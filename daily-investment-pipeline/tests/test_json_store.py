@@ -0,0 +1,46 @@
+import json
+import os
+
+from scripts.fundamentals_cache import FundamentalsCache
+from scripts.fundamentals_history import FundamentalsHistory
+from scripts.json_store import JsonStore
+
+class CountingProvider:
+    """Provider double that knows no fundamentals and counts lookups"""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def info(self, symbol):
+        self.calls += 1
+        return {}
+
+def test_writes_wait_for_flush(tmp_path):
+    path = str(tmp_path / "store.json")
+    store = JsonStore(path)
+    store.update({'AAA': 1, 'BBB': 2})
+    store.pop('BBB')
+    assert not (tmp_path / "store.json").exists()
+
+    store.flush()
+    with open(path) as f:
+        assert json.load(f) == {'AAA': 1}
+    assert JsonStore(path).get('AAA') == 1
+    assert [p.name for p in tmp_path.iterdir()] == ['store.json']
+
+def test_empty_fundamentals_are_cached(tmp_path):
+    provider = CountingProvider()
+    history = FundamentalsHistory(root=str(tmp_path / "history"))
+    cache = FundamentalsCache(provider, path=str(tmp_path / "fundamentals.json"), history=history)
+
+    assert cache.get('NOPE') == {}
+    assert cache.get('nope') == {}
+    assert provider.calls == 1
+
+    cache.flush()
+    with open(tmp_path / "fundamentals.json") as f:
+        assert json.load(f)['NOPE']['fields'] == {}
+    # Empty lookups are not history
+    assert os.listdir(history.root) == []
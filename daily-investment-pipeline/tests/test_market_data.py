@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from scripts import market_data
+from scripts.market_data import YFinanceProvider
+
+class CountingLimiter:
+    def __init__(self):
+        self.tokens = 0
+
+    def acquire(self, tokens=1, timeout=None):
+        self.tokens += tokens
+        return True
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = CountingLimiter()
+    monkeypatch.setattr(market_data, 'get_rate_limiter', lambda name: limiter)
+    return limiter
+
+def bars(days=3):
+    index = pd.bdate_range('2024-01-02', periods=days)
+    return pd.DataFrame({field: 1.0 for field in ('Open', 'High', 'Low', 'Close', 'Volume')}, index=index)
+
+def test_batch_charges_one_call_per_symbol(monkeypatch, limiter):
+    symbols = ['AAA', 'BBB', 'CCC']
+    raw = pd.concat({symbol: bars() for symbol in symbols}, axis=1)
+    monkeypatch.setattr(market_data.yf, 'download', lambda *args, **kwargs: raw)
+
+    result = YFinanceProvider().history_batch(symbols, pd.Timestamp('2024-01-01'))
+
+    assert sorted(result) == symbols
+    assert limiter.tokens == 3
+
+def test_batch_accepts_flat_columns_for_one_symbol(monkeypatch, limiter):
+    monkeypatch.setattr(market_data.yf, 'download', lambda *args, **kwargs: bars())
+
+    result = YFinanceProvider().history_batch(['AAA'], pd.Timestamp('2024-01-01'))
+
+    assert list(result) == ['AAA']
+    assert list(result['AAA'].columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
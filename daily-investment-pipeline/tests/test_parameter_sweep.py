@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+import pytest
+
+from scripts.backtester import Backtester, score_indicators
+from scripts.indicator_engine import IndicatorEngine
+from scripts.parameter_sweep import SWEEP_GRID, ParameterSweep, default_params, evaluate, grid_search, make_config
+
+@pytest.fixture(scope='module')
+def sweep():
+    return ParameterSweep.from_universe(period="2y")
+
+def same_metrics(a, b):
+    return a.keys() == b.keys() and all(
+        a[key] == b[key] or (isinstance(a[key], float) and math.isnan(a[key]) and math.isnan(b[key]))
+        for key in a
+    )
+
+def test_sweep_matches_the_backtester(sweep):
+    params = {'RSI_PERIOD': 9, 'RSI_OVERSOLD': 35, 'VOLUME_SPIKE_THRESHOLD': 1.5}
+    config = make_config(params)
+    panel = sweep.panel
+    reference = IndicatorEngine(config).compute(panel.field('Close'), panel.field('Volume'),
+                                                panel.symbols, panel.dates)
+    indicators = sweep.data.indicators(config)
+
+    for field, series in reference.series.items():
+        assert np.array_equal(indicators.series[field], series, equal_nan=True), field
+
+    backtester = Backtester()
+    backtester.config = config
+    scores, codes = backtester.score(reference)
+    sweep_scores, sweep_codes = score_indicators(indicators, config, sweep.data.lookback)
+    assert np.array_equal(sweep_scores, scores, equal_nan=True)
+    assert np.array_equal(sweep_codes, codes)
+
+def test_parallel_sweep_matches_serial(sweep):
+    configs = grid_search(SWEEP_GRID)[:12]
+    serial = sweep.run(configs)
+    parallel = sweep.run(configs, workers=3)
+
+    assert len(parallel) == len(serial) == 12
+    assert all(same_metrics(a, b) for a, b in zip(serial, parallel))
+
+@pytest.mark.parametrize('name', list(SWEEP_GRID))
+def test_every_swept_parameter_changes_a_metric(sweep, name):
+    baseline = default_params(list(SWEEP_GRID))
+    metrics = lambda params: {key: value for key, value in evaluate(sweep.data, params).items()
+                              if key not in params}
+    reference = metrics(baseline)
+
+    for value in SWEEP_GRID[name]:
+        if value != baseline[name]:
+            assert not same_metrics(metrics(dict(baseline, **{name: value})), reference), (name, value)
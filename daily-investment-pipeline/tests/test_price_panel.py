@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from scripts.price_panel import PricePanel
+
+def make_panel():
+    dates = pd.bdate_range('2024-01-01', periods=30)
+    values = np.random.default_rng(7).uniform(10, 20, size=(30, 3, 5))
+    values[:10, 1, :] = np.nan  # Listed later
+    values[20, 2, :] = np.nan   # Halted for a day
+    return PricePanel(values, dates, ['AAA', 'BBB', 'CCC'])
+
+def test_memmap_round_trip(tmp_path):
+    panel = make_panel()
+    path = panel.to_memmap(str(tmp_path / "panel"))
+    attached = PricePanel.attach(path)
+
+    assert isinstance(attached.values, np.memmap)
+    assert np.array_equal(attached.values, panel.values, equal_nan=True)
+    assert list(attached.dates) == list(panel.dates)
+    assert attached.symbols == panel.symbols
+    assert attached.fields == panel.fields
+    for symbol in panel.symbols:
+        pd.testing.assert_frame_equal(attached.frame(symbol), panel.frame(symbol), check_freq=False)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['panel.json', 'panel.npy']
+
+def test_frame_drops_missing_dates_and_views_contiguous_tickers():
+    panel = make_panel()
+
+    late = panel.frame('BBB')
+    assert len(late) == 20 and late.index[0] == panel.dates[10]
+    assert np.shares_memory(late.to_numpy(), panel.values)
+
+    halted = panel.frame('CCC')
+    assert len(halted) == 29 and panel.dates[20] not in halted.index
+
+def test_subset_is_a_view():
+    panel = make_panel()
+    subset = panel.subset(1, 3)
+
+    assert subset.symbols == ['BBB', 'CCC']
+    assert np.shares_memory(subset.values, panel.values)
+    pd.testing.assert_frame_equal(subset.frame('CCC'), panel.frame('CCC'))
+
+def test_from_bars_keeps_order_and_values():
+    panel = make_panel()
+    bars = {symbol: panel.frame(symbol) for symbol in ['CCC', 'AAA', 'BBB']}
+    rebuilt = PricePanel.from_bars(bars)
+
+    assert rebuilt.symbols == ['CCC', 'AAA', 'BBB']
+    for symbol, data in bars.items():
+        pd.testing.assert_frame_equal(rebuilt.frame(symbol), data, check_freq=False)
@@ -0,0 +1,62 @@
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from scripts.price_panel import PricePanel
+from scripts.technical_screener import TechnicalScreener
+
+@pytest.fixture(scope='module')
+def screener():
+    return TechnicalScreener()
+
+def as_dicts(results):
+    return [asdict(result) for result in results]
+
+@pytest.mark.parametrize('incremental', [True, False])
+def test_parallel_screen_matches_serial(screener, monkeypatch, incremental):
+    monkeypatch.setattr(screener.tech_config, 'INCREMENTAL_INDICATORS', incremental)
+
+    serial = as_dicts(screener.screen_all_stocks(workers=1))
+    parallel = as_dicts(screener.screen_all_stocks(workers=3))
+
+    assert serial
+    assert parallel == serial
+
+def test_unbatched_screen_matches_batched(screener, monkeypatch):
+    monkeypatch.setattr(screener.tech_config, 'INCREMENTAL_INDICATORS', False)
+
+    assert as_dicts(screener.screen_all_stocks(batch=False, workers=2)) == \
+        as_dicts(screener.screen_all_stocks(batch=True))
+
+def test_parallel_funnel_matches_serial(screener):
+    serial = as_dicts(screener.screen_funnel(workers=1))
+    parallel = as_dicts(screener.screen_funnel(workers=3))
+
+    assert serial
+    assert parallel == serial
+
+def test_pool_workers_use_the_parent_config(screener, monkeypatch):
+    # A one-cent price cap filters out every stock, so the workers must see it too
+    monkeypatch.setattr(screener.tech_config, 'MAX_PRICE', 0.01)
+
+    assert screener.screen_all_stocks(workers=1) == []
+    assert screener.screen_all_stocks(workers=3) == []
+
+def test_funnel_technicals_reuse_the_quote_refresh(screener, monkeypatch):
+    quotes = screener.fetch_quotes(screener.stock_universe)
+    assert set(quotes) == set(screener.stock_universe)
+
+    calls = []
+    monkeypatch.setattr(screener.provider, 'history_batch',
+                        lambda symbols, *args, **kwargs: calls.append(symbols) or {})
+    panel = screener.fetch_universe_data(list(quotes))
+
+    assert calls == []
+    assert set(panel.columns.get_level_values(0)) == set(quotes)
+
+def test_panel_slices_are_not_copied(screener):
+    panel = PricePanel.from_frame(screener.fetch_universe_data(screener.stock_universe[:3]))
+    data = screener._panel_slice(panel, panel.symbols[0])
+
+    assert np.shares_memory(data.to_numpy(), panel.values)
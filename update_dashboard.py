@@ -4,14 +4,26 @@ Scout Premium Dashboard Auto-Updater (v2)
 Dynamically scores stocks and updates top 7 + watchlist
 """
 
-import yfinance as yf
 from datetime import datetime, timedelta
+import argparse
 import json
 import re
 import subprocess
 import math
+import sys
 from pathlib import Path
 
+# Share the investment pipeline's market data provider, price store and fundamentals cache
+sys.path.append(str(Path(__file__).parent / 'daily-investment-pipeline'))
+from scripts.market_data import get_provider
+from scripts.price_store import PriceStore
+from scripts.fundamentals_cache import FundamentalsCache
+from config.settings import MarketConfig
+
+PROVIDER = get_provider()
+PRICE_STORE = PriceStore(PROVIDER)
+FUNDAMENTALS = FundamentalsCache(PROVIDER)
+
 # All stocks to evaluate
 STOCKS = {
     'PLTR': 'PALANTIR TECHNOLOGIES',
@@ -38,15 +50,21 @@ PEER_BENCHMARKS = {
     'COHR': {'avg_pe': 45, 'avg_growth': 15, 'sector': 'Semiconductors'},
 }
 
-def fetch_comprehensive_data(ticker):
-    """Fetch all data needed for scoring"""
+def fetch_comprehensive_data(ticker, as_of=None):
+    """Fetch all data needed for scoring
+    
+    With `as_of` (YYYY-MM-DD) everything comes from local history as it was
+    known on that date, with no network access.
+    """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        # Historical data for technical analysis
-        hist = stock.history(period="6mo")
-        if hist.empty:
+        if as_of:
+            info = FUNDAMENTALS.as_of(ticker, as_of)
+            hist = PRICE_STORE.load_as_of(ticker, as_of, MarketConfig.PRICE_HISTORY_PERIOD)
+        else:
+            info = FUNDAMENTALS.get(ticker)
+            # Historical data for technical analysis
+            hist = PRICE_STORE.get_history(ticker, MarketConfig.PRICE_HISTORY_PERIOD)
+        if hist is None or hist.empty:
             return None
         
         # Current metrics
@@ -263,21 +281,24 @@ def calculate_value_score(data):
     
     return final_score, scores
 
-def main():
+def main(as_of=None):
     print("🚀 Scout Dashboard Auto-Updater (Dynamic Scoring)")
     print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S EDT')}")
+    if as_of:
+        print(f"🕰️  Point-in-time scoring as of {as_of} (local data only)")
     print()
     
     # Fetch all stock data
     print("📡 Fetching market data for 9 stocks...")
     all_data = {}
     for ticker in STOCKS.keys():
-        data = fetch_comprehensive_data(ticker)
+        data = fetch_comprehensive_data(ticker, as_of)
         if data:
             all_data[ticker] = data
             print(f"  ✅ {ticker}: ${data['price']}")
         else:
             print(f"  ⚠️  {ticker}: Failed")
+    FUNDAMENTALS.flush()
     
     print()
     
@@ -316,6 +337,10 @@ def main():
     
     print()
     
+    # Historical runs only report; the live dashboard is never rewritten with past scores
+    if as_of:
+        return
+    
     # Save scoring data to JSON for reference
     scoring_data = {
         'timestamp': datetime.now().isoformat(),
@@ -414,4 +439,7 @@ def git_commit_and_push(top_7, watchlist):
         print(f"  ❌ Git error: {e}")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Score stocks and update the Scout dashboard")
+    parser.add_argument('--as-of', help="Score as of a past date (YYYY-MM-DD) from local history, without publishing")
+    args = parser.parse_args()
+    main(args.as_of)